@@ -0,0 +1,580 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import serial
+
+from instrumentation import metrics
+from log_writer import BackgroundLogWriter, TeeLogWriter
+from receiver_merge import PacketMerger
+from replay import open_port
+from serial_engine import SerialFrameReader, SerialLineReader
+from shared_ring import SharedSampleRing
+from telemetry_schema import detect_rcv_schema, get_schema
+
+
+def open_session_log(schema, output_csv, flush_rows=None, flush_interval_ms=100, flush_on_state_change=True,
+                     log_queue_rows=4096, log_overflow="spill", binary_log=True):
+    """
+    Open the flight logs for one session: the CSV, optionally its binary
+    copy, behind a background writer thread.
+
+    :param schema: PacketSchema of the vehicle being received.
+    :param output_csv: CSV log to create.
+    :param flush_rows: Flush the CSV after this many rows (None for time-based only).
+    :param flush_interval_ms: Longest time a row waits before being flushed.
+    :param flush_on_state_change: Flush immediately when rocket_state changes.
+    :param log_queue_rows: Queue depth of the background writer.
+    :param log_overflow: Background writer overflow policy (block, drop_oldest, spill).
+    :param binary_log: Also write a .obl binary copy next to the CSV.
+    :return: Tuple (BackgroundLogWriter, binary log path or None).
+    """
+    # The log stays open for the whole session and is flushed according to
+    # the configured policy; a rocket_state change forces a flush
+    csv_writer = schema.csv_writer(
+        output_csv,
+        state_field="rocket_state" if flush_on_state_change else None,
+        flush_rows=flush_rows,
+        flush_interval_ms=flush_interval_ms
+    )
+    session_writer = csv_writer
+
+    # Compact fixed-width copy of the same samples next to the CSV
+    output_binary = None
+    if binary_log:
+        output_binary = os.path.splitext(output_csv)[0] + ".obl"
+        session_writer = TeeLogWriter(
+            csv=csv_writer,
+            binary=schema.binary_writer(output_binary, flush_interval_ms=flush_interval_ms)
+        )
+
+    # Disk writes happen on their own thread so a stalled disk never holds up
+    # serial reads; log_overflow picks block/drop_oldest/spill
+    log_writer = BackgroundLogWriter(session_writer, max_rows=log_queue_rows, overflow=log_overflow)
+    return log_writer, output_binary
+
+
+def new_log_path(output_dir="Flight_Logs"):
+    """Timestamped CSV path for a new flight log"""
+    os.makedirs(output_dir, exist_ok=True)
+    current_time = time.strftime("%Y-%m-%d_%H-%M-%S")
+    return os.path.join(output_dir, f"Flight_Data_{current_time}.csv")
+
+
+def receiver_log_path(output_csv, receiver):
+    """
+    Raw log of one receiver of a merged session.
+
+    Kept in a Receivers directory next to the flight log, so the frontends
+    (which follow the newest Flight_Data_*.csv) keep following the merged log.
+
+    :param output_csv: Merged flight log.
+    :param receiver: Index of the receiver.
+    """
+    directory, name = os.path.split(output_csv)
+    root, ext = os.path.splitext(name)
+    os.makedirs(os.path.join(directory, "Receivers"), exist_ok=True)
+    return os.path.join(directory, "Receivers", f"{root}_rx{receiver + 1}{ext}")
+
+
+class AcquisitionEngine:
+    """
+    Serial read, decode and logging for one receiver, without Qt.
+
+    The loop behind both SerialThread and the acquisition process: connect
+    (and reconnect) to the port, drain it in bulk, decode +RCV lines or binary
+    frames into typed blocks and queue them for the log. Every decoded block
+    is handed to on_records, which is where a consumer - a shared-memory ring,
+    a merger, a Qt thread - picks it up.
+
+    :param port: Serial device or replay:// URL (None until set_port()).
+    :param baudrate: Baud rate for real ports.
+    :param schema: Schema name of the vehicle (None to detect it from the first packet).
+    :param downlink: "ascii" for +RCV lines or "binary" for framed records.
+    :param on_records: Callable taking (schema, records) for every decoded block;
+                       +RCV text arrives in schema.log_dtype, binary frames in
+                       schema.dtype (assigning into a schema.dtype array narrows it).
+    :param on_status: Callable taking (connected, message) on connection changes.
+    :param output_csv: CSV log path (a new timestamped one in Flight_Logs if None).
+    :param log_options: Passed on to open_session_log().
+    """
+
+    # Longest a read blocks waiting for the first byte, so stop() is never
+    # held up for long on a quiet link
+    READ_TIMEOUT = 0.1  # seconds
+    RECONNECT_DELAY = 2  # seconds
+
+    def __init__(self, port=None, baudrate=115200, schema="orizaba", downlink="ascii", on_records=None,
+                 on_status=None, output_csv=None, **log_options):
+        if downlink not in ("ascii", "binary"):
+            raise ValueError(f"Unknown downlink format {downlink!r}")
+
+        self.port = port
+        self.baudrate = baudrate
+        self.downlink = downlink
+        self.on_records = on_records
+        self.on_status = on_status
+        self.log_options = log_options
+        self.running = True
+        self.connected = False
+
+        self.output_csv = output_csv or new_log_path()
+        self.output_binary = None
+        self.log_writer = None
+        self.packets = 0
+
+        self._serial = None
+        self._reader = None
+        self._retry_at = 0.0
+        self._foreign_schemas = set()  # Other vehicles' packets already reported
+
+        self.schema = None
+        if schema is not None:
+            self.open_session(get_schema(schema))
+
+    def open_session(self, schema):
+        """
+        Set the packet schema and open the logs laid out for it.
+
+        :param schema: PacketSchema of the vehicle being received.
+        """
+        self.schema = schema
+        self.log_writer, self.output_binary = open_session_log(schema, self.output_csv, **self.log_options)
+
+    def set_port(self, port, baudrate=None):
+        """Switch to another port (and optionally baud rate); reconnects on the next step"""
+        self.port = port
+        if baudrate:
+            self.baudrate = baudrate
+        self.connected = False
+        self._retry_at = 0.0
+
+    def status(self, connected, message):
+        if self.on_status is not None:
+            self.on_status(connected, message)
+
+    def run(self):
+        """Read until stop() is called"""
+        while self.running:
+            self.step()
+        self.close()
+
+    def step(self):
+        """
+        One pass of the acquisition loop: connect if needed, otherwise read and
+        decode whatever the port has (blocking up to READ_TIMEOUT).
+        """
+        if not self.port:
+            time.sleep(self.READ_TIMEOUT)
+            return
+
+        if not self.connected:
+            if time.monotonic() < self._retry_at:
+                time.sleep(self.READ_TIMEOUT)
+                return
+            try:
+                if self._serial is not None:
+                    self._serial.close()
+                # A replay:// port plays a recorded log back instead
+                self._serial = open_port(self.port, self.baudrate, self.READ_TIMEOUT)
+                if self.downlink == "binary":
+                    self._reader = SerialFrameReader(self._serial)
+                else:
+                    self._reader = SerialLineReader(self._serial)
+                time.sleep(self.RECONNECT_DELAY)  # Allow time for connection to establish
+                self.connected = True
+                print(f"Connected to {self.port}. Waiting for data...")
+                self.status(True, "WAITING FOR SIGNAL")
+            except Exception as e:
+                print(f"Connection failed: {e}. Retrying in {self.RECONNECT_DELAY} seconds...")
+                self.status(False, f"CONNECTION FAILED: {str(e)[:20]}")
+                self._retry_at = time.monotonic() + self.RECONNECT_DELAY
+            return
+
+        try:
+            # Blocks until data arrives, then drains everything waiting
+            if self.downlink == "binary":
+                for schema, records in self._reader.read_frames():
+                    self.handle_records(schema, records)
+            else:
+                self.handle_lines(self._reader.read_lines())
+        except serial.SerialException as e:
+            print(f"Serial connection lost: {e}. Attempting to reconnect...")
+            self.connected = False
+            self.status(False, "RECONNECT RECEIVER")
+            self._retry_at = time.monotonic() + self.RECONNECT_DELAY
+        except Exception as e:
+            print(f"Error reading data: {e}")
+            time.sleep(0.5)  # Brief pause before trying again
+
+    def handle_lines(self, lines):
+        """
+        Parse a block of raw +RCV lines at once and log them.
+
+        :param lines: Raw lines (bytes) from the serial reader.
+        """
+        if not lines:
+            return
+
+        if self.schema is None:
+            # Pick the vehicle from the first packet with a known field count
+            schema = next(filter(None, map(detect_rcv_schema, lines)), None)
+            if schema is None:
+                print(f"Skipping {len(lines)} packet(s) matching no telemetry schema")
+                return
+            print(f"Detected {schema.name} telemetry")
+            self.open_session(schema)
+
+        start = metrics.begin()
+        # Parsed at log precision, so the CSV holds the values as sent rather
+        # than rounded to the float32 the ring and the .obl store
+        records, valid = self.schema.parse(lines, self.schema.log_dtype)
+        metrics.end("decode", start)
+        if not valid.all():
+            print(f"Skipping {len(lines) - int(valid.sum())} malformed packet(s)")
+            metrics.count("malformed", len(lines) - int(valid.sum()))
+            records = records[valid]
+
+        self.handle_records(self.schema, records)
+
+    def handle_records(self, schema, records):
+        """
+        Log a block of typed samples and pass it on.
+
+        :param schema: PacketSchema the records were decoded with.
+        :param records: Structured array with the schema's log_dtype (+RCV text)
+                        or dtype (binary frames, float32 on the wire already).
+        """
+        if self.schema is None:
+            print(f"Detected {schema.name} telemetry")
+            self.open_session(schema)
+        elif schema is not self.schema:
+            # Another vehicle on the same channel; the logs hold one layout
+            print(f"Skipping {len(records)} {schema.name} packet(s) on a {self.schema.name} session")
+            if schema.name not in self._foreign_schemas:
+                # Say so once on screen too, or the session just looks silent
+                self._foreign_schemas.add(schema.name)
+                self.status(self.connected, f"IGNORING {schema.name.upper()} PACKETS")
+            return
+        if not len(records):
+            return
+
+        # Save to CSV - NumPy scalars keep their shortest text form, so a value
+        # logs as the radio printed it (1.23, not 1.2300000190734863)
+        for record in records:
+            self.log_writer.writerow(list(record))
+
+        self.packets += len(records)
+        metrics.count("packets", len(records))
+        if self.on_records is not None:
+            self.on_records(schema, records)
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        """Close the port and flush and close the log"""
+        if self._serial is not None:
+            self._serial.close()
+            self._serial = None
+        if self.log_writer is not None:
+            self.log_writer.close()
+            print(f"Log closed: {self.log_writer.stats()}")
+            self.log_writer = None
+
+
+class ReceiverGroup:
+    """
+    Several ground receivers of one vehicle merged into a single stream.
+
+    Each receiver gets its own AcquisitionEngine on its own thread, with a raw
+    log of everything it heard. Their blocks meet in a PacketMerger; step()
+    releases the merged packets in time order, logs them to the flight log and
+    hands them to on_records - the same contract as a single AcquisitionEngine,
+    so the acquisition process can run either.
+
+    :param ports: Serial device or replay:// URL per receiver (None until set_port()).
+    :param baudrate: Baud rate for real ports.
+    :param schema: Schema name of the vehicle.
+    :param downlink: "ascii" for +RCV lines or "binary" for framed records.
+    :param on_records: Callable taking (schema, records) for every merged block.
+    :param on_status: Callable taking (connected, message) on connection changes.
+    :param output_csv: Merged CSV log path (a new timestamped one in Flight_Logs if None).
+    :param merge_window_ms: How long a packet waits for copies from the other receivers.
+    :param log_options: Passed on to open_session_log() for every log.
+    """
+
+    # How often merged packets are released
+    POLL_INTERVAL = 0.01  # seconds
+
+    def __init__(self, ports, baudrate=115200, schema="orizaba", downlink="ascii", on_records=None,
+                 on_status=None, output_csv=None, merge_window_ms=150, **log_options):
+        self.schema = get_schema(schema)
+        self.on_records = on_records
+        self.on_status = on_status
+        self.running = True
+
+        self.output_csv = output_csv or new_log_path()
+        self.log_writer, self.output_binary = open_session_log(self.schema, self.output_csv, **log_options)
+
+        self.engines = []
+        for receiver, port in enumerate(ports):
+            self.engines.append(AcquisitionEngine(
+                port, baudrate, schema=self.schema.name, downlink=downlink,
+                on_records=lambda schema, records, receiver=receiver: self.add(receiver, records),
+                on_status=lambda connected, message, receiver=receiver: self.status(receiver, message),
+                output_csv=receiver_log_path(self.output_csv, receiver), **log_options
+            ))
+
+        self.merger = PacketMerger(self.schema, [self.receiver_name(i) for i in range(len(ports))],
+                                   window_ms=merge_window_ms)
+        self._lock = threading.Lock()
+        self._threads = []
+
+    @property
+    def connected(self):
+        return any(engine.connected for engine in self.engines)
+
+    def receiver_name(self, receiver):
+        port = self.engines[receiver].port
+        return f"RX{receiver + 1} {port}" if port else f"RX{receiver + 1}"
+
+    def start(self):
+        """Start reading every receiver on its own thread"""
+        for engine in self.engines:
+            thread = threading.Thread(target=engine.run, name=f"receiver-{len(self._threads) + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def set_port(self, port, baudrate=None, receiver=0):
+        """Switch one receiver to another port (and optionally baud rate)"""
+        self.engines[receiver].set_port(port, baudrate)
+        self.merger.receivers[receiver].name = self.receiver_name(receiver)
+
+    def status(self, receiver, message):
+        # Connected while any receiver is
+        if self.on_status is not None:
+            self.on_status(self.connected, f"RX{receiver + 1} {message}")
+
+    def add(self, receiver, records):
+        """Called from a receiver's thread with every block it decoded"""
+        with self._lock:
+            self.merger.add(receiver, records)
+
+    def step(self):
+        """Release, log and pass on the packets whose merge window has passed"""
+        time.sleep(self.POLL_INTERVAL)
+        self.release()
+
+    def release(self, flush=False):
+        with self._lock:
+            records = self.merger.release(flush=flush)
+        if not len(records):
+            return
+
+        for record in records:
+            self.log_writer.writerow(list(record))
+        metrics.count("merged", len(records))
+        if self.on_records is not None:
+            self.on_records(self.schema, records)
+
+    def stats(self):
+        """
+        Contribution of each receiver, for the status display.
+
+        :return: Tuple (released, receivers) - packets in the merged stream and
+                 the list from PacketMerger.stats().
+        """
+        with self._lock:
+            return self.merger.released, self.merger.stats()
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        """Stop the receivers, merge what they still hold and close every log"""
+        for engine in self.engines:
+            engine.stop()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        self.release(flush=True)
+        released, receivers = self.stats()
+        for stats in receivers:
+            print(f"{stats['name']}: {stats['packets']} packets, {stats['unique']} unique, "
+                  f"{stats['chosen']} kept of {released} merged")
+
+        self.log_writer.close()
+        print(f"Log closed: {self.log_writer.stats()}")
+
+
+def acquisition_main(ring_name, commands, events, stop_event, ports, baudrate, downlink, output_csv,
+                     merge_window_ms, log_options):
+    """
+    Entry point of the acquisition process.
+
+    Runs an AcquisitionEngine - or a ReceiverGroup when there is more than one
+    receiver - that writes every decoded block into the shared ring.
+    Connection changes, the log paths and once a second the process's
+    instrumentation snapshot (and receiver stats) are reported on the events
+    queue; set_port requests arrive on the commands queue.
+    """
+    ring = SharedSampleRing.attach(ring_name, writable=True)
+
+    def on_status(connected, message):
+        events.put(("status", connected, message))
+
+    def on_records(schema, records):
+        ring.write(records)
+
+    if len(ports) == 1:
+        engine = AcquisitionEngine(ports[0], baudrate, schema=ring.schema.name, downlink=downlink,
+                                   on_records=on_records, on_status=on_status, output_csv=output_csv,
+                                   **log_options)
+    else:
+        engine = ReceiverGroup(ports, baudrate, schema=ring.schema.name, downlink=downlink,
+                               on_records=on_records, on_status=on_status, output_csv=output_csv,
+                               merge_window_ms=merge_window_ms, **log_options)
+        engine.start()
+    events.put(("log", engine.output_csv, engine.output_binary))
+
+    next_report = time.monotonic() + 1.0
+    try:
+        while not stop_event.is_set():
+            try:
+                while True:
+                    command, *args = commands.get_nowait()
+                    if command == "set_port":
+                        engine.set_port(*args)
+            except queue.Empty:
+                pass
+
+            engine.step()
+
+            if time.monotonic() >= next_report:
+                events.put(("metrics", metrics.snapshot(), engine.log_writer.queue_depth()))
+                if isinstance(engine, ReceiverGroup):
+                    events.put(("receivers", *engine.stats()))
+                next_report = time.monotonic() + 1.0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+        ring.close()
+
+
+class AcquisitionProcess:
+    """
+    Runs serial acquisition in its own process, publishing into a shared ring.
+
+    The GUI process only maps the ring read-only and polls it, so nothing the
+    GUI does - a slow redraw, a layout pass, holding the GIL - can delay a
+    serial read: samples keep being logged and queued in the ring, which holds
+    minutes of data, until the GUI catches up. Other consumers can attach to
+    the ring by name (ring_name) without touching the acquisition process.
+
+    :param schema: Schema name of the vehicle (fixes the ring's record layout).
+    :param port: Serial device or replay:// URL (None until set_port()).
+    :param baudrate: Baud rate for real ports.
+    :param downlink: "ascii" or "binary".
+    :param capacity: Samples held in the ring.
+    :param output_csv: CSV log path (a new timestamped one in Flight_Logs if None).
+    :param receivers: Number of ground receivers; more than one are merged by a
+                      ReceiverGroup (ports after the first are set with set_port()).
+    :param merge_window_ms: How long a packet waits for copies from the other receivers.
+    :param log_options: Passed on to open_session_log() in the child.
+    """
+
+    def __init__(self, schema="orizaba", port=None, baudrate=115200, downlink="ascii", capacity=65536,
+                 output_csv=None, receivers=1, merge_window_ms=150, **log_options):
+        if receivers < 1:
+            raise ValueError("Acquisition needs at least one receiver")
+
+        self.schema = get_schema(schema)
+        self.ports = [port] + [None] * (receivers - 1)
+        self.merge_window_ms = merge_window_ms
+        self.baudrate = baudrate
+        self.downlink = downlink
+        self.output_csv = output_csv or new_log_path()
+        self.output_binary = None
+        self.log_options = log_options
+
+        self.ring = SharedSampleRing.create(self.schema, capacity)
+        self.ring_name = self.ring.name
+
+        # Spawn rather than fork: the parent has Qt and its threads loaded
+        self._context = multiprocessing.get_context("spawn")
+        self.commands = self._context.Queue()
+        self.events = self._context.Queue()
+        self._stop_event = self._context.Event()
+        self._process = None
+
+    def start(self):
+        self._process = self._context.Process(
+            target=acquisition_main,
+            args=(self.ring_name, self.commands, self.events, self._stop_event, self.ports, self.baudrate,
+                  self.downlink, self.output_csv, self.merge_window_ms, self.log_options),
+            name="orbiview-acquisition",
+            daemon=True,
+        )
+        self._process.start()
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def receivers(self):
+        return len(self.ports)
+
+    def set_port(self, port, baudrate=None, receiver=0):
+        """
+        Point one receiver at another port.
+
+        :param port: Serial device or replay:// URL.
+        :param baudrate: New baud rate (unchanged if None).
+        :param receiver: Index of the receiver.
+        """
+        self.ports[receiver] = port
+        if baudrate:
+            self.baudrate = baudrate
+        if self.receivers == 1:
+            self.commands.put(("set_port", port, baudrate))
+        else:
+            self.commands.put(("set_port", port, baudrate, receiver))
+
+    def reader(self):
+        """Read-only view of the ring for this process"""
+        return SharedSampleRing.attach(self.ring_name).reader()
+
+    def poll_events(self):
+        """
+        Take the events reported by the acquisition process since the last call.
+
+        :return: List of tuples ("status", connected, message), ("log", csv, obl),
+                 ("metrics", snapshot, log queue depth) or, with several
+                 receivers, ("receivers", merged packets, per-receiver stats).
+        """
+        events = []
+        try:
+            while True:
+                events.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def stop(self, timeout=5.0):
+        """Stop the acquisition process (flushing its logs) and free the ring"""
+        if self._process is not None:
+            self._stop_event.set()
+            self._process.join(timeout)
+            if self._process.is_alive():
+                print("Acquisition process did not stop; terminating it")
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
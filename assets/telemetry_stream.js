@@ -0,0 +1,40 @@
+// Applies telemetry pushed by the server on /telemetry_stream straight to the HUD.
+// While the stream is connected the dcc.Interval polling is paused; if the
+// connection drops, polling resumes until the browser reconnects on its own.
+(function () {
+    function setProps(id, props) {
+        try {
+            window.dash_clientside.set_props(id, props);
+        } catch (e) {
+            // Element not on this page (layout still loading or different HUD)
+        }
+    }
+
+    function connect() {
+        // Wait until Dash has rendered the layout
+        if (!window.dash_clientside || !window.dash_clientside.set_props ||
+                !document.getElementById('mission-time')) {
+            setTimeout(connect, 250);
+            return;
+        }
+
+        var source = new EventSource('/telemetry_stream');
+
+        source.onopen = function () {
+            setProps('interval-component', {disabled: true});
+        };
+
+        source.onmessage = function (event) {
+            var update = JSON.parse(event.data);
+            Object.keys(update).forEach(function (id) {
+                setProps(id, update[id]);
+            });
+        };
+
+        source.onerror = function () {
+            setProps('interval-component', {disabled: false});
+        };
+    }
+
+    connect();
+})();
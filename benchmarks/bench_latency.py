@@ -0,0 +1,354 @@
+"""
+End-to-end latency benchmark: serial bytes in -> plot/HUD out.
+
+Timestamped Orizaba packets are written into a pseudo-terminal that the real
+SerialThread reads, and the time each packet reaches every stage of the
+pipeline is recorded against the time it was sent:
+
+    receipt   SerialLineReader returned the line to the ingest engine
+    parse     the line was parsed into values
+    csv       the CSV writer accepted the row (background writer thread)
+    csv_flush the row reached the file (flush)
+    signal    the GUI thread entered update_with_serial_data/update_with_batch
+    ingest    the GUI handler returned (sample in the plot history)
+    plot      the render loop called setData with the sample
+    hud       the Dash frontend built the HUD update for the row
+
+The packet's time_elapsed field carries its sequence number. The GUI runs on
+the offscreen Qt platform, so "plot" is the setData call rather than the
+scanout of the pixels.
+
+Delivery modes: "batch" and "signal" run a SerialThread inside the GUI process
+(batched or one signal per packet); "process" runs acquisition in a separate
+process feeding a shared-memory ring, where the receipt, parse and csv stages
+happen out of reach of the probes and "signal" is the ring poll.
+
+Usage:
+    python benchmarks/bench_latency.py [--rates 10,50,200] [--max-points 500,5000,flight]
+                                       [--modes batch,signal,process] [--duration 5] [--no-frontend]
+
+Results are written as JSON to benchmarks/results/ (or --out) for comparison
+across versions.
+"""
+import argparse
+import json
+import os
+import platform
+import pty
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tty
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+STAGES = ["receipt", "parse", "csv", "csv_flush", "signal", "ingest", "plot", "hud"]
+
+# Stages every case must report; the first three run out of reach of the
+# probes in process mode. A stage with no samples means a probe broke.
+EXPECTED_STAGES = {
+    "batch": STAGES[:7],
+    "signal": STAGES[:7],
+    "process": ["signal", "ingest", "plot"],
+}
+
+
+class StageRecorder:
+    """Send and stage timestamps per packet sequence number"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.sent = {}
+        self.stages = {stage: {} for stage in STAGES}
+        self.unflushed = []
+        self.unplotted = []
+
+    def mark(self, stage, seqs, now=None):
+        now = time.perf_counter() if now is None else now
+        times = self.stages[stage]
+        for seq in seqs:
+            times.setdefault(int(seq), now)
+
+    def summary(self):
+        """Latency percentiles in ms for every stage"""
+        result = {}
+        for stage, times in self.stages.items():
+            latencies = np.array([(t - self.sent[seq]) * 1000 for seq, t in times.items() if seq in self.sent])
+            if not len(latencies):
+                result[stage] = {"count": 0}
+                continue
+            result[stage] = {
+                "count": int(len(latencies)),
+                "mean": float(latencies.mean()),
+                "p50": float(np.percentile(latencies, 50)),
+                "p95": float(np.percentile(latencies, 95)),
+                "p99": float(np.percentile(latencies, 99)),
+                "max": float(latencies.max()),
+            }
+        return result
+
+
+recorder = StageRecorder()
+
+
+def install_probes(dashboard_module, frontend_module=None):
+    """Wrap the pipeline's stage functions so they report to the recorder"""
+    from log_writer import CsvLogWriter
+    from serial_engine import SerialLineReader
+    from telemetry_schema import ORIZABA, PacketSchema
+
+    time_column = ORIZABA.index("time_elapsed")
+
+    def line_seq(line):
+        # time_elapsed is the second to last field
+        return int(line.rsplit(b",", 2)[1])
+
+    read_lines = SerialLineReader.read_lines
+
+    def probed_read_lines(self):
+        lines = read_lines(self)
+        if lines:
+            recorder.mark("receipt", [line_seq(line) for line in lines if line.count(b",") == 16])
+        return lines
+    SerialLineReader.read_lines = probed_read_lines
+
+    parse = PacketSchema.parse
+
+    def probed_parse(self, lines, dtype=None):
+        records, valid = parse(self, lines, dtype)
+        recorder.mark("parse", records["time_elapsed"][valid])
+        return records, valid
+    PacketSchema.parse = probed_parse
+
+    writerow = CsvLogWriter.writerow
+
+    def probed_writerow(self, row):
+        seq = int(row[time_column])
+        recorder.unflushed.append(seq)
+        writerow(self, row)
+        recorder.mark("csv", [seq])
+    CsvLogWriter.writerow = probed_writerow
+
+    flush = CsvLogWriter.flush
+
+    def probed_flush(self):
+        flush(self)
+        seqs, recorder.unflushed = recorder.unflushed, []
+        recorder.mark("csv_flush", seqs)
+    CsvLogWriter.flush = probed_flush
+
+    dashboard = dashboard_module.SensorDashboard
+
+    update_with_serial_data = dashboard.update_with_serial_data
+
+    def probed_update_with_serial_data(self, data):
+        seq = int(data[time_column])
+        recorder.mark("signal", [seq])
+        update_with_serial_data(self, data)
+        recorder.mark("ingest", [seq])
+        recorder.unplotted.append(seq)
+    dashboard.update_with_serial_data = probed_update_with_serial_data
+
+    update_with_batch = dashboard.update_with_batch
+
+    def probed_update_with_batch(self, block):
+        seqs = block["time_elapsed"].tolist()
+        recorder.mark("signal", seqs)
+        update_with_batch(self, block)
+        recorder.mark("ingest", seqs)
+        recorder.unplotted.extend(seqs)
+    dashboard.update_with_batch = probed_update_with_batch
+
+    render_frame = dashboard.render_frame
+
+    def probed_render_frame(self, dirty):
+        render_frame(self, dirty)
+        if "plots" in dirty:
+            seqs, recorder.unplotted = recorder.unplotted, []
+            recorder.mark("plot", seqs)
+    dashboard.render_frame = probed_render_frame
+
+    if frontend_module is not None:
+        broadcaster = frontend_module.telemetry_broadcaster
+        formatter = broadcaster.formatter
+
+        def probed_formatter(row):
+            update = formatter(row)
+            if row.get("time_elapsed") is not None:
+                recorder.mark("hud", [row["time_elapsed"]])
+            return update
+        broadcaster.formatter = probed_formatter
+
+
+def run_case(app, dashboard_module, rate, max_points, mode, duration, frontend_module=None):
+    """
+    Stream packets at a fixed rate through a fresh dashboard and collect stage latencies.
+
+    :return: Dict describing the case and its per-stage percentiles.
+    """
+    from PyQt6.QtCore import QEventLoop, QTimer
+    from radio_simulator import FlightProfile, sample_values
+    from telemetry_schema import ORIZABA
+
+    recorder.reset()
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+
+    dashboard = dashboard_module.SensorDashboard(max_points=max_points,
+                                                 batch_interval_ms=None if mode == "signal" else 20,
+                                                 acquisition="process" if mode == "process" else "thread")
+    dashboard.serial_thread.set_port(os.ttyname(slave))
+
+    def wait(ms):
+        loop = QEventLoop()
+        QTimer.singleShot(int(ms), loop.quit)
+        loop.exec()
+
+    # Let the serial thread connect (it sleeps after opening the port)
+    deadline = time.monotonic() + 10
+    while not dashboard.serial_thread.connected and time.monotonic() < deadline:
+        wait(50)
+    wait(300)
+
+    subscriber = frontend_module.telemetry_broadcaster.subscribe() if frontend_module else None
+
+    # Packets with their sequence number in time_elapsed, from the simulator's flight
+    profile = FlightProfile(seed=0)
+    count = int(rate * duration)
+    time_column = ORIZABA.index("time_elapsed")
+    packets = []
+    for seq in range(1, count + 1):
+        values = list(sample_values(ORIZABA, profile.sample(seq / rate)))
+        values[time_column] = seq
+        packets.append((seq, ORIZABA.format_rcv(values)))
+
+    def send():
+        start = time.perf_counter()
+        for seq, packet in packets:
+            delay = start + seq / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            recorder.sent[seq] = time.perf_counter()
+            os.write(master, packet)
+
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+    while sender.is_alive():
+        wait(50)
+        if subscriber is not None:
+            while not subscriber.empty():
+                subscriber.get_nowait()
+    wait(1000)  # Drain
+
+    if subscriber is not None:
+        frontend_module.telemetry_broadcaster.unsubscribe(subscriber)
+    dashboard.serial_thread.stop()
+    dashboard.render_scheduler.stop()
+    dashboard.deleteLater()
+    wait(50)
+    os.close(master)
+    os.close(slave)
+
+    return {
+        "rate": rate,
+        "max_points": max_points,
+        "mode": mode,
+        "duration": duration,
+        "sent": len(recorder.sent),
+        "stages": recorder.summary(),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure serial-to-display latency per pipeline stage")
+    parser.add_argument("--rates", default="10,50,200", help="Comma-separated packet rates (packets/s)")
+    parser.add_argument("--max-points", default="500,5000,flight",
+                        help="Comma-separated plot history sizes ('flight' for the whole flight)")
+    parser.add_argument("--modes", default="batch,signal,process",
+                        help="Comma-separated delivery modes (batch, signal, process)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of traffic per case")
+    parser.add_argument("--no-frontend", action="store_true", help="Skip the Dash frontend HUD stage")
+    parser.add_argument("--out", default=None, help="Result file (default benchmarks/results/latency-<time>.json)")
+    args = parser.parse_args()
+
+    rates = [float(rate) for rate in args.rates.split(",")]
+    max_points = [None if points == "flight" else int(points) for points in args.max_points.split(",")]
+    modes = args.modes.split(",")
+    out = args.out or os.path.join(ROOT, "benchmarks", "results",
+                                   time.strftime("latency-%Y%m%d-%H%M%S.json"))
+    out = os.path.abspath(out)
+
+    # Logs go to a scratch Flight_Logs, which the frontend also watches
+    workdir = tempfile.mkdtemp(prefix="orbiview-bench-")
+    os.chdir(workdir)
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    import orizaba_dashboard
+    orizaba_dashboard.SensorDashboard.show_port_selection = lambda self: None
+
+    frontend = None
+    if not args.no_frontend:
+        try:
+            import orizaba_frontend as frontend
+        except ImportError as e:
+            print(f"Frontend unavailable ({e}); skipping the hud stage")
+
+    install_probes(orizaba_dashboard, frontend)
+
+    results = []
+    missing = []
+    for mode in modes:
+        for points in max_points:
+            for rate in rates:
+                print(f"mode={mode} max_points={points or 'flight'} rate={rate:g}/s ...")
+                case = run_case(app, orizaba_dashboard, rate, points, mode, args.duration, frontend)
+                results.append(case)
+                for stage in STAGES:
+                    stats = case["stages"][stage]
+                    if stats["count"]:
+                        print(f"  {stage:<10} n={stats['count']:<6} p50={stats['p50']:8.2f} ms  "
+                              f"p95={stats['p95']:8.2f} ms  p99={stats['p99']:8.2f} ms")
+                expected = EXPECTED_STAGES.get(mode, []) + (["hud"] if frontend is not None else [])
+                empty = [stage for stage in expected if not case["stages"][stage]["count"]]
+                if empty:
+                    print(f"  no samples reached: {', '.join(empty)}")
+                    missing.append((mode, points, rate, empty))
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as file:
+        json.dump({
+            "benchmark": "latency",
+            "revision": git_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, file, indent=2)
+    print(f"Results saved to {out}")
+
+    if missing:
+        # Packets were lost somewhere in the pipeline (or a probe no longer fits)
+        print(f"{len(missing)} case(s) are missing stages; see above")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Microbenchmark: vectorized +RCV block parser and binary frame decoder vs. the
+per-line SerialThread parse, on clean input and with a fraction of the lines
+corrupted the way a noisy LoRa link does (truncated lines, flipped bits).
+
+Usage:
+    python benchmarks/bench_parser.py [--rows 50000] [--block 64] [--bad 0,0.01,0.05]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serial_engine import FrameDecoder, encode_frame
+from telemetry_schema import ORIZABA
+
+
+def make_lines(rows, bad_fraction, seed=0):
+    """Synthetic Orizaba +RCV lines, with a fraction of them corrupted"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(rows):
+        values = [f"{rng.uniform(-50, 50):.2f}" for _ in range(13)]
+        values += [f"{rng.uniform(-80.5, -80.1):.6f}", f"{rng.uniform(25.5, 25.9):.6f}", str(i * 4), str(rng.randint(0, 8))]
+        line = ("+RCV=" + ",".join(values)).encode()
+        if rng.random() < bad_fraction:
+            if rng.random() < 0.5:
+                # Truncated, with garbage after the cut
+                line = line[:rng.randint(5, len(line) - 1)] + b"#"
+            else:
+                # Bit flips in the payload
+                line = bytearray(line)
+                for _ in range(rng.randint(1, 3)):
+                    line[rng.randrange(5, len(line))] ^= 1 << rng.randrange(8)
+                line = bytes(line)
+        lines.append(line)
+    return lines
+
+
+def make_frames(lines):
+    """Binary downlink frames carrying the same samples as the valid lines"""
+    records, valid = ORIZABA.parse(lines)
+    return [encode_frame(ORIZABA, record) for record in records[valid]]
+
+
+def parse_per_line(line):
+    """Copy of the SerialThread.handle_line parse, minus the logging and signal"""
+    if "+RCV=" in line:
+        clean_data = line.replace("+RCV=", "")
+        data_values = clean_data.split(',')
+
+        if len(data_values) >= 17:
+            tilt_angle = float(data_values[0])
+            z_axis_g_force = float(data_values[1])
+            linear_accel_x = float(data_values[2])
+            linear_accel_y = float(data_values[3])
+            linear_accel_z = float(data_values[4])
+            linear_velocity_x = float(data_values[5])
+            linear_velocity_y = float(data_values[6])
+            linear_velocity_z = float(data_values[7])
+            altitude = float(data_values[8])
+            pressure = float(data_values[9])
+            heading = float(data_values[10])
+            temperature = float(data_values[11])
+            humidity = float(data_values[12])
+            longitude = float(data_values[13])
+            latitude = float(data_values[14])
+            time_elapsed = int(data_values[15])
+            rocket_state = data_values[16]
+
+            return (
+                tilt_angle, z_axis_g_force, linear_accel_x, linear_accel_y, linear_accel_z,
+                linear_velocity_x, linear_velocity_y, linear_velocity_z,
+                altitude, pressure, heading, temperature, humidity,
+                longitude, latitude, time_elapsed, int(rocket_state)
+            )
+    return None
+
+
+def bench_per_line(lines):
+    start = time.perf_counter()
+    good = 0
+    for line in lines:
+        try:
+            if parse_per_line(line.decode('utf-8', errors='replace')) is not None:
+                good += 1
+        except ValueError:
+            pass
+    return time.perf_counter() - start, good
+
+
+def bench_block(lines, block):
+    start = time.perf_counter()
+    good = 0
+    for i in range(0, len(lines), block):
+        records, valid = ORIZABA.parse(lines[i:i + block])
+        good += int(valid.sum())
+    return time.perf_counter() - start, good
+
+
+def bench_frames(frames, block):
+    # Feed the decoder the same number of packets per read as the block parser
+    chunks = [b"".join(frames[i:i + block]) for i in range(0, len(frames), block)]
+    decoder = FrameDecoder()
+    start = time.perf_counter()
+    good = 0
+    for chunk in chunks:
+        for _, records in decoder.feed(chunk):
+            good += len(records)
+    return time.perf_counter() - start, good
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare +RCV parsing throughput")
+    parser.add_argument("--rows", type=int, default=50000, help="Number of lines to parse")
+    parser.add_argument("--block", type=int, default=64, help="Lines per block for the vectorized parser")
+    parser.add_argument("--bad", default="0,0.01,0.05", help="Comma-separated fractions of corrupted lines")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    for bad in (float(fraction) for fraction in args.bad.split(",")):
+        run(args, bad)
+
+
+def run(args, bad):
+    lines = make_lines(args.rows, bad)
+
+    per_line = min((bench_per_line(lines) for _ in range(args.repeat)), key=lambda r: r[0])
+    block = min((bench_block(lines, args.block) for _ in range(args.repeat)), key=lambda r: r[0])
+    frames = make_frames(lines)
+    framed = min((bench_frames(frames, args.block) for _ in range(args.repeat)), key=lambda r: r[0])
+
+    text_bytes = sum(len(line) + 2 for line in lines) / len(lines)  # + CRLF
+    frame_bytes = sum(len(frame) for frame in frames) / len(frames)
+
+    print(f"{args.rows} lines, {bad:.1%} corrupted, block size {args.block}")
+    print(f"  per-line parse : {args.rows / per_line[0]:>12,.0f} rows/s ({per_line[1]} valid)")
+    print(f"  block parse    : {args.rows / block[0]:>12,.0f} rows/s ({block[1]} valid)")
+    print(f"  binary frames  : {len(frames) / framed[0]:>12,.0f} rows/s ({framed[1]} valid)")
+    print(f"  speedup        : {per_line[0] / block[0]:>12.1f}x block, {per_line[0] / framed[0]:.1f}x frames")
+    print(f"  wire bytes     : {text_bytes:>12.1f} per +RCV line, {frame_bytes:.1f} per frame "
+          f"({text_bytes / frame_bytes:.2f}x packets per baud)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark: redraw cost of a whole-flight plot, raw vs. decimated.
+
+A synthetic flight of N samples is held in a FlightHistory; each frame appends
+a batch of new samples and redraws one pyqtgraph line (setData plus a render
+of the widget on the offscreen Qt platform) using one of:
+
+    raw       every sample
+    min/max   the incremental MinMaxDecimator
+    lod       the LodPyramid level for the whole flight
+    lod zoom  the LodPyramid level for a view of 1% of the flight
+
+Usage:
+    python benchmarks/bench_plot.py [--samples 10000,100000,1000000] [--frames 30] [--batch 10]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+from decimation import LodPyramid, MinMaxDecimator
+from flight_history import FlightHistory
+
+
+def make_flight(samples, seed=0):
+    """Altitude-like series: boost, coast to apogee, descent, plus sensor noise and a few spikes"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples, dtype=np.float64) * 4
+    phase = np.linspace(0, 1, samples)
+    altitude = 3000 * np.sin(np.pi * np.clip(phase * 1.6, 0, 1)) + rng.normal(0, 5, samples)
+    altitude[rng.integers(0, samples, 5)] += 800
+    return t, altitude
+
+
+def bench(widget, t, y, frames, batch, method):
+    """Mean and worst ms per frame while the flight grows by batch samples a frame"""
+    history = FlightHistory(["time", "value"], capacity=len(t))
+    history.extend([t[:-frames * batch], y[:-frames * batch]])
+    line = widget.plot([], [])
+    decimator = MinMaxDecimator(history, "time", "value", pixels=widget.width())
+    pyramid = LodPyramid(history, "time", "value")
+    zoom = (len(t) // 2, len(t) // 2 + len(t) // 100)
+
+    times = []
+    for frame in range(frames + 1):
+        if frame:
+            start = len(t) - (frames - frame + 1) * batch
+            history.extend([t[start:start + batch], y[start:start + batch]])
+        began = time.perf_counter()
+        if method == "raw":
+            line.setData(history.view("time"), history.view("value"))
+        elif method == "min/max":
+            line.setData(*decimator.points())
+        elif method == "lod":
+            line.setData(*pyramid.points(pixels=widget.width()))
+        else:
+            line.setData(*pyramid.points(*zoom, pixels=widget.width()))
+        widget.grab()
+        times.append((time.perf_counter() - began) * 1000)
+
+    widget.removeItem(line)
+    # The first frame builds the reduction from scratch; report it separately
+    return times[0], float(np.mean(times[1:])), float(np.max(times[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare whole-flight redraw cost with and without decimation")
+    parser.add_argument("--samples", default="10000,100000,1000000", help="Comma-separated flight lengths")
+    parser.add_argument("--frames", type=int, default=30, help="Frames timed per case")
+    parser.add_argument("--batch", type=int, default=10, help="Samples added per frame")
+    parser.add_argument("--width", type=int, default=800, help="Plot width in pixels")
+    args = parser.parse_args()
+
+    import pyqtgraph as pg
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    widget = pg.PlotWidget()
+    widget.resize(args.width, 400)
+    widget.show()
+    app.processEvents()
+
+    for samples in (int(n) for n in args.samples.split(",")):
+        t, y = make_flight(samples)
+        print(f"{samples:,} samples, {args.batch} new per frame, {args.width} px")
+        for method in ("raw", "min/max", "lod", "lod zoom"):
+            first, mean, worst = bench(widget, t, y, args.frames, args.batch, method)
+            print(f"  {method:<8} first {first:8.2f} ms   mean {mean:8.2f} ms   max {worst:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from telemetry_schema import detect_schema, get_schema
+
+# Orbiview binary flight log (.obl)
+#
+# Layout:
+#   preamble   8s magic, u16 version, u16 reserved, u32 data offset (little-endian)
+#   header     UTF-8 JSON describing the schema, space-padded so records start
+#              on a 16-byte boundary
+#   records    fixed-width little-endian records, one per sample, appended
+#              in arrival order
+#
+# The JSON header lists every field with its NumPy dtype string, so a reader
+# needs nothing but the file to rebuild the record layout and can load the data
+# section with a single numpy.frombuffer/memmap.
+
+MAGIC = b"ORBVLOG\0"
+VERSION = 1
+EXTENSION = ".obl"
+
+_PREAMBLE = struct.Struct("<8sHHI")
+_ALIGNMENT = 16
+
+
+def schema_dtype(fields):
+    """
+    Build the packed record dtype for a list of (name, dtype) fields.
+
+    :param fields: List of (name, NumPy dtype string) pairs.
+    :return: numpy.dtype with no padding between fields.
+    """
+    return np.dtype([(name, dtype) for name, dtype in fields])
+
+
+def _encode_header(schema, fields):
+    header = json.dumps({
+        "schema": schema,
+        "fields": [[name, dtype] for name, dtype in fields],
+        "record_size": schema_dtype(fields).itemsize,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }).encode("utf-8")
+
+    # Pad so the first record is aligned
+    data_offset = _PREAMBLE.size + len(header)
+    data_offset += -data_offset % _ALIGNMENT
+    header = header.ljust(data_offset - _PREAMBLE.size, b" ")
+
+    return _PREAMBLE.pack(MAGIC, VERSION, 0, data_offset) + header
+
+
+def read_header(file):
+    """
+    Read and validate the header of an open binary log.
+
+    :param file: Binary file object positioned at the start of the log.
+    :return: Tuple (header dict, record dtype, data offset).
+    """
+    preamble = file.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError("File too short to be a binary flight log")
+
+    magic, version, _, data_offset = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise ValueError("Not an Orbiview binary flight log")
+    if version > VERSION:
+        raise ValueError(f"Unsupported binary log version {version}")
+
+    header = json.loads(file.read(data_offset - _PREAMBLE.size).decode("utf-8"))
+    dtype = schema_dtype([tuple(field) for field in header["fields"]])
+    return header, dtype, data_offset
+
+
+class BinaryLogWriter:
+    """
+    Append-only writer for the binary flight log format.
+
+    Each row is packed with a precompiled struct into a fixed-width record and
+    written to a buffered file handle that stays open for the whole session.
+    Implements the same writerow/poll/flush/close/stats interface as
+    CsvLogWriter so it can sit behind BackgroundLogWriter.
+
+    :param path: Log file to create.
+    :param schema: Name of a schema in the telemetry_schema registry.
+    :param flush_interval_ms: Flush when this much time has passed (None to disable).
+    :param buffer_size: Size in bytes of the file buffer.
+    """
+
+    def __init__(self, path, schema, flush_interval_ms=100, buffer_size=64 * 1024):
+        self.path = path
+        self.schema = schema
+        self.flush_interval_ms = flush_interval_ms
+
+        fields = get_schema(schema).binary_fields()
+        self.dtype = schema_dtype(fields)
+        self._struct = struct.Struct("<" + "".join(self.dtype[name].char for name, _ in fields))
+        self._casts = [int if self.dtype[name].kind in "iu" else float for name, _ in fields]
+
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+
+        self._file = open(path, mode='wb', buffering=buffer_size)
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+        header = _encode_header(schema, fields)
+        self._file.write(header)
+        self.bytes_written += len(header)
+        self.flush()
+
+    def writerow(self, row):
+        """
+        Append one sample.
+
+        :param row: Sequence of values in schema field order.
+        """
+        record = self._struct.pack(*[cast(value) for cast, value in zip(self._casts, row)])
+        self._file.write(record)
+        self.rows_written += 1
+        self.bytes_written += len(record)
+        self._pending_rows += 1
+        self.poll()
+
+    def poll(self):
+        """Flush buffered records if the flush interval has elapsed"""
+        if not self._pending_rows or self.flush_interval_ms is None:
+            return
+        if (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self.flushes += 1
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def stats(self):
+        return {
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+        }
+
+
+def load_binary_log(path):
+    """
+    Load a whole binary log into memory.
+
+    A trailing partial record (log still being written, or cut short by a
+    crash) is ignored.
+
+    :param path: Binary log file.
+    :return: Tuple (header dict, structured NumPy array of records).
+    """
+    with open(path, "rb") as file:
+        header, dtype, data_offset = read_header(file)
+        data = file.read()
+
+    count = len(data) // dtype.itemsize
+    return header, np.frombuffer(data, dtype=dtype, count=count)
+
+
+def csv_to_binary(csv_path, out_path=None, schema=None):
+    """
+    Convert a CSV flight log to the binary format.
+
+    :param csv_path: Existing Flight_Data_*.csv log.
+    :param out_path: Destination file (defaults to csv_path with .obl extension).
+    :param schema: Schema name; detected from the CSV header when omitted.
+    :return: Path of the written binary log.
+    """
+    df = pd.read_csv(csv_path)
+    if schema is None:
+        detected = detect_schema(df.columns)
+        if detected is None:
+            raise ValueError(f"No telemetry schema matches the columns of {csv_path}")
+        schema = detected.name
+
+    fields = get_schema(schema).binary_fields()
+    records = np.empty(len(df), dtype=schema_dtype(fields))
+    for name, _ in fields:
+        records[name] = df[name].to_numpy()
+
+    out_path = out_path or os.path.splitext(csv_path)[0] + EXTENSION
+
+    # Write next to the destination and swap it in, so a reader never maps a
+    # half-written log and a failed conversion leaves the old file alone
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=EXTENSION, dir=os.path.dirname(os.path.abspath(out_path)))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_encode_header(schema, fields))
+            file.write(records.tobytes())
+        os.replace(temp_path, out_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return out_path
+
+
+def binary_to_csv(binary_path, out_path=None):
+    """
+    Convert a binary flight log back to CSV.
+
+    :param binary_path: Binary log file.
+    :param out_path: Destination file (defaults to binary_path with .csv extension).
+    :return: Path of the written CSV log.
+    """
+    _, records = load_binary_log(binary_path)
+
+    # Shortest text that round-trips each column's precision
+    formats = []
+    for name in records.dtype.names:
+        kind = records.dtype[name].kind
+        if kind in "iu":
+            formats.append("%d")
+        elif records.dtype[name].itemsize == 4:
+            formats.append("%.7g")
+        else:
+            formats.append("%.15g")
+
+    out_path = out_path or os.path.splitext(binary_path)[0] + ".csv"
+    np.savetxt(out_path, records, fmt=formats, delimiter=",",
+               header=",".join(records.dtype.names), comments="")
+    return out_path
+
+
+# Command line converter:
+#   python binary_log.py to-binary Flight_Logs/Flight_Data_*.csv
+#   python binary_log.py to-csv Flight_Logs/Flight_Data_*.obl
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("to-binary", "to-csv"):
+        print("Usage: python binary_log.py to-binary|to-csv FILE [FILE ...]")
+        sys.exit(1)
+
+    convert = csv_to_binary if sys.argv[1] == "to-binary" else binary_to_csv
+    for path in sys.argv[2:]:
+        try:
+            out_path = convert(path)
+            print(f"{path} ({os.path.getsize(path)} bytes) -> {out_path} ({os.path.getsize(out_path)} bytes)")
+        except Exception as e:
+            print(f"Error converting {path}: {e}")
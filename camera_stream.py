@@ -0,0 +1,237 @@
+import threading
+import time
+
+import cv2
+
+from instrumentation import metrics
+
+
+class StreamStats:
+    """Counters for a single /video_feed viewer"""
+
+    def __init__(self):
+        self.connected_at = time.monotonic()
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.bytes_sent = 0
+
+    def as_dict(self):
+        elapsed = max(time.monotonic() - self.connected_at, 1e-6)
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+            "bytes_sent": self.bytes_sent,
+            "fps": self.frames_sent / elapsed,
+            "kbps": self.bytes_sent * 8 / 1000 / elapsed,
+        }
+
+
+class CameraBroadcaster:
+    """
+    Captures and encodes the webcam once for every MJPEG viewer.
+
+    A single producer thread owns the capture device, JPEG-encodes each frame
+    and publishes it into a shared slot together with a sequence number. Every
+    /video_feed response streams from that slot; a client that is slower than
+    the camera simply skips to the newest frame instead of queueing old ones.
+    The device is opened when the first viewer connects and released once the
+    last one leaves.
+
+    Output is paced to target_fps and downscaled to max_width. When adaptive is
+    set, JPEG quality is lowered while encoding eats too much of the frame
+    budget or viewers start skipping frames, and raised back once both recover.
+
+    :param device: Index or path passed to cv2.VideoCapture.
+    :param retry_delay: Seconds to wait before reopening a failed device.
+    :param target_fps: Maximum frames encoded per second.
+    :param max_width: Frames wider than this are downscaled (None keeps full size).
+    :param jpeg_quality: Preferred JPEG quality (0-100).
+    :param min_quality: Lowest quality adaptive mode may drop to.
+    :param adaptive: Enable automatic quality reduction.
+    """
+
+    # Fraction of the frame interval encoding may take before quality drops
+    ENCODE_BUDGET = 0.5
+    # Fraction of frames viewers may skip before quality drops
+    SKIP_BUDGET = 0.25
+    QUALITY_STEP = 5
+
+    def __init__(self, device=0, retry_delay=1.0, target_fps=15, max_width=960,
+                 jpeg_quality=70, min_quality=30, adaptive=True):
+        self.device = device
+        self.retry_delay = retry_delay
+        self.target_fps = target_fps
+        self.max_width = max_width
+        self.jpeg_quality = jpeg_quality
+        self.min_quality = min_quality
+        self.adaptive = adaptive
+
+        self.quality = jpeg_quality
+        self.frames_captured = 0
+        self.frames_encoded = 0
+        self.encode_ms = 0.0  # Exponential moving average
+        self.frame_bytes = 0  # Size of the latest JPEG
+
+        self._frame = None
+        self._sequence = 0
+        self._streams = {}
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def frames(self):
+        """
+        Generator yielding multipart MJPEG chunks for one viewer.
+
+        :return: Iterator of bytes ready to be written to the HTTP response.
+        """
+        stats = self._add_viewer()
+        last_sequence = 0
+        try:
+            while True:
+                with self._condition:
+                    # Wait for a frame newer than the one this viewer last sent
+                    self._condition.wait_for(lambda: self._sequence != last_sequence, timeout=self.retry_delay)
+                    if self._sequence == last_sequence:
+                        continue
+                    frame_bytes = self._frame
+                    if last_sequence:
+                        stats.frames_skipped += self._sequence - last_sequence - 1
+                    last_sequence = self._sequence
+
+                stats.frames_sent += 1
+                stats.bytes_sent += len(frame_bytes)
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+        finally:
+            self._remove_viewer(stats)
+
+    def viewer_count(self):
+        with self._condition:
+            return len(self._streams)
+
+    def stats(self):
+        """
+        Return encoder settings and per-viewer stream metrics.
+
+        :return: Dict suitable for JSON serialization.
+        """
+        with self._condition:
+            return {
+                "target_fps": self.target_fps,
+                "max_width": self.max_width,
+                "jpeg_quality": self.jpeg_quality,
+                "quality": self.quality,
+                "frames_captured": self.frames_captured,
+                "frames_encoded": self.frames_encoded,
+                "encode_ms": self.encode_ms,
+                "frame_bytes": self.frame_bytes,
+                "viewers": [stream.as_dict() for stream in self._streams.values()],
+            }
+
+    def _add_viewer(self):
+        stats = StreamStats()
+        with self._condition:
+            self._streams[id(stats)] = stats
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return stats
+
+    def _remove_viewer(self, stats):
+        with self._condition:
+            self._streams.pop(id(stats), None)
+
+    def _publish(self, frame_bytes):
+        with self._condition:
+            self._frame = frame_bytes
+            self._sequence += 1
+            self.frames_encoded += 1
+            self.frame_bytes = len(frame_bytes)
+            self._condition.notify_all()
+
+    def _encode(self, frame):
+        """Downscale and JPEG-encode one frame, tracking encode time"""
+        start = time.perf_counter()
+
+        if self.max_width and frame.shape[1] > self.max_width:
+            height = int(frame.shape[0] * self.max_width / frame.shape[1])
+            frame = cv2.resize(frame, (self.max_width, height), interpolation=cv2.INTER_AREA)
+
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+
+        metrics.end("video_encode", start)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.encode_ms = elapsed_ms if not self.frames_encoded else 0.9 * self.encode_ms + 0.1 * elapsed_ms
+        return buffer.tobytes()
+
+    def _adapt_quality(self, skipped_before):
+        """Step JPEG quality down under load and back up once it clears"""
+        if not self.adaptive:
+            return
+
+        interval_ms = 1000 / self.target_fps if self.target_fps else 0
+        encode_slow = interval_ms and self.encode_ms > interval_ms * self.ENCODE_BUDGET
+
+        # Frames skipped by viewers since the previous adjustment
+        with self._condition:
+            streams = list(self._streams.values())
+        skipped = sum(stream.frames_skipped for stream in streams)
+        sent = sum(stream.frames_sent for stream in streams)
+        backlog = (skipped - skipped_before[0]) / max(sent - skipped_before[1], 1)
+        skipped_before[:] = [skipped, sent]
+
+        if encode_slow or backlog > self.SKIP_BUDGET:
+            self.quality = max(self.min_quality, self.quality - self.QUALITY_STEP)
+        elif self.quality < self.jpeg_quality:
+            self.quality = min(self.jpeg_quality, self.quality + 1)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._streams:
+                    # Nobody watching - free the device until someone connects
+                    self._thread = None
+                    return
+
+            camera = cv2.VideoCapture(self.device)
+
+            # Error troubleshooting
+            if not camera.isOpened():
+                print("Error: Could not open video device")
+                camera.release()
+                time.sleep(self.retry_delay)  # Wait before retrying
+                continue
+
+            interval = 1 / self.target_fps if self.target_fps else 0
+            next_frame = time.monotonic()
+            skipped_before = [0, 0]
+
+            try:
+                while self.viewer_count() > 0:
+                    # grab() keeps the driver queue fresh without decoding frames we drop
+                    if not camera.grab():
+                        break
+                    self.frames_captured += 1
+
+                    now = time.monotonic()
+                    if now < next_frame:
+                        continue
+                    next_frame = max(next_frame + interval, now)
+
+                    success, frame = camera.retrieve()
+                    if not success:
+                        break
+
+                    self._publish(self._encode(frame))
+
+                    # Re-evaluate quality about once a second
+                    if self.frames_encoded % max(int(self.target_fps or 1), 1) == 0:
+                        self._adapt_quality(skipped_before)
+            finally:
+                camera.release()
+
+            if self.viewer_count() > 0:
+                # The device stopped delivering frames (unplugged, driver reset);
+                # wait before reopening it rather than spinning on open/fail
+                print("Error: Failed to read frame from video device")
+                time.sleep(self.retry_delay)
@@ -0,0 +1,365 @@
+import numpy as np
+
+
+def minmax_rows(xs, ys):
+    """
+    Reduce each row of samples to its lowest and highest point.
+
+    :param xs: 2-D array of x values, one bucket per row, oldest first.
+    :param ys: 2-D array of y values of the same shape.
+    :return: Tuple (x, y) of arrays of shape (rows, 2), the two points of every
+             row in time order.
+    """
+    pick = np.sort(np.stack((ys.argmin(axis=1), ys.argmax(axis=1)), axis=1), axis=1)
+    return np.take_along_axis(xs, pick, axis=1), np.take_along_axis(ys, pick, axis=1)
+
+
+def minmax_decimate(x, y, buckets):
+    """
+    Reduce a series to the min and max of each of a fixed number of buckets.
+
+    Unlike taking every n-th sample, a spike of a single sample always survives,
+    so the launch peak and apogee look the same however far out the plot is.
+
+    :param x: 1-D array of x values.
+    :param y: 1-D array of y values.
+    :param buckets: Number of buckets (the result has up to 2 x buckets points).
+    :return: Tuple (x, y) of decimated arrays in time order.
+    """
+    n = len(y)
+    if n <= 2 * buckets:
+        return x, y
+
+    size = -(-n // buckets)
+    whole = n // size * size
+    bx, by = minmax_rows(x[:whole].reshape(-1, size), y[:whole].reshape(-1, size))
+    if whole < n:
+        tx, ty = minmax_rows(x[whole:][None, :], y[whole:][None, :])
+        bx, by = np.concatenate((bx, tx)), np.concatenate((by, ty))
+    return bx.ravel(), by.ravel()
+
+
+class MinMaxDecimator:
+    """
+    Incrementally maintained min/max reduction of one channel of a FlightHistory.
+
+    Samples are grouped into buckets of equal count and each completed bucket
+    is stored as its min and max point. When the stored buckets reach twice the
+    target, neighbours are merged pairwise and the bucket size doubles, so the
+    reduced series always has between one and two points per pixel however long
+    the flight gets. update() only reduces the samples added since the last
+    call, and the newest samples (not yet a full bucket) are drawn as their
+    min/max plus the latest sample so the live edge never lags.
+
+    :param history: FlightHistory the channels are read from.
+    :param x_column: Channel used as the x axis.
+    :param y_column: Channel being plotted.
+    :param pixels: Width of the plot in pixels.
+    """
+
+    def __init__(self, history, x_column, y_column, pixels=1000):
+        self.history = history
+        self.x_column = x_column
+        self.y_column = y_column
+        self.set_pixels(pixels)
+
+    def set_pixels(self, pixels):
+        """
+        Adapt to a new plot width, rebuilding from the history if it changed a lot.
+
+        :param pixels: Width of the plot in pixels.
+        """
+        buckets = max(int(pixels) // 2, 16)
+        current = getattr(self, "buckets", None)
+        if current and 0.75 * current <= buckets <= 1.25 * current:
+            return  # Close enough to the current resolution; skip the rebuild
+        self.buckets = buckets
+        self.reset()
+
+    def reset(self):
+        """Forget the reduction; the next update() rebuilds it from the history"""
+        self.bucket = 1        # Samples per bucket
+        self.consumed = 0      # History index of the first sample not in a stored bucket
+        self._count = 0        # Stored buckets
+        self._x = np.zeros((2 * self.buckets, 2))
+        self._y = np.zeros((2 * self.buckets, 2))
+
+    def update(self):
+        """Fold the samples added to the history since the last call into buckets"""
+        n = len(self.history)
+        if n < self.consumed:
+            # History was cleared
+            self.reset()
+
+        # Coarsen first if the new samples would overflow the bucket store
+        while self._count + (n - self.consumed) // self.bucket >= 2 * self.buckets:
+            self._merge()
+            self.bucket *= 2
+
+        whole = (n - self.consumed) // self.bucket * self.bucket
+        if not whole:
+            return
+        stop = self.consumed + whole
+        x = self.history.view(self.x_column, self.consumed, stop).reshape(-1, self.bucket)
+        y = self.history.view(self.y_column, self.consumed, stop).reshape(-1, self.bucket)
+        bx, by = minmax_rows(x, y)
+
+        count = self._count + len(bx)
+        self._x[self._count:count] = bx
+        self._y[self._count:count] = by
+        self._count = count
+        self.consumed = stop
+
+    def points(self):
+        """
+        Bring the reduction up to date and return it for plotting.
+
+        :return: Tuple (x, y) of 1-D arrays, about one to two points per pixel.
+        """
+        self.update()
+        x = [self._x[:self._count].ravel()]
+        y = [self._y[:self._count].ravel()]
+
+        tail_x = self.history.view(self.x_column, self.consumed)
+        tail_y = self.history.view(self.y_column, self.consumed)
+        if len(tail_y) > 3:
+            # Partial bucket: its extremes, then the newest sample
+            bx, by = minmax_rows(tail_x[None, :], tail_y[None, :])
+            x += [bx[0], tail_x[-1:]]
+            y += [by[0], tail_y[-1:]]
+        else:
+            x.append(tail_x)
+            y.append(tail_y)
+        return np.concatenate(x), np.concatenate(y)
+
+    def _merge(self):
+        """Combine stored buckets pairwise (an odd last bucket stays as it is)"""
+        pairs = self._count // 2
+        if not pairs:
+            return
+        x, y = minmax_rows(self._x[:2 * pairs].reshape(pairs, 4), self._y[:2 * pairs].reshape(pairs, 4))
+        if self._count % 2:
+            self._x[pairs] = self._x[self._count - 1]
+            self._y[pairs] = self._y[self._count - 1]
+        self._x[:pairs] = x
+        self._y[:pairs] = y
+        self._count = pairs + self._count % 2
+
+
+class _LodLevel:
+    """Growable per-block min/max/sum arrays of one pyramid level"""
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.mins = np.zeros(capacity)
+        self.maxs = np.zeros(capacity)
+        self.sums = np.zeros(capacity)
+        self.imins = np.zeros(capacity, dtype=np.int64)  # History index of each block's min
+        self.imaxs = np.zeros(capacity, dtype=np.int64)
+
+    def extend(self, mins, maxs, sums, imins, imaxs):
+        needed = self.count + len(mins)
+        if needed > len(self.mins):
+            capacity = len(self.mins)
+            while capacity < needed:
+                capacity *= 2
+            for name in ("mins", "maxs", "sums", "imins", "imaxs"):
+                grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                grown[:self.count] = getattr(self, name)[:self.count]
+                setattr(self, name, grown)
+
+        self.mins[self.count:needed] = mins
+        self.maxs[self.count:needed] = maxs
+        self.sums[self.count:needed] = sums
+        self.imins[self.count:needed] = imins
+        self.imaxs[self.count:needed] = imaxs
+        self.count = needed
+
+
+class LodPyramid:
+    """
+    Multi-resolution min/max/mean index over one channel of a FlightHistory.
+
+    Level k summarises blocks of factor**k samples; every level is built from
+    the one below as blocks complete, so ingest only touches new samples and
+    a level is added whenever the top one fills up. A query for any sample
+    range picks the coarsest level with at least one block per pixel, so a zoomed-in
+    view of the boost phase is drawn at full resolution and the whole of an
+    hours-long soak test at the same cost. Each block keeps the positions of
+    its min and max, so peaks are drawn where they happened.
+
+    :param history: FlightHistory the channels are read from.
+    :param x_column: Channel used as the x axis.
+    :param y_column: Channel being indexed.
+    :param factor: Samples (or lower-level blocks) per block.
+    """
+
+    def __init__(self, history, x_column, y_column, factor=4):
+        self.history = history
+        self.x_column = x_column
+        self.y_column = y_column
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        """Drop every level; the next update() rebuilds them from the history"""
+        self.levels = []  # levels[k - 1] holds blocks of factor**k samples
+        self.indexed = 0  # Samples covered by the complete level 1 blocks
+
+    def update(self):
+        """Fold the samples added to the history since the last call into the levels"""
+        n = len(self.history)
+        if n < self.indexed:
+            # History was cleared
+            self.reset()
+        if n - self.indexed < self.factor:
+            return
+
+        factor = self.factor
+        below = n  # Complete units (samples or blocks) of the level below
+        k = 0
+        while k < len(self.levels) or below >= factor:
+            if k == len(self.levels):
+                self.levels.append(_LodLevel())
+            level = self.levels[k]
+            start, stop = level.count, below // factor
+            if stop > start:
+                self._build(k, start, stop)
+            below = level.count
+            k += 1
+        self.indexed = self.levels[0].count * factor if self.levels else 0
+
+    def _build(self, k, start, stop):
+        """Compute blocks start..stop of level k + 1 from the level below"""
+        factor = self.factor
+        if k == 0:
+            y = self.history.view(self.y_column, start * factor, stop * factor).reshape(-1, factor)
+            mins, maxs, sums = y.min(axis=1), y.max(axis=1), y.sum(axis=1)
+            base = np.arange(start, stop) * factor
+            imins = base + y.argmin(axis=1)
+            imaxs = base + y.argmax(axis=1)
+        else:
+            below = self.levels[k - 1]
+            lo = below.mins[start * factor:stop * factor].reshape(-1, factor)
+            hi = below.maxs[start * factor:stop * factor].reshape(-1, factor)
+            pick_lo = lo.argmin(axis=1)[:, None]
+            pick_hi = hi.argmax(axis=1)[:, None]
+            mins = np.take_along_axis(lo, pick_lo, axis=1)[:, 0]
+            maxs = np.take_along_axis(hi, pick_hi, axis=1)[:, 0]
+            sums = below.sums[start * factor:stop * factor].reshape(-1, factor).sum(axis=1)
+            imins = np.take_along_axis(below.imins[start * factor:stop * factor].reshape(-1, factor),
+                                       pick_lo, axis=1)[:, 0]
+            imaxs = np.take_along_axis(below.imaxs[start * factor:stop * factor].reshape(-1, factor),
+                                       pick_hi, axis=1)[:, 0]
+        self.levels[k].extend(mins, maxs, sums, imins, imaxs)
+
+    def level_for(self, samples, pixels):
+        """
+        Pick the pyramid level for drawing a range.
+
+        :param samples: Number of samples in the range.
+        :param pixels: Width of the plot in pixels.
+        :return: Level number (0 for raw samples).
+        """
+        blocks = max(int(pixels), 1)
+        level = 0
+        while level < len(self.levels) and samples > blocks * self.factor ** level:
+            level += 1
+        return level
+
+    def points(self, start=0, stop=None, pixels=1000):
+        """
+        Points to draw for a sample range at the plot's resolution.
+
+        :param start: Index of the first sample in view.
+        :param stop: Index past the last sample in view (None for the newest).
+        :param pixels: Width of the plot in pixels.
+        :return: Tuple (x, y) of 1-D arrays, between half a point and two points
+                 per pixel, plus the newest sample.
+        """
+        self.update()
+        n = len(self.history)
+        stop = n if stop is None else min(stop, n)
+        start = max(min(start, stop), 0)
+        level = self.level_for(stop - start, pixels)
+        if level == 0:
+            return self.history.view(self.x_column, start, stop), self.history.view(self.y_column, start, stop)
+
+        # Whole blocks overlapping the range; the edge blocks may reach past it
+        size = self.factor ** level
+        blocks = self.levels[level - 1]
+        first = start // size
+        last = min(-(-stop // size), blocks.count)
+        pick = np.sort(np.stack((blocks.imins[first:last], blocks.imaxs[first:last]), axis=1), axis=1).ravel()
+        x = [self.history.view(self.x_column)[pick]]
+        y = [self.history.view(self.y_column)[pick]]
+
+        # Samples past the last complete block (the live edge): extremes, then the newest
+        tail = max(last * size, start)
+        if tail < stop:
+            tail_x = self.history.view(self.x_column, tail, stop)
+            tail_y = self.history.view(self.y_column, tail, stop)
+            if len(tail_y) > 3:
+                bx, by = minmax_rows(tail_x[None, :], tail_y[None, :])
+                tail_x, tail_y = np.append(bx[0], tail_x[-1]), np.append(by[0], tail_y[-1])
+            x.append(tail_x)
+            y.append(tail_y)
+        return np.concatenate(x), np.concatenate(y)
+
+    def summary(self, start=0, stop=None):
+        """
+        Min, max and mean of a sample range without scanning it.
+
+        The range is covered with the coarsest blocks that fit inside it, so
+        the cost grows with the number of levels, not the number of samples.
+
+        :param start: Index of the first sample.
+        :param stop: Index past the last sample (None for the newest).
+        :return: Dict with min, max, mean and count (None values if the range is empty).
+        """
+        self.update()
+        n = len(self.history)
+        stop = n if stop is None else min(stop, n)
+        start = max(min(start, stop), 0)
+        count = stop - start
+        if not count:
+            return {"min": None, "max": None, "mean": None, "count": 0}
+
+        lows, highs, total = [], [], 0.0
+        factor = self.factor
+        values = self.history.view(self.y_column)
+
+        # Climb while the next level still has whole blocks inside the range,
+        # summarising the unaligned edges at the current level on the way up
+        level, lo, hi = 0, start, stop
+        while level < len(self.levels):
+            a = -(-lo // factor)
+            b = min(hi // factor, self.levels[level].count)
+            if a >= b:
+                break
+            for edge_lo, edge_hi in ((lo, a * factor), (b * factor, hi)):
+                if edge_lo < edge_hi:
+                    if level == 0:
+                        chunk = values[edge_lo:edge_hi]
+                        lows.append(chunk.min())
+                        highs.append(chunk.max())
+                        total += chunk.sum()
+                    else:
+                        blocks = self.levels[level - 1]
+                        lows.append(blocks.mins[edge_lo:edge_hi].min())
+                        highs.append(blocks.maxs[edge_lo:edge_hi].max())
+                        total += blocks.sums[edge_lo:edge_hi].sum()
+            level, lo, hi = level + 1, a, b
+
+        if level == 0:
+            chunk = values[lo:hi]
+            lows.append(chunk.min())
+            highs.append(chunk.max())
+            total += chunk.sum()
+        else:
+            blocks = self.levels[level - 1]
+            lows.append(blocks.mins[lo:hi].min())
+            highs.append(blocks.maxs[lo:hi].max())
+            total += blocks.sums[lo:hi].sum()
+
+        return {"min": float(min(lows)), "max": float(max(highs)), "mean": float(total / count), "count": count}
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+class FlightHistory:
+    """
+    Growable, column-oriented store for every sample of a flight.
+
+    Same interface as RingBuffer, but nothing ever drops out: storage doubles
+    when it fills up, so append() and extend() stay amortised constant time and
+    view() is still one contiguous NumPy slice per channel. Roughly 200 packets/s
+    of seven float64 channels is about 40 MB per hour.
+
+    :param columns: Channel names, e.g. ["time", "altitude"]. All channels share
+                    the same write position, so a "time" column acts as the
+                    common x axis.
+    :param capacity: Initial number of samples allocated per channel.
+    :param dtype: NumPy dtype of the stored values.
+    """
+
+    def __init__(self, columns, capacity=4096, dtype=np.float64):
+        self.columns = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.zeros((len(self.columns), max(capacity, 1)), dtype=dtype)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        return self._data.shape[1]
+
+    def clear(self):
+        self._count = 0
+
+    def append(self, values):
+        """
+        Add one sample to every channel.
+
+        :param values: Sequence with one value per column, in column order.
+        """
+        self._reserve(1)
+        self._data[:, self._count] = values
+        self._count += 1
+
+    def extend(self, block):
+        """
+        Add several samples to every channel at once.
+
+        :param block: Array-like of shape (len(columns), n), oldest sample first.
+        """
+        block = np.asarray(block, dtype=self._data.dtype)
+        n = block.shape[1]
+        if n == 0:
+            return
+        self._reserve(n)
+        self._data[:, self._count:self._count + n] = block
+        self._count += n
+
+    def view(self, column, start=0, stop=None):
+        """
+        Contiguous view of a channel's samples, oldest first.
+
+        The view is only valid until the next append; take a copy to keep it.
+
+        :param column: Channel name.
+        :param start: Index of the first sample.
+        :param stop: Index past the last sample (None for the newest).
+        :return: 1-D NumPy view.
+        """
+        stop = self._count if stop is None else min(stop, self._count)
+        return self._data[self._index[column], start:stop]
+
+    def latest(self, column):
+        """Most recent value of a channel (None if empty)"""
+        if not self._count:
+            return None
+        return self._data[self._index[column], self._count - 1]
+
+    def _reserve(self, n):
+        """Grow the storage (doubling) so n more samples fit"""
+        needed = self._count + n
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        data = np.zeros((len(self.columns), capacity), dtype=self._data.dtype)
+        data[:, :self._count] = self._data[:, :self._count]
+        self._data = data
+
+
+class PlotClock:
+    """
+    Turns received time_elapsed values into a never-decreasing plot axis.
+
+    The flight computer restarts its counter when it reboots, so over a whole
+    flight the raw times can run backwards: lines fold back over the earlier
+    flight and a binary search over the axis picks the wrong samples. Forward
+    steps are kept as they are, so the axis reads time_elapsed until the first
+    restart; a backwards jump is drawn as one typical packet interval (the
+    median forward step of the latest block), as ReplayClock does for replays.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start over; the next time converted is used as it is"""
+        self.last = None     # Last raw time seen
+        self.value = None    # Axis value of that sample
+        self.step = 0.0      # Interval a restart is drawn as
+        self.restarts = 0
+
+    def convert(self, times):
+        """
+        Map a block of raw times onto the plot axis.
+
+        :param times: 1-D array of time_elapsed values, oldest first.
+        :return: 1-D float64 array of axis values.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if not len(times):
+            return times
+        if self.last is None:
+            self.last = self.value = float(times[0])
+
+        steps = np.diff(times, prepend=self.last)
+        forward = steps[steps > 0]
+        if len(forward):
+            self.step = float(np.median(forward))
+        backward = steps < 0
+        if backward.any():
+            steps[backward] = self.step
+            self.restarts += int(backward.sum())
+
+        axis = self.value + np.cumsum(steps)
+        self.last = float(times[-1])
+        self.value = float(axis[-1])
+        return axis
@@ -0,0 +1,206 @@
+import os
+
+import numpy as np
+
+from binary_log import EXTENSION, csv_to_binary, read_header
+
+# Sidecars built from a CSV whose own .obl is incomplete are named
+# Flight_Data_*.sidecar.obl, so the log the dashboard wrote is left untouched
+SIDECAR_SUFFIX = ".sidecar"
+
+
+def _record_count(path):
+    """Complete records in a binary log (0 if it is not a readable log)"""
+    try:
+        with open(path, "rb") as file:
+            _, dtype, data_offset = read_header(file)
+    except (OSError, ValueError):
+        return 0
+    return max(os.path.getsize(path) - data_offset, 0) // dtype.itemsize
+
+
+def _csv_rows(path, chunk_size=1 << 20):
+    """Data rows in a CSV log (lines after the header)"""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        # Last row has no line ending yet
+        lines += 1
+    return max(lines - 1, 0)
+
+
+class FlightLog:
+    """
+    Memory-mapped, read-only view of a flight log for replay and analysis.
+
+    Binary (.obl) logs are mapped directly. For a CSV log the sibling .obl
+    written by the dashboard is used when it holds every row; otherwise a
+    sidecar .obl is built from the CSV once and reused on later opens.
+
+    Nothing is read up front: opening only parses the small header, and pages
+    are faulted in as slices are touched. column() and between() return NumPy
+    views into the mapping, so memory use follows the slice actually used
+    rather than the length of the flight.
+
+    Time lookups assume the time field never decreases. That fails for logs in
+    which the flight computer restarted its clock, so the time column is
+    checked once as records are mapped (monotonic). For those logs, a time
+    range is picked out with a mask over the time column instead of a binary
+    search. The result covers every record whose own time_elapsed is in the
+    range, across restarts, and between() returns a copy instead of a view.
+
+    :param path: .obl or .csv flight log.
+    :param time_field: Field used for time-range lookups.
+    """
+
+    def __init__(self, path, time_field="time_elapsed"):
+        self.path = path
+        self.time_field = time_field
+        self.binary_path = self._binary_path(path)
+
+        with open(self.binary_path, "rb") as file:
+            self.header, self.dtype, self._data_offset = read_header(file)
+
+        self.schema = self.header.get("schema")
+        self.records = None
+        self.monotonic = True  # time_field never decreases in the records mapped so far
+        self._checked = 0
+        self.refresh()
+
+    @staticmethod
+    def _binary_path(path):
+        """
+        Return the .obl to map for path.
+
+        For a CSV the .obl written alongside it by the dashboard is used when
+        it holds every row of the CSV. That file is never modified here: if it
+        is missing a sidecar is built in its place, and if it is behind the CSV
+        (e.g. the session crashed before its last flush) a separate sidecar is
+        built from the CSV and kept until the CSV changes length.
+        """
+        if path.endswith(EXTENSION):
+            return path
+
+        stem = os.path.splitext(path)[0]
+        rows = _csv_rows(path)
+
+        binary_path = stem + EXTENSION
+        if not os.path.exists(binary_path):
+            print(f"Building binary sidecar for {path}")
+            return csv_to_binary(path, binary_path)
+        if _record_count(binary_path) >= rows:
+            return binary_path
+
+        sidecar_path = stem + SIDECAR_SUFFIX + EXTENSION
+        if not os.path.exists(sidecar_path) or _record_count(sidecar_path) != rows:
+            print(f"{binary_path} is behind {path}; building binary sidecar {sidecar_path}")
+            csv_to_binary(path, sidecar_path)
+        return sidecar_path
+
+    def refresh(self):
+        """
+        Remap the log to pick up records appended since it was opened.
+
+        A trailing partial record is left out until it is complete.
+        """
+        size = os.path.getsize(self.binary_path)
+        count = max(size - self._data_offset, 0) // self.dtype.itemsize
+
+        if count == 0:
+            # mmap cannot map an empty range
+            self.records = np.empty(0, dtype=self.dtype)
+        else:
+            self.records = np.memmap(self.binary_path, dtype=self.dtype, mode="r",
+                                     offset=self._data_offset, shape=(count,))
+
+        # Only the newly mapped records (and the one before them) need checking
+        if self.monotonic and count > self._checked:
+            times = self.records[self.time_field][max(self._checked - 1, 0):]
+            self.monotonic = bool((np.diff(times) >= 0).all())
+        self._checked = count
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def fields(self):
+        return self.dtype.names
+
+    def column(self, name, start=None, stop=None):
+        """
+        View of one field without copying.
+
+        :param name: Field name, e.g. "altitude".
+        :param start: Optional first record index.
+        :param stop: Optional end record index (exclusive).
+        :return: Strided NumPy view into the mapped log.
+        """
+        return self.records[name][start:stop]
+
+    def index_range(self, start_time=None, end_time=None):
+        """
+        Contiguous record indices covering a time range.
+
+        Samples are logged in arrival order, so in a log whose clock never
+        restarted time_elapsed is non-decreasing and a binary search only
+        touches O(log n) pages. After a restart the records of a range are not
+        contiguous; use indices() or between() for such logs.
+
+        :param start_time: First time_elapsed value to include (None for start of log).
+        :param end_time: Last time_elapsed value to include (None for end of log).
+        :return: Tuple (start index, stop index).
+        :raises ValueError: If the log's clock restarted (monotonic is False).
+        """
+        if not self.monotonic:
+            raise ValueError(f"time_elapsed restarts in {self.path}; use indices() or between()")
+        times = self.records[self.time_field]
+        start = 0 if start_time is None else int(np.searchsorted(times, start_time, side="left"))
+        stop = len(times) if end_time is None else int(np.searchsorted(times, end_time, side="right"))
+        return start, max(start, stop)
+
+    def _mask(self, start_time, end_time):
+        """Records whose time is within the range, by a full scan of the time column"""
+        times = self.records[self.time_field]
+        mask = np.ones(len(times), dtype=bool)
+        if start_time is not None:
+            mask &= times >= start_time
+        if end_time is not None:
+            mask &= times <= end_time
+        return mask
+
+    def indices(self, start_time=None, end_time=None):
+        """
+        Indices of every record within a time range, in log order.
+
+        :param start_time: First time_elapsed value to include (None for start of log).
+        :param end_time: Last time_elapsed value to include (None for end of log).
+        :return: 1-D integer array.
+        """
+        if self.monotonic:
+            return np.arange(*self.index_range(start_time, end_time))
+        return np.flatnonzero(self._mask(start_time, end_time))
+
+    def between(self, start_time=None, end_time=None, fields=None):
+        """
+        Records within a time range.
+
+        :param start_time: First time_elapsed value to include.
+        :param end_time: Last time_elapsed value to include.
+        :param fields: Optional field name or list of names to select.
+        :return: NumPy array (structured for several fields, plain for one);
+                 a view into the mapping, or a copy if the log's clock restarted.
+        """
+        if self.monotonic:
+            start, stop = self.index_range(start_time, end_time)
+            records = self.records[start:stop]
+        else:
+            records = self.records[self._mask(start_time, end_time)]
+        if fields is None:
+            return records
+        if isinstance(fields, str):
+            return records[fields]
+        return records[list(fields)]
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+
+class RollingHistogram:
+    """
+    Durations of the most recent executions of one stage.
+
+    Samples go into a fixed-size ring together with their completion time, so
+    recording is two array stores and summaries always describe the recent
+    past rather than the whole session.
+
+    :param size: Number of recent samples kept.
+    :param idle: The durations are waiting time (e.g. queueing) rather than
+                 work, so no CPU share is reported for them.
+    """
+
+    def __init__(self, size=1024, idle=False):
+        self.size = size
+        self.idle = idle
+        self.count = 0          # Samples recorded since the last reset
+        self.total = 0.0        # Seconds spent in the stage since the last reset
+
+        # Plain lists: a store is far cheaper than into a NumPy array
+        self._values = [0.0] * size
+        self._times = [0.0] * size
+        self._lock = threading.Lock()
+
+    def record(self, seconds, now):
+        with self._lock:
+            index = self.count % self.size
+            self._values[index] = seconds
+            self._times[index] = now
+            self.count += 1
+            self.total += seconds
+
+    def summary(self, now, window=10.0):
+        """
+        Summarise the kept samples.
+
+        :param now: Current time.perf_counter() value.
+        :param window: Seconds over which calls/s and busy time are averaged.
+        :return: Dict of count, calls per second, busy fraction of one core
+                 (work stages only) and mean/p50/p95/p99/max duration in ms.
+        """
+        with self._lock:
+            kept = min(self.count, self.size)
+            values = np.array(self._values[:kept])
+            times = np.array(self._times[:kept])
+            count = self.count
+
+        summary = {"count": count}
+        if not kept:
+            return summary
+
+        # Rates cover the window, or only the part of it still in the ring
+        recent = times >= now - window
+        span = min(window, now - times.min())
+        if kept < self.size:
+            span = max(span, 1.0)
+        ms = values * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        summary.update({
+            "per_sec": float(recent.sum() / span),
+            "busy": None if self.idle else float(values[recent].sum() / span),
+            "mean_ms": float(ms.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(ms.max()),
+        })
+        return summary
+
+
+class Metrics:
+    """
+    Stage timers and counters for the hot path.
+
+    Timing uses the monotonic perf_counter clock:
+
+        start = metrics.begin()
+        ...work...
+        metrics.end("decode", start)
+
+    When disabled, begin() returns None and end()/count() return at once, so
+    the probes can stay in the hot path permanently. Collection is on unless
+    the ORBIVIEW_METRICS environment variable is "0".
+
+    :param enabled: Whether samples are collected.
+    :param size: Samples kept per stage histogram.
+    """
+
+    def __init__(self, enabled=True, size=1024):
+        self.enabled = enabled
+        self.size = size
+        self.started = time.perf_counter()
+
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """Start timing a stage (None when collection is off)"""
+        if not self.enabled:
+            return None
+        return time.perf_counter()
+
+    def end(self, stage, start):
+        """
+        Finish timing a stage started with begin().
+
+        :param stage: Stage name.
+        :param start: Value returned by begin().
+        """
+        if start is None:
+            return
+        now = time.perf_counter()
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            self.record(stage, now - start, now)
+        else:
+            histogram.record(now - start, now)
+
+    def record(self, stage, seconds, now=None, idle=False):
+        """
+        Add one duration measured elsewhere (e.g. a queueing delay).
+
+        :param stage: Stage name.
+        :param seconds: Duration in seconds.
+        :param now: Completion time (defaults to now).
+        :param idle: The stage is waiting time, not work (fixed by the first sample).
+        """
+        if not self.enabled:
+            return
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(stage, RollingHistogram(self.size, idle))
+        histogram.record(seconds, time.perf_counter() if now is None else now)
+
+    def count(self, counter, n=1):
+        """Add n to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._counters = {}
+            self.started = time.perf_counter()
+
+    def snapshot(self, window=10.0):
+        """
+        Current figures for every stage and counter.
+
+        :param window: Seconds over which rates and busy time are averaged.
+        :return: JSON-serialisable dict.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            stages = dict(self._stages)
+            counters = dict(self._counters)
+        return {
+            "enabled": self.enabled,
+            "uptime": now - self.started,
+            "stages": {name: histogram.summary(now, window) for name, histogram in sorted(stages.items())},
+            "counters": counters,
+        }
+
+
+def format_snapshot(snapshot):
+    """
+    Render a snapshot as a fixed-width text table for on-screen overlays.
+
+    :param snapshot: Dict from Metrics.snapshot().
+    :return: Multi-line string.
+    """
+    if not snapshot["enabled"]:
+        return "Instrumentation off (ORBIVIEW_METRICS=0)"
+
+    lines = [f"{'stage':<16}{'/s':>7}{'cpu%':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+    for name, stage in snapshot["stages"].items():
+        if "p50_ms" not in stage:
+            continue
+        busy = "-" if stage["busy"] is None else f"{stage['busy'] * 100:.1f}"
+        lines.append(f"{name:<16}{stage['per_sec']:>7.0f}{busy:>7}"
+                     f"{stage['p50_ms']:>9.3f}{stage['p99_ms']:>9.3f}{stage['max_ms']:>9.2f}")
+    if snapshot["counters"]:
+        lines.append("")
+        lines.extend(f"{name:<16}{value:>10}" for name, value in sorted(snapshot["counters"].items()))
+    return "\n".join(lines)
+
+
+# Shared by every module of one process (dashboard or frontend)
+metrics = Metrics(enabled=os.environ.get("ORBIVIEW_METRICS", "1") != "0")
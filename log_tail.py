@@ -0,0 +1,230 @@
+import os
+import threading
+
+from instrumentation import metrics
+
+
+class CsvTailReader:
+    """
+    Follows a flight log CSV the way `tail -f` would.
+
+    Keeps the byte offset of the last complete line it parsed, so every call to
+    poll() only reads and parses the bytes appended since the previous call. A
+    trailing line without its newline is held back until the writer finishes it.
+    The reader starts over when the log is switched, truncated or replaced.
+
+    :param path: Optional CSV file to start following immediately.
+    :param from_end: When attaching to an existing log, skip straight to its tail
+                     instead of parsing every row already on disk.
+    :param tail_bytes: How far back from the end of the file to look for the
+                       latest rows when from_end is set.
+    """
+
+    def __init__(self, path=None, from_end=True, tail_bytes=64 * 1024):
+        self.path = None
+        self.from_end = from_end
+        self.tail_bytes = tail_bytes
+
+        self.header = None
+        self.latest = None  # Most recent parsed row as a dict
+        self.rows_read = 0
+
+        self._file = None
+        self._identity = None
+        self._offset = 0
+        self._partial = b""
+
+        if path is not None:
+            self.follow(path)
+
+    def follow(self, path):
+        """
+        Switch to a new log file if path differs from the one being followed.
+
+        :param path: CSV file to follow, or None to stop following.
+        :return: True if the reader switched files.
+        """
+        if path == self.path:
+            return False
+
+        self.close()
+        self.path = path
+        self.header = None
+        self.latest = None
+        self.rows_read = 0
+        return True
+
+    def close(self):
+        """Release the file handle of the current log"""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._identity = None
+        self._offset = 0
+        self._partial = b""
+
+    def poll(self):
+        """
+        Parse the complete lines appended since the last call.
+
+        :return: List of newly read rows (dicts keyed by header column), oldest first.
+        """
+        if self.path is None:
+            return []
+
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            # Log disappeared; drop the handle and wait for it to come back
+            self.close()
+            return []
+
+        identity = (stat.st_dev, stat.st_ino)
+        if self._file is None or identity != self._identity or stat.st_size < self._offset:
+            # New, replaced or truncated file - start again from the top
+            if not self._reopen(identity):
+                return []
+
+        if stat.st_size == self._offset:
+            return []
+
+        self._file.seek(self._offset)
+        chunk = self._file.read(stat.st_size - self._offset)
+        self._offset += len(chunk)
+
+        data = self._partial + chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            # No complete line yet
+            self._partial = data
+            return []
+
+        self._partial = data[end + 1:]
+        return self._parse_lines(data[:end].split(b"\n"))
+
+    def _reopen(self, identity):
+        """Open the followed log from scratch and position it for reading"""
+        self.close()
+        self.header = None
+        self.latest = None
+        self.rows_read = 0
+
+        try:
+            self._file = open(self.path, "rb")
+        except OSError as e:
+            print(f"Error opening log file {self.path}: {e}")
+            return False
+
+        self._identity = identity
+
+        # Header is always read from the start of the file
+        header_line = self._file.readline()
+        if not header_line.endswith(b"\n"):
+            # Header still being written; try again on the next poll
+            self.close()
+            return False
+
+        self.header = header_line.decode("utf-8").strip().split(",")
+        self._offset = self._file.tell()
+
+        if self.from_end:
+            size = os.fstat(self._file.fileno()).st_size
+            start = size - self.tail_bytes
+            if start > self._offset:
+                # Land mid-file and drop everything up to the next line boundary
+                self._file.seek(start - 1)
+                skipped = self._file.readline()
+                self._offset = start - 1 + len(skipped)
+
+        return True
+
+    def _parse_lines(self, lines):
+        rows = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            values = line.decode("utf-8", errors="replace").split(",")
+            if len(values) != len(self.header):
+                print(f"Skipping malformed log line: {line[:40]!r}")
+                continue
+
+            rows.append(dict(zip(self.header, map(_to_number, values))))
+
+        if rows:
+            self.latest = rows[-1]
+            self.rows_read += len(rows)
+        return rows
+
+
+def _to_number(value):
+    """Convert a CSV field to float, leaving non-numeric fields as strings"""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class SnapshotCache:
+    """
+    Shares one parsed view of the active log between every caller.
+
+    Dash runs each callback of each connected browser on its own, so without
+    this every tick would poll the log once per callback per viewer. Reads are
+    keyed on the file identity plus its size and mtime; while none of those
+    change, callers get the cached row back without touching the file again.
+
+    :param reader: CsvTailReader used to refresh the snapshot on a miss.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.hits = 0
+        self.misses = 0
+
+        self._key = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Return the latest row of the log at path.
+
+        :param path: CSV file currently being followed.
+        :return: Latest row as a dict, or None if the log has no data yet.
+        """
+        try:
+            stat = os.stat(path)
+            key = (path, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            key = (path, None)
+
+        with self._lock:
+            if key == self._key:
+                self.hits += 1
+                return self._snapshot
+
+            self.misses += 1
+            start = metrics.begin()
+            self.reader.follow(path)
+            self.reader.poll()
+            metrics.end("snapshot_read", start)
+            self._key = key
+            self._snapshot = self.reader.latest
+            return self._snapshot
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        :return: Dict with hits, misses, hit_ratio and rows_read.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "rows_read": self.reader.rows_read,
+            }
@@ -0,0 +1,247 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def read_events(self, timeout):
+        """
+        Wait up to timeout seconds and return pending (mask, name) events.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogDirectoryWatcher:
+    """
+    Tracks the active flight log in a directory without rescanning it.
+
+    On Linux the directory is watched with inotify: a new session file becomes
+    active as soon as it is created, and a log that starts receiving writes
+    takes over from an idle one, so switching happens within milliseconds and
+    the cost does not grow with the number of old sessions. Elsewhere (or if
+    inotify is unavailable) a polling backend rescans the directory only when
+    its mtime changes. The directory is scanned once at start-up to pick the
+    most recently modified log, as find_latest_csv() used to.
+
+    :param directory: Directory containing the flight logs.
+    :param pattern: Glob pattern log file names must match.
+    :param poll_interval: Seconds between directory checks in polling mode.
+    :param backend: "inotify", "poll", or None to pick automatically.
+    """
+
+    def __init__(self, directory, pattern="Flight_Data_*.csv", poll_interval=0.25, backend=None):
+        self.directory = directory
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+
+        if backend is None:
+            backend = "inotify" if sys.platform.startswith("linux") else "poll"
+        self.backend = backend
+
+        self._active = None
+        self._known = set()
+        self._dir_mtime = None
+        self._scanned = False
+        self._thread = None
+        self._inotify = None
+        self._running = False
+        self._condition = threading.Condition()
+        self._update_count = 0
+
+    def start(self):
+        """Start watching in a background thread (no-op if already running)"""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._running = True
+            self._rescan()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def current(self):
+        """
+        Return the path of the active log.
+
+        :return: Path of the log currently being written, or None.
+        """
+        with self._condition:
+            return self._active
+
+    def wait_for_update(self, timeout):
+        """
+        Block until the active log is written to or replaced.
+
+        In polling mode there are no write events, so this just sleeps.
+
+        :param timeout: Maximum seconds to wait.
+        :return: True if an update was seen before the timeout.
+        """
+        if self._inotify is None:
+            time.sleep(timeout)
+            return False
+
+        with self._condition:
+            seen = self._update_count
+            return self._condition.wait_for(lambda: self._update_count != seen, timeout=timeout)
+
+    def _matches(self, name):
+        return fnmatch.fnmatch(name, self.pattern)
+
+    def _set_active(self, path):
+        if path != self._active:
+            self._active = path
+            print(f"New log file detected: {path}")
+
+    def _rescan(self):
+        """Full directory scan, used at start-up and after lost events"""
+        try:
+            with os.scandir(self.directory) as entries:
+                logs = [(entry.stat().st_mtime, entry.path) for entry in entries
+                        if entry.is_file() and self._matches(entry.name)]
+        except OSError:
+            logs = []
+
+        new_logs = {path for _, path in logs} - self._known
+        self._known = {path for _, path in logs}
+
+        if self._active is None or self._active not in self._known:
+            self._set_active(max(logs)[1] if logs else None)
+        elif new_logs and self._scanned:
+            # Sessions that appeared since the last scan take over
+            self._set_active(max((mtime, path) for mtime, path in logs if path in new_logs)[1])
+
+        self._scanned = True
+
+    def _run(self):
+        if self.backend == "inotify":
+            try:
+                self._run_inotify()
+                return
+            except OSError as e:
+                print(f"inotify unavailable ({e}), falling back to polling")
+                self._inotify = None
+        self._run_poll()
+
+    def _run_inotify(self):
+        inotify = _Inotify()
+        try:
+            while self._running:
+                try:
+                    inotify.add_watch(self.directory, IN_CREATE | IN_MOVED_TO | IN_MODIFY |
+                                      IN_CLOSE_WRITE | IN_DELETE | IN_MOVED_FROM)
+                    break
+                except FileNotFoundError:
+                    # Directory not created yet
+                    time.sleep(self.poll_interval)
+
+            self._inotify = inotify
+            with self._condition:
+                self._rescan()
+
+            while self._running:
+                events = inotify.read_events(self.poll_interval)
+                if events:
+                    self._handle_events(events)
+        finally:
+            self._inotify = None
+            inotify.close()
+
+    def _handle_events(self, events):
+        with self._condition:
+            for mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    self._rescan()
+                    continue
+                if not self._matches(name):
+                    continue
+
+                path = os.path.join(self.directory, name)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._known.add(path)
+                    self._set_active(path)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._known.discard(path)
+                    if path == self._active:
+                        self._rescan()
+                elif mask & IN_MODIFY and path != self._active:
+                    # Another session started receiving data
+                    self._known.add(path)
+                    self._set_active(path)
+
+            self._update_count += 1
+            self._condition.notify_all()
+
+    def _run_poll(self):
+        while self._running:
+            try:
+                mtime = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                mtime = None
+
+            if mtime != self._dir_mtime:
+                with self._condition:
+                    self._rescan()
+                    self._dir_mtime = mtime
+
+            time.sleep(self.poll_interval)
@@ -0,0 +1,397 @@
+import collections
+import csv
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from instrumentation import metrics
+
+
+class CsvLogWriter:
+    """
+    Keeps a flight log CSV open for the whole session and buffers its writes.
+
+    Rows go through one csv.writer into a buffered file handle instead of
+    reopening the log for every packet. Buffered rows are flushed to the OS
+    when any of the configured policies trigger:
+
+    - every flush_rows rows,
+    - when flush_interval_ms has passed since the last flush (checked on each
+      write and on poll(), so an idle link still gets its last rows out),
+    - when the value in the state column changes (e.g. on APOGEE), so phase
+      transitions are never stuck in the buffer.
+
+    :param path: CSV file to create.
+    :param header: Column names written as the first row.
+    :param flush_rows: Flush after this many buffered rows (None to disable).
+    :param flush_interval_ms: Flush when this much time has passed (None to disable).
+    :param state_column: Index of the column whose change forces a flush (None to disable).
+    :param fsync: Also fsync on every flush, trading latency for durability.
+    :param buffer_size: Size in bytes of the file buffer.
+    """
+
+    def __init__(self, path, header, flush_rows=None, flush_interval_ms=100, state_column=None,
+                 fsync=False, buffer_size=64 * 1024):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_interval_ms = flush_interval_ms
+        self.state_column = state_column
+        self.fsync = fsync
+
+        # Counters
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+        self._file = open(path, mode='w', newline='', buffering=buffer_size)
+        self._writer = csv.writer(self)
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        self._last_state = None
+
+        self._writer.writerow(header)
+        self.flush()
+
+    def write(self, text):
+        """File-like hook used by csv.writer; counts bytes on their way out"""
+        self.bytes_written += len(text)
+        return self._file.write(text)
+
+    def writerow(self, row):
+        """
+        Append one row and flush if the policy calls for it.
+
+        :param row: Sequence of values matching the header.
+        """
+        self._writer.writerow(row)
+        self.rows_written += 1
+        self._pending_rows += 1
+
+        state_changed = False
+        if self.state_column is not None:
+            state = row[self.state_column]
+            state_changed = self._last_state is not None and state != self._last_state
+            self._last_state = state
+
+        if state_changed or (self.flush_rows and self._pending_rows >= self.flush_rows):
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """Flush buffered rows if the flush interval has elapsed"""
+        if not self._pending_rows or self.flush_interval_ms is None:
+            return
+        if (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms:
+            self.flush()
+
+    def flush(self):
+        """Push buffered rows to the OS (and to disk if fsync is set)"""
+        start = time.perf_counter()
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self.total_flush_ms += elapsed_ms
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush anything still buffered and close the log"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def stats(self):
+        """
+        Return the writer counters.
+
+        :return: Dict with rows, bytes, flush count and flush latency in ms.
+        """
+        return {
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "avg_flush_ms": self.total_flush_ms / self.flushes if self.flushes else 0.0,
+        }
+
+
+class BackgroundLogWriter:
+    """
+    Moves log writes off the acquisition thread onto a dedicated writer thread.
+
+    The serial loop hands rows to writerow(), which only appends to an
+    in-memory queue; the writer thread drains it into the wrapped CsvLogWriter.
+    A slow disk (USB stick, power saving, antivirus scan) then delays the log,
+    not the serial reads. When the queue reaches max_rows the overflow policy
+    decides what happens to the next row:
+
+    - "block": wait for the writer to make room (lossless, stalls acquisition),
+    - "drop_oldest": discard the oldest queued row (acquisition never waits),
+    - "spill": append it to a temporary overflow file, which the writer thread
+      replays in order once the queue is drained. Once max_spill_rows are
+      waiting on disk the producer blocks as with "block", so neither memory
+      nor the overflow file grows without limit.
+
+    Rows written after close() are not logged; they are counted in
+    rows_after_close. A row the wrapped writer raises on is skipped and
+    counted in write_errors, and the rows after it are still written.
+
+    :param writer: CsvLogWriter (or anything with writerow/poll/close/stats).
+    :param max_rows: Queue depth at which the overflow policy kicks in.
+    :param overflow: "block", "drop_oldest" or "spill".
+    :param poll_interval: Seconds the writer thread sleeps between flush checks
+                          when the queue is empty.
+    :param max_spill_rows: Rows the overflow file may hold before "spill" blocks.
+    :param spill_dir: Directory of the overflow file (the system temp dir if None).
+    """
+
+    OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+    # Rows the writer thread replays from the overflow file per pass
+    SPILL_BATCH = 1024
+
+    def __init__(self, writer, max_rows=4096, overflow="spill", poll_interval=0.05, max_spill_rows=1_000_000,
+                 spill_dir=None):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.writer = writer
+        self.max_rows = max_rows
+        self.overflow = overflow
+        self.poll_interval = poll_interval
+        self.max_spill_rows = max_spill_rows
+        self.spill_dir = spill_dir
+
+        # Counters
+        self.high_water = 0
+        self.dropped_rows = 0
+        self.spilled_rows = 0
+        self.blocked_ms = 0.0
+        self.rows_after_close = 0
+        self.write_errors = 0
+
+        self._rows = collections.deque()
+        self._condition = threading.Condition()
+        self._running = True
+
+        # Overflow file: rows are appended at the end and replayed from
+        # _spill_read; while any are waiting, new rows go after them so the
+        # log keeps arrival order
+        self._spill = None
+        self._spill_read = 0
+        self._spill_pending = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def writerow(self, row):
+        """
+        Queue one row for the writer thread.
+
+        :param row: Sequence of values matching the log header.
+        """
+        with self._condition:
+            if not self._running:
+                self.rows_after_close += 1
+                return
+
+            if self.overflow == "spill" and (self._spill_pending or len(self._rows) >= self.max_rows):
+                if self._spill_pending >= self.max_spill_rows:
+                    self._wait_for_room(lambda: self._spill_pending < self.max_spill_rows)
+                    if not self._running:
+                        self.rows_after_close += 1
+                        return
+                if self._spill_pending or len(self._rows) >= self.max_rows:
+                    self._spill_row(row)
+                    self._condition.notify_all()
+                    return
+
+            if len(self._rows) >= self.max_rows:
+                if self.overflow == "drop_oldest":
+                    self._rows.popleft()
+                    self.dropped_rows += 1
+                else:
+                    self._wait_for_room(lambda: len(self._rows) < self.max_rows)
+                    if not self._running:
+                        # Released by close(); the writer thread has already stopped
+                        self.rows_after_close += 1
+                        return
+
+            self._rows.append(row)
+            self.high_water = max(self.high_water, len(self._rows))
+            self._condition.notify_all()
+
+    def _wait_for_room(self, has_room):
+        """Block the producer until has_room() or close() (called with the lock held)"""
+        start = time.perf_counter()
+        self._condition.wait_for(lambda: has_room() or not self._running)
+        self.blocked_ms += (time.perf_counter() - start) * 1000
+
+    def _spill_row(self, row):
+        """Append a row to the overflow file (called with the lock held)"""
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix="orbiview_spill_", dir=self.spill_dir)
+        self._spill.seek(0, os.SEEK_END)
+        pickle.dump(row, self._spill, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spill_pending += 1
+        self.spilled_rows += 1
+
+    def _take_spilled(self):
+        """Read the next rows back from the overflow file (called with the lock held)"""
+        self._spill.seek(self._spill_read)
+        rows = []
+        while self._spill_pending and len(rows) < self.SPILL_BATCH:
+            rows.append(pickle.load(self._spill))
+            self._spill_pending -= 1
+        self._spill_read = self._spill.tell()
+        if not self._spill_pending:
+            # Drained; start the file over
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._spill_read = 0
+        return rows
+
+    def poll(self):
+        """Flushing is handled by the writer thread"""
+
+    def queue_depth(self):
+        """Rows waiting to be written, in memory and in the overflow file"""
+        with self._condition:
+            return len(self._rows) + self._spill_pending
+
+    def close(self):
+        """Write out everything still queued, then close the underlying log"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join()
+        self.writer.close()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def stats(self):
+        """
+        Return queue counters merged with the wrapped writer's counters.
+
+        :return: Dict of queue depth, high-water mark, dropped/spilled rows,
+                 rows still in the overflow file, time acquisition spent
+                 blocked, rows written after close, rows the writer
+                 rejected, plus the writer stats.
+        """
+        with self._condition:
+            stats = {
+                "queue_depth": len(self._rows),
+                "high_water": self.high_water,
+                "dropped_rows": self.dropped_rows,
+                "spilled_rows": self.spilled_rows,
+                "spill_pending": self._spill_pending,
+                "blocked_ms": self.blocked_ms,
+                "rows_after_close": self.rows_after_close,
+                "write_errors": self.write_errors,
+            }
+        stats.update(self.writer.stats())
+        return stats
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._rows or self._spill_pending or not self._running,
+                                         timeout=self.poll_interval)
+                if not self._rows and not self._spill_pending and not self._running:
+                    return
+
+                # Take everything queued in memory in one go; spilled rows are
+                # newer, so they are replayed only once memory is empty
+                if self._rows:
+                    batch = list(self._rows)
+                    self._rows.clear()
+                elif self._spill_pending:
+                    batch = self._take_spilled()
+                else:
+                    batch = []
+                self._condition.notify_all()
+
+            start = metrics.begin()
+            # A row the writer rejects is counted and skipped; the rest of the
+            # batch is still written
+            failed = 0
+            for row in batch:
+                try:
+                    self.writer.writerow(row)
+                except Exception as e:
+                    if not failed:
+                        print(f"Error writing log row: {e}")
+                    failed += 1
+            if failed:
+                with self._condition:
+                    self.write_errors += failed
+                if failed > 1:
+                    print(f"{failed} of {len(batch)} log rows failed to write")
+            try:
+                self.writer.poll()
+            except Exception as e:
+                print(f"Error flushing log: {e}")
+            if batch:
+                metrics.end("log_write", start)
+                metrics.count("rows_logged", len(batch))
+
+
+class TeeLogWriter:
+    """
+    Fans every row out to several log writers (e.g. CSV and binary side by side).
+
+    Each writer is called on its own: one that raises is counted in its errors
+    stat and the others still get the row, so a failing binary copy never
+    costs rows in the CSV.
+
+    :param writers: Mapping of label to writer; stats are reported per label.
+    """
+
+    def __init__(self, **writers):
+        self.writers = writers
+        self.errors = {label: 0 for label in writers}
+
+    def _each(self, action, *args):
+        """Call action on every writer, counting (and reporting the first) failures per writer"""
+        for label, writer in self.writers.items():
+            try:
+                getattr(writer, action)(*args)
+            except Exception as e:
+                if not self.errors[label]:
+                    print(f"Error in {label} log ({action}): {e}")
+                self.errors[label] += 1
+
+    def writerow(self, row):
+        self._each("writerow", row)
+
+    def poll(self):
+        self._each("poll")
+
+    def flush(self):
+        self._each("flush")
+
+    def close(self):
+        self._each("close")
+
+    def stats(self):
+        """
+        Return the stats of every writer.
+
+        :return: Dict of label to that writer's stats, plus its error count.
+        """
+        return {label: {**writer.stats(), "errors": self.errors[label]}
+                for label, writer in self.writers.items()}
@@ -1,27 +1,47 @@
 import sys
+import collections
 import numpy as np
-import csv
-import serial
 import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QGridLayout, QComboBox, QPushButton,
-                            QDialog, QDialogButtonBox)
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt6.QtGui import QFont, QColor
+                            QDialog, QDialogButtonBox, QFileDialog, QMessageBox)
+from PyQt6.QtCore import Qt, QObject, QTimer, QThread, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QKeySequence, QShortcut
 import pyqtgraph as pg
 import os
 from serial.tools import list_ports
 import subprocess
 from pathlib import Path
+from acquisition import AcquisitionEngine, AcquisitionProcess
+from decimation import LodPyramid
+from flight_history import PlotClock
+from flight_log import FlightLog
+from instrumentation import format_snapshot, metrics
+from receiver_merge import format_receiver_stats
+from render_loop import RenderScheduler
+from sample_batch import SampleBatcher
+from replay import REPLAY_SCHEME
+try:
+    from radio_simulator import simulated_ports
+except ImportError:
+    # Simulated receivers need POSIX pseudo-terminals; list none elsewhere
+    def simulated_ports():
+        return []
+from telemetry_schema import ORIZABA
 
 if __name__ == "__main__":
     subprocess.run([sys.executable, "orizaba_dashboard.py"], cwd=str(Path(__file__).parent))
 
 class PortSelectionDialog(QDialog):
-    """Dialog for selecting a serial port"""
-    def __init__(self, parent=None):
+    """
+    Dialog for selecting a serial port.
+
+    :param parent: Parent widget.
+    :param receiver: Index of the receiver being set up when there are several (None for one).
+    """
+    def __init__(self, parent=None, receiver=None):
         super().__init__(parent)
-        self.setWindowTitle("Select Serial Port")
+        self.setWindowTitle("Select Serial Port" if receiver is None else f"Select Receiver {receiver + 1} Port")
         self.resize(400, 200)
         
         # Set dark theme
@@ -61,7 +81,7 @@ class PortSelectionDialog(QDialog):
         layout = QVBoxLayout()
         
         # Label
-        self.label = QLabel("Reciever Serial Port:")
+        self.label = QLabel("Reciever Serial Port:" if receiver is None else f"Reciever {receiver + 1} Serial Port:")
         self.label.setFont(QFont("Arial", 11))
         layout.addWidget(self.label)
         
@@ -86,6 +106,19 @@ class PortSelectionDialog(QDialog):
         self.refresh_button.clicked.connect(self.populate_ports)
         layout.addWidget(self.refresh_button)
         
+        # Replay a recorded flight log instead of a live receiver
+        replay_layout = QHBoxLayout()
+        self.replay_button = QPushButton("Replay Log...")
+        self.replay_button.clicked.connect(self.choose_replay_log)
+        self.speed_label = QLabel("Replay Speed:")
+        self.speed_label.setFont(QFont("Arial", 11))
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems(["1x", "2x", "5x", "10x", "max"])
+        replay_layout.addWidget(self.replay_button)
+        replay_layout.addWidget(self.speed_label)
+        replay_layout.addWidget(self.speed_combo)
+        layout.addLayout(replay_layout)
+        
         # OK/Cancel buttons
         self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | 
                                            QDialogButtonBox.StandardButton.Cancel)
@@ -107,172 +140,311 @@ class PortSelectionDialog(QDialog):
             self.port_combo.addItem("No ports found")
             self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
         else:
+            # The port itself is kept as item data; the text is only for display
             for port, desc, hwid in ports:
-                self.port_combo.addItem(f"{port} - {desc}")
+                self.port_combo.addItem(f"{port} - {desc}", port)
             self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(True)
     
+    def choose_replay_log(self):
+        """Pick a recorded flight log and add it to the port list as a replay source"""
+        path, _ = QFileDialog.getOpenFileName(self, "Select Flight Log", "Flight_Logs",
+                                              "Flight logs (*.csv *.obl)")
+        if not path:
+            return
+        
+        # The plots and labels are laid out for Orizaba packets
+        try:
+            schema = FlightLog(path).schema
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Cannot Replay Log", f"{path} is not a readable flight log: {e}")
+            return
+        if schema != ORIZABA.name:
+            QMessageBox.warning(self, "Cannot Replay Log",
+                                f"{path} holds {schema} telemetry; this dashboard only displays {ORIZABA.name} flights.")
+            return
+        
+        self.port_combo.addItem(f"{REPLAY_SCHEME}{path} - Flight log replay", REPLAY_SCHEME + path)
+        self.port_combo.setCurrentIndex(self.port_combo.count() - 1)
+        self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(True)
+    
     def get_serial_ports(self):
-        """Get a list of available serial ports"""
-        return sorted(list_ports.comports())
+        """Get a list of available serial ports, followed by any running radio simulators"""
+        return sorted(list_ports.comports()) + simulated_ports()
     
     def get_selected_port(self):
-        """Return the currently selected port"""
-        if self.port_combo.currentText() == "No ports found":
+        """Return the currently selected port (None if there is none to pick)"""
+        port = self.port_combo.currentData()
+        if port is None:
+            # "No ports found"
             return None
         
-        # Extract just the port name before the dash
-        port_text = self.port_combo.currentText()
-        return port_text.split(" - ")[0]
+        if port.startswith(REPLAY_SCHEME):
+            port += "?speed=" + self.speed_combo.currentText().rstrip("x")
+        return port
     
     def get_selected_baudrate(self):
         """Return the selected baud rate as an integer"""
         return int(self.baud_combo.currentText())
 
 
+def require_orizaba(schema):
+    """
+    Reject sessions this dashboard cannot display.
+
+    The plot history, the labels and data_received all carry Orizaba fields,
+    so another vehicle's packets (or a schema detected from whatever arrives
+    first) would fail deep in the GUI thread instead of here.
+
+    :param schema: Schema name requested for the session.
+    """
+    if schema != ORIZABA.name:
+        raise ValueError(f"The Orizaba dashboard only displays {ORIZABA.name!r} telemetry, not {schema!r}")
+
+
 class SerialThread(QThread):
+    """
+    Runs an AcquisitionEngine on a Qt thread and delivers its samples as signals.
+
+    The engine owns the port, reconnects, decoding and logging; this thread
+    only turns the decoded blocks into batch_received emits (batch mode) or
+    one data_received emit per packet.
+
+    :param port: Serial device or replay:// URL (None until set_port()).
+    :param baudrate: Baud rate for real ports.
+    :param flush_rows, flush_interval_ms, flush_on_state_change, log_queue_rows,
+           log_overflow, binary_log: Log settings, see open_session_log().
+    :param batch_interval_ms: Delivery interval of sample batches (None for one
+                              data_received signal per packet).
+    :param schema: Schema name of the vehicle (only "orizaba" can be displayed).
+    :param downlink: "ascii" for +RCV lines or "binary" for framed records.
+    """
     data_received = pyqtSignal(list)
+    batch_received = pyqtSignal(object)  # Structured NumPy array of samples (batch mode)
     connection_status_changed = pyqtSignal(bool, str)  # Signal for connection status
     
-    def __init__(self, port=None, baudrate=115200):
+    def __init__(self, port=None, baudrate=115200, flush_rows=None, flush_interval_ms=100,
+                 flush_on_state_change=True, log_queue_rows=4096, log_overflow="spill", binary_log=True,
+                 batch_interval_ms=None, schema="orizaba", downlink="ascii"):
         super().__init__()
-        self.port = port
-        self.baudrate = baudrate
-        self.running = True
-        self.connected = False
-
-        output_dir = "Flight_Logs"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate a timestamp-based filename
-        current_time = time.strftime("%Y-%m-%d_%H-%M-%S")
-        self.output_csv = os.path.join(output_dir, f"Flight_Data_{current_time}.csv")
         
-        # Initialize CSV file with new data fields
-        with open(self.output_csv, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["tilt_angle", "z_axis_g_force", "linear_accel_x", "linear_accel_y", "linear_accel_z",
-                           "linear_velocity_x", "linear_velocity_y", "linear_velocity_z", 
-                           "altitude", "pressure", "heading", "temperature", "humidity", 
-                           "longitude", "latitude", "time_elapsed", "rocket_state"])
+        # With batch_interval_ms set, samples are collected into typed blocks and
+        # sent through batch_received at most once per interval instead of one
+        # data_received emit per packet
+        self.batch_interval_ms = batch_interval_ms
+        self.batcher = None
+        self.acquisition_metrics = None  # Acquisition runs in this process; see metrics
+        self.receiver_stats = None  # A SerialThread reads a single receiver
+        
+        # Emit times of signals not yet handled by the GUI thread, oldest
+        # first, so the receiving slot can measure how long they queued
+        self.emit_times = collections.deque()
+        
+        # Binary frames are decoded straight into typed blocks, so they need batch mode
+        if downlink == "binary" and batch_interval_ms is None:
+            raise ValueError("The binary downlink needs batch mode (set batch_interval_ms)")
+        require_orizaba(schema)
+        
+        self.engine = AcquisitionEngine(
+            port, baudrate, schema=schema, downlink=downlink,
+            on_records=self.handle_records,
+            on_status=self.connection_status_changed.emit,
+            flush_rows=flush_rows,
+            flush_interval_ms=flush_interval_ms,
+            flush_on_state_change=flush_on_state_change,
+            log_queue_rows=log_queue_rows,
+            log_overflow=log_overflow,
+            binary_log=binary_log
+        )
         
         print(f"Data will be saved to: {self.output_csv}")
-        if self.port:
+        if port:
             print(f"Attempting to connect to {port} at {baudrate} baud...")
     
+    @property
+    def connected(self):
+        return self.engine.connected
+    
+    @property
+    def schema(self):
+        return self.engine.schema
+    
+    @property
+    def log_writer(self):
+        return self.engine.log_writer
+    
+    @property
+    def output_csv(self):
+        return self.engine.output_csv
+    
     def set_port(self, port, baudrate=None):
         """Update the port and optionally the baudrate"""
-        self.port = port
-        if baudrate:
-            self.baudrate = baudrate
-        
-        # Reset connection
-        self.connected = False
-        print(f"Port updated to {port}, baudrate {self.baudrate}")
+        self.engine.set_port(port, baudrate)
+        print(f"Port updated to {port}, baudrate {self.engine.baudrate}")
     
     def run(self):
-        ser = None
-        reconnect_delay = 2  # seconds
-        
-        while self.running:
-            # Skip connection attempts if no port is specified
-            if not self.port:
-                time.sleep(1)
-                continue
-                
-            # Try to connect if not connected
-            if not self.connected:
-                try:
-                    # Close previous connection if exists
-                    if ser is not None:
-                        ser.close()
-                    
-                    # Open new serial connection
-                    ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=1)
-                    time.sleep(reconnect_delay)  # Allow time for connection to establish
-                    self.connected = True
-                    print(f"Connected to {self.port}. Waiting for data...")
-                    
-                    # Emit signal instead of directly accessing UI elements
-                    self.connection_status_changed.emit(True, "WAITING FOR SIGNAL")
-
-                except Exception as e:
-                    print(f"Connection failed: {e}. Retrying in {reconnect_delay} seconds...")
-                    self.connection_status_changed.emit(False, f"CONNECTION FAILED: {str(e)[:20]}")
-                    time.sleep(reconnect_delay)
-                    continue
+        while self.engine.running:
+            # Blocks until data arrives (up to the engine's read timeout)
+            self.engine.step()
             
-            # Read data if connected
-            try:
-                if ser.in_waiting:
-                    line = ser.readline().decode('utf-8').strip()  # Read and decode serial data
-                    if "+RCV=" in line:
-                        clean_data = line.replace("+RCV=", "")  # FOR OLD CODE IT IS Received: Recieved+RCV=
-                        data_values = clean_data.split(',')
-                        
-                        # Parse new data values - expecting 17 values now
-                        if len(data_values) >= 17:  # Updated for new data structure
-                            tilt_angle = float(data_values[0])
-                            z_axis_g_force = float(data_values[1])
-                            linear_accel_x = float(data_values[2])
-                            linear_accel_y = float(data_values[3])
-                            linear_accel_z = float(data_values[4])
-                            linear_velocity_x = float(data_values[5])
-                            linear_velocity_y = float(data_values[6])
-                            linear_velocity_z = float(data_values[7])
-                            altitude = float(data_values[8])
-                            pressure = float(data_values[9])
-                            heading = float(data_values[10])
-                            temperature = float(data_values[11])
-                            humidity = float(data_values[12])
-                            longitude = float(data_values[13])
-                            latitude = float(data_values[14])
-                            time_elapsed = int(data_values[15])
-                            rocket_state = data_values[16]
-                            
-                            # Save to CSV
-                            with open(self.output_csv, mode='a', newline='') as csvfile:
-                                writer = csv.writer(csvfile)
-                                writer.writerow([
-                                    tilt_angle, z_axis_g_force, linear_accel_x, linear_accel_y, linear_accel_z,
-                                    linear_velocity_x, linear_velocity_y, linear_velocity_z,
-                                    altitude, pressure, heading, temperature, humidity,
-                                    longitude, latitude, time_elapsed, rocket_state
-                                ])
-                            
-                            # Emit signal with parsed data
-                            self.data_received.emit([
-                                tilt_angle, z_axis_g_force, linear_accel_x, linear_accel_y, linear_accel_z,
-                                linear_velocity_x, linear_velocity_y, linear_velocity_z,
-                                altitude, pressure, heading, temperature, humidity,
-                                longitude, latitude, time_elapsed, rocket_state
-                            ])
-                
-                time.sleep(0.05)  # Small delay to prevent CPU hogging
-                
-            except serial.SerialException as e:
-                print(f"Serial connection lost: {e}. Attempting to reconnect...")
-                self.connected = False
-                
-                # Emit signal instead of directly accessing UI elements
-                self.connection_status_changed.emit(False, "RECONNECT RECEIVER")
-                
-                time.sleep(reconnect_delay)
-            except Exception as e:
-                print(f"Error reading data: {e}")
-                time.sleep(0.5)  # Brief pause before trying again
-        
-        # Clean up
-        if ser is not None:
-            ser.close()
+            # Deliver the accumulated samples once the batch interval passes
+            if self.batcher is not None and self.batcher.due():
+                self.emit_times.append(metrics.begin())
+                self.batch_received.emit(self.batcher.take())
+                metrics.count("batches")
+    
+    def handle_records(self, schema, records):
+        """
+        Queue a decoded block for the next batch, or emit it packet by packet.
+
+        :param schema: PacketSchema the records were decoded with.
+        :param records: Structured array with the schema's dtype or log_dtype.
+        """
+        if self.batch_interval_ms is None:
+            for record in records:
+                values = record.tolist()
+                values = list(values[:-1]) + [str(values[-1])]  # rocket_state is compared as text
+                self.emit_times.append(metrics.begin())
+                self.data_received.emit(values)
+            return
+        
+        if self.batcher is None:
+            self.batcher = SampleBatcher(schema.dtype, interval_ms=self.batch_interval_ms)
+        self.batcher.extend(records)
+    
+    def log_queue_depth(self):
+        """Rows waiting for the background log writer"""
+        return self.log_writer.queue_depth() if self.log_writer is not None else 0
     
     def stop(self):
-        self.running = False
+        self.engine.stop()
         self.wait()
+        
+        # Close the port, then flush and close the log once the read loop has exited
+        self.engine.close()
+
+
+class SharedRingSource(QObject):
+    """
+    Stand-in for SerialThread that runs acquisition in a separate process.
+
+    Serial reads, decoding and logging happen in an AcquisitionProcess, which
+    writes typed samples into a shared-memory ring. This object maps the ring
+    read-only and polls it from the GUI thread once per batch interval,
+    delivering whatever arrived through batch_received. A stalled GUI only
+    delays the plots - the acquisition process never waits for it, and the
+    ring holds minutes of samples until the GUI catches up.
+
+    :param port: Serial device or replay:// URL (None until set_port()).
+    :param baudrate: Baud rate for real ports.
+    :param batch_interval_ms: Interval at which the ring is polled.
+    :param schema: Schema name of the vehicle (only "orizaba" can be displayed).
+    :param downlink: "ascii" or "binary".
+    :param ring_capacity: Samples held in the shared ring.
+    :param receivers: Number of ground receivers merged by the acquisition process.
+    :param log_options: Log settings passed on to the acquisition process
+                        (flush_rows, flush_interval_ms, binary_log, ...).
+    """
+    data_received = pyqtSignal(list)  # Not used: samples always arrive in batches
+    batch_received = pyqtSignal(object)  # Structured NumPy array of samples
+    connection_status_changed = pyqtSignal(bool, str)
+    
+    def __init__(self, port=None, baudrate=115200, batch_interval_ms=20, schema="orizaba", downlink="ascii",
+                 ring_capacity=65536, receivers=1, **log_options):
+        super().__init__()
+        require_orizaba(schema)
+        self.batch_interval_ms = batch_interval_ms
+        self.connected = False
+        self.emit_times = collections.deque()
+        self.log_writer = None  # Logs are written by the acquisition process
+        
+        # Latest instrumentation snapshot and log queue depth reported by the
+        # acquisition process, for the performance overlay
+        self.acquisition_metrics = None
+        self._log_queue_depth = 0
+        
+        # Packets merged and per-receiver stats reported with several receivers
+        self.receiver_stats = None
+        
+        self.process = AcquisitionProcess(schema, port, baudrate, downlink, ring_capacity, receivers=receivers,
+                                          **log_options)
+        self.output_csv = self.process.output_csv
+        self.reader = None
+        self.samples_lost = 0
+        
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        
+        print(f"Data will be saved to: {self.output_csv}")
+    
+    def start(self):
+        self.process.start()
+        self.reader = self.process.reader()
+        self.poll_timer.start(self.batch_interval_ms)
+    
+    def set_port(self, port, baudrate=None, receiver=0):
+        """Update a receiver's port and optionally the baudrate"""
+        self.connected = False
+        self.process.set_port(port, baudrate, receiver)
+        print(f"Port updated to {port}, baudrate {self.process.baudrate}")
+    
+    def poll(self):
+        """Forward the acquisition process's events and the samples added to the ring"""
+        for event in self.process.poll_events():
+            if event[0] == "status":
+                _, self.connected, message = event
+                self.connection_status_changed.emit(self.connected, message)
+            elif event[0] == "metrics":
+                _, self.acquisition_metrics, self._log_queue_depth = event
+            elif event[0] == "receivers":
+                self.receiver_stats = event[1:]
+        
+        start = metrics.begin()
+        _, records = self.reader.read()
+        metrics.end("ring_read", start)
+        
+        if self.reader.samples_lost != self.samples_lost:
+            # The GUI fell a whole ring behind; the samples are still in the log
+            lost = self.reader.samples_lost - self.samples_lost
+            print(f"Display skipped {lost} sample(s) while the GUI was stalled")
+            metrics.count("ring_lost", lost)
+            self.samples_lost = self.reader.samples_lost
+        
+        if len(records):
+            self.emit_times.append(metrics.begin())
+            self.batch_received.emit(records)
+            metrics.count("batches")
+    
+    def log_queue_depth(self):
+        """Rows waiting for the acquisition process's log writer (as last reported)"""
+        return self._log_queue_depth
+    
+    def stop(self):
+        self.poll_timer.stop()
+        if self.reader is not None:
+            self.reader.ring.close()
+            self.reader = None
+        # The acquisition process flushes and closes the logs on its way out
+        self.process.stop()
 
 
 class SensorDashboard(QMainWindow):
-    def __init__(self):
+    """
+    Main telemetry window.
+
+    :param max_points: Number of most recent samples shown in each plot (None to
+                       show the whole flight through a LodPyramid per trace).
+    :param batch_interval_ms: Delivery interval of sample batches from the serial
+                              thread (None to deliver every packet as its own signal).
+    :param acquisition: "process" to read the receiver in a separate process
+                        through a shared-memory ring, "thread" for a SerialThread
+                        inside the GUI process.
+    :param receivers: Number of ground receivers to read and merge (more than
+                      one needs process acquisition).
+    """
+    def __init__(self, max_points=None, batch_interval_ms=20, acquisition="process", receivers=1):
         super().__init__()
+        self.max_points = max_points  # Sliding window length, or None for the whole flight
+        self.receivers = receivers
         
         # Set window title and size
         self.setWindowTitle("Sensor Dashboard")
@@ -281,9 +453,20 @@ class SensorDashboard(QMainWindow):
         # Create the UI elements
         self.init_ui()
         
-        # Setup serial thread initially with no port
-        self.serial_thread = SerialThread()
+        # Setup serial acquisition initially with no port
+        # Samples arrive in batches of up to batch_interval_ms worth of packets
+        if acquisition == "process":
+            if batch_interval_ms is None:
+                raise ValueError("Process acquisition delivers batches (set batch_interval_ms)")
+            self.serial_thread = SharedRingSource(batch_interval_ms=batch_interval_ms, receivers=receivers)
+        elif acquisition == "thread":
+            if receivers != 1:
+                raise ValueError("Merging several receivers needs process acquisition")
+            self.serial_thread = SerialThread(batch_interval_ms=batch_interval_ms)
+        else:
+            raise ValueError(f"Unknown acquisition mode {acquisition!r}")
         self.serial_thread.data_received.connect(self.update_with_serial_data)
+        self.serial_thread.batch_received.connect(self.update_with_batch)
         self.serial_thread.connection_status_changed.connect(self.update_connection_status)
         
         # Start serial thread
@@ -334,6 +517,19 @@ class SensorDashboard(QMainWindow):
         port_button_layout.addWidget(self.port_button)
         port_button_layout.addStretch()  # Push button to the left
         
+        # Measured packet rate vs redraw rate
+        self.rate_label = QLabel("RX -- pkt/s | Render -- fps")
+        self.rate_label.setFont(QFont("Arial", 9))
+        port_button_layout.addWidget(self.rate_label)
+        
+        # Per-stage timings from the instrumentation module, drawn over the
+        # graphs; toggled with the Perf button or F3
+        self.perf_button = QPushButton("Perf")
+        self.perf_button.setCheckable(True)
+        self.perf_button.toggled.connect(self.toggle_perf_overlay)
+        port_button_layout.addWidget(self.perf_button)
+        QShortcut(QKeySequence("F3"), self, activated=self.perf_button.toggle)
+        
         # Create top layout for graphs (2x2 grid)
         graphs_widget = QWidget()
         graphs_layout = QGridLayout()
@@ -401,21 +597,36 @@ class SensorDashboard(QMainWindow):
         main_layout.addWidget(graphs_widget, 4)  # 80% of height
         main_layout.addWidget(telemetry_widget, 1)  # 20% of height
         
+        # Floats above the layout instead of taking space in it
+        self.perf_overlay = QLabel(main_widget)
+        overlay_font = QFont("Monospace", 9)
+        overlay_font.setStyleHint(QFont.StyleHint.Monospace)
+        self.perf_overlay.setFont(overlay_font)
+        self.perf_overlay.setStyleSheet("background-color: rgba(13, 13, 13, 210); color: #2ecc71; "
+                                        "border: 1px solid #333333; padding: 6px; font-weight: normal;")
+        self.perf_overlay.move(20, 60)
+        self.perf_overlay.hide()
+        
         # Setup data and timers
         self.setup_graph_data()
         self.setup_timers()
     
     def show_port_selection(self):
-        """Show the port selection dialog"""
-        dialog = PortSelectionDialog(self)
-        if dialog.exec():
-            selected_port = dialog.get_selected_port()
-            selected_baudrate = dialog.get_selected_baudrate()
-            
-            if selected_port:
-                # Update the serial thread with new port/baudrate
-                self.serial_thread.set_port(selected_port, selected_baudrate)
-                self.state.value_label.setText(f"CONNECTING TO {selected_port}...")
+        """Show the port selection dialog (once per receiver when there are several)"""
+        for receiver in range(self.receivers):
+            several = self.receivers > 1
+            dialog = PortSelectionDialog(self, receiver if several else None)
+            if dialog.exec():
+                selected_port = dialog.get_selected_port()
+                selected_baudrate = dialog.get_selected_baudrate()
+                
+                if selected_port:
+                    # Update the serial thread with new port/baudrate
+                    if several:
+                        self.serial_thread.set_port(selected_port, selected_baudrate, receiver)
+                    else:
+                        self.serial_thread.set_port(selected_port, selected_baudrate)
+                    self.state.value_label.setText(f"CONNECTING TO {selected_port}...")
     
     def update_connection_status(self, is_connected, status_message):
         """Handler for connection status changes"""
@@ -481,19 +692,26 @@ class SensorDashboard(QMainWindow):
         
         return widget
     
+    # Schema fields kept in the plot history, in ring buffer column order.
+    # time_elapsed is stored as PLOT_TIME, the x axis of every plot.
+    HISTORY_CHANNELS = ["time_elapsed", "linear_accel_x", "linear_accel_y", "linear_accel_z",
+                        "altitude", "z_axis_g_force", "temperature"]
+    PLOT_TIME = "plot_time"
+    
     def setup_graph_data(self):
-        # Create empty lists to store new data
-        self.linear_accel_x_data = []
-        self.linear_accel_y_data = []
-        self.linear_accel_z_data = []
-        self.altitude_data = []
-        self.z_gforce_data = []
-        self.temperature_data = []
-        self.time_data = []  
-        
         # Create variable to track if received enough data to start plotting
         self.has_data = False
-        self.max_points = 500  # Maximum number of points to display
+        self.render_fps = 30  # Maximum plot/label redraws per second
+        self.latest_sample = None
+        
+        # History shared by all graphs; every channel arrives in the same
+        # packet, so they share one write position and time axis. With
+        # max_points=None it grows to hold the whole flight.
+        self.history = ORIZABA.ring_buffer(self.max_points, [self.PLOT_TIME] + self.HISTORY_CHANNELS[1:])
+        
+        # The x axis keeps rising across flight computer clock restarts, so
+        # plots never fold back and visible_samples can binary search it
+        self.plot_clock = PlotClock()
         
         # Create plot lines with empty data initially
         self.linear_accel_x_line = self.linear_accel_graph.plot_widget.plot(
@@ -518,6 +736,29 @@ class SensorDashboard(QMainWindow):
             [], [], pen=pg.mkPen(color='#f39c12', width=2), name="temperature"
         )
         
+        # History channel, plot line and plot widget of every trace
+        self.plot_lines = [
+            ("linear_accel_x", self.linear_accel_x_line, self.linear_accel_graph.plot_widget),
+            ("linear_accel_y", self.linear_accel_y_line, self.linear_accel_graph.plot_widget),
+            ("linear_accel_z", self.linear_accel_z_line, self.linear_accel_graph.plot_widget),
+            ("altitude", self.altitude_line, self.barometer_graph.plot_widget),
+            ("z_axis_g_force", self.z_gforce_line, self.z_gforce_graph.plot_widget),
+            ("temperature", self.temperature_line, self.temperature_graph.plot_widget),
+        ]
+        
+        # Whole-flight plots are drawn from a min/max/mean pyramid per channel,
+        # extended as samples arrive. Each frame uses the level matching the
+        # visible range, so drawing the whole flight or zooming into the boost
+        # phase costs about one point per pixel, however long the flight.
+        self.lod = None
+        if self.max_points is None:
+            self.lod = {channel: LodPyramid(self.history, self.PLOT_TIME, channel)
+                        for channel, _, _ in self.plot_lines}
+            
+            # Zooming and panning redraw at the new range's resolution
+            for plot_widget in {id(widget): widget for _, _, widget in self.plot_lines}.values():
+                plot_widget.getViewBox().sigXRangeChanged.connect(self.on_view_range_changed)
+        
         # Set y-axis ranges for new graphs
         self.linear_accel_graph.plot_widget.setYRange(-50, 50)
         self.barometer_graph.plot_widget.setYRange(0, 5000)  # Altitude range
@@ -548,6 +789,48 @@ class SensorDashboard(QMainWindow):
         
         # Last data timestamp to check for connection status
         self.last_data_time = 0
+        
+        # Redraw plots and labels at a fixed rate instead of once per packet
+        self.render_scheduler = RenderScheduler(self.render_frame, fps=self.render_fps, parent=self)
+        self.render_scheduler.start()
+        
+        # Refresh the ingest/render rate readout once a second
+        self.rate_timer = QTimer()
+        self.rate_timer.timeout.connect(self.update_rate_label)
+        self.rate_timer.start(1000)
+    
+    def update_rate_label(self):
+        self.rate_label.setText(f"RX {self.render_scheduler.ingest_rate:.0f} pkt/s | "
+                                f"Render {self.render_scheduler.render_rate:.0f} fps")
+        if self.perf_overlay.isVisible():
+            self.update_perf_overlay()
+    
+    def toggle_perf_overlay(self, visible):
+        """Show or hide the per-stage performance overlay"""
+        if visible:
+            self.update_perf_overlay()
+            self.perf_overlay.raise_()
+        self.perf_overlay.setVisible(visible)
+    
+    def update_perf_overlay(self):
+        """Refresh the overlay with the latest stage timings and counters"""
+        text = format_snapshot(metrics.snapshot())
+        if hasattr(self, 'serial_thread'):
+            if self.serial_thread.acquisition_metrics is not None:
+                text += "\n\nacquisition process\n" + format_snapshot(self.serial_thread.acquisition_metrics)
+            if self.serial_thread.receiver_stats is not None:
+                released, receivers = self.serial_thread.receiver_stats
+                text += "\n\n" + format_receiver_stats(receivers, released)
+            text += f"\n{'log queue':<16}{self.serial_thread.log_queue_depth():>10}"
+        self.perf_overlay.setText(text)
+        self.perf_overlay.adjustSize()
+    
+    def note_delivery(self):
+        """Record how long the signal being handled waited in the GUI event queue"""
+        if self.serial_thread.emit_times:
+            sent = self.serial_thread.emit_times.popleft()
+            if sent is not None:
+                metrics.record("signal_queue", time.perf_counter() - sent, idle=True)
     
     def check_connection(self):
         # If no data received for 5 seconds, consider disconnected
@@ -568,22 +851,19 @@ class SensorDashboard(QMainWindow):
                 self.latitude.value_label.setText("--")
                 self.time.value_label.setText("--")
 
-                # Clear all graph data
-                self.time_data = []
-                self.linear_accel_x_data = []
-                self.linear_accel_y_data = []
-                self.linear_accel_z_data = []
-                self.altitude_data = []
-                self.z_gforce_data = []
-                self.temperature_data = []
-                
-                # Update plots with empty data
-                self.linear_accel_x_line.setData([], [])
-                self.linear_accel_y_line.setData([], [])
-                self.linear_accel_z_line.setData([], [])
-                self.altitude_line.setData([], [])
-                self.z_gforce_line.setData([], [])
-                self.temperature_line.setData([], [])
+                # Clear all graph data; a whole-flight history is kept so
+                # the flight stays on screen across a dropout
+                if self.max_points is not None:
+                    self.history.clear()
+                    self.plot_clock.reset()
+                    
+                    # Update plots with empty data
+                    self.linear_accel_x_line.setData([], [])
+                    self.linear_accel_y_line.setData([], [])
+                    self.linear_accel_z_line.setData([], [])
+                    self.altitude_line.setData([], [])
+                    self.z_gforce_line.setData([], [])
+                    self.temperature_line.setData([], [])
                 
                 print("Connection lost. Waiting for data...")
         
@@ -593,6 +873,9 @@ class SensorDashboard(QMainWindow):
                 
     def update_with_serial_data(self, data):
         """Update dashboard with real data received from serial port"""
+        self.note_delivery()
+        start = metrics.begin()
+        
         # Extract new data values
         (tilt_angle, z_axis_g_force, linear_accel_x, linear_accel_y, linear_accel_z,
          linear_velocity_x, linear_velocity_y, linear_velocity_z,
@@ -606,35 +889,120 @@ class SensorDashboard(QMainWindow):
         
         self.last_data_time = time.time()
         
-        # Add the new time value to our time_data array
-        self.time_data.append(time_value)
-        
-        # Add data to lists for new graphs
-        self.linear_accel_x_data.append(linear_accel_x)
-        self.linear_accel_y_data.append(linear_accel_y)
-        self.linear_accel_z_data.append(linear_accel_z)
-        self.altitude_data.append(altitude)
-        self.z_gforce_data.append(z_axis_g_force)
-        self.temperature_data.append(temperature)
-        
-        # Trim lists to max_points if they get too long
-        if len(self.time_data) > self.max_points:
-            self.time_data = self.time_data[-self.max_points:]
-            self.linear_accel_x_data = self.linear_accel_x_data[-self.max_points:]
-            self.linear_accel_y_data = self.linear_accel_y_data[-self.max_points:]
-            self.linear_accel_z_data = self.linear_accel_z_data[-self.max_points:]
-            self.altitude_data = self.altitude_data[-self.max_points:]
-            self.z_gforce_data = self.z_gforce_data[-self.max_points:]
-            self.temperature_data = self.temperature_data[-self.max_points:]
-        
-        # Update plot data using time_data for x-axis
-        self.linear_accel_x_line.setData(self.time_data, self.linear_accel_x_data)
-        self.linear_accel_y_line.setData(self.time_data, self.linear_accel_y_data)
-        self.linear_accel_z_line.setData(self.time_data, self.linear_accel_z_data)
-        
-        self.altitude_line.setData(self.time_data, self.altitude_data)
-        self.z_gforce_line.setData(self.time_data, self.z_gforce_data)
-        self.temperature_line.setData(self.time_data, self.temperature_data)
+        # Add the sample to the history; the oldest one drops out once
+        # max_points is reached, at constant cost
+        self.history.append([self.plot_clock.convert([time_value])[0], linear_accel_x, linear_accel_y, linear_accel_z,
+                             altitude, z_axis_g_force, temperature])
+        self.update_lod()
+        
+        # Keep the newest values for the labels and redraw on the next frame
+        self.latest_sample = data
+        self.render_scheduler.mark_dirty("plots", "labels")
+        metrics.end("ingest", start)
+    
+    def update_with_batch(self, block):
+        """
+        Update dashboard with a block of samples delivered by the serial thread.
+
+        :param block: Structured NumPy array with one record per packet.
+        """
+        self.note_delivery()
+        if len(block) == 0:
+            return
+        start = metrics.begin()
+        
+        # Mark as connected and update last data time
+        if not self.is_connected:
+            self.is_connected = True
+            print("Connection established! Receiving data...")
+        
+        self.last_data_time = time.time()
+        
+        # Append the whole block to the history in one go
+        columns = ORIZABA.ring_block(block, self.HISTORY_CHANNELS)
+        columns[0] = self.plot_clock.convert(columns[0])
+        self.history.extend(columns)
+        self.update_lod()
+        
+        # Labels only ever show the newest sample
+        latest = list(block[-1].tolist())
+        latest[-1] = str(latest[-1])  # rocket_state is compared as text
+        self.latest_sample = latest
+        self.render_scheduler.mark_dirty("plots", "labels", count=len(block))
+        metrics.end("ingest", start)
+    
+    def render_frame(self, dirty):
+        """
+        Redraw the parts of the dashboard touched since the last frame.
+
+        Called by the render scheduler at most once per frame, however many
+        packets arrived in between.
+
+        :param dirty: Set of channel names marked dirty since the last frame.
+        """
+        if "plots" in dirty:
+            start = metrics.begin()
+            
+            if self.lod is None:
+                # Update plot data using the time channel for x-axis
+                time_data = self.history.view(self.PLOT_TIME)
+                for channel, line, _ in self.plot_lines:
+                    line.setData(time_data, self.history.view(channel))
+            else:
+                # Visible part of the flight at about one point per pixel
+                for channel, line, plot_widget in self.plot_lines:
+                    first, last, pixels = self.visible_samples(plot_widget)
+                    line.setData(*self.lod[channel].points(first, last, pixels))
+            metrics.end("plot_update", start)
+        
+        if "labels" in dirty and self.latest_sample is not None:
+            start = metrics.begin()
+            self.update_labels(self.latest_sample)
+            metrics.end("label_update", start)
+    
+    # Extra history drawn on each side of a zoomed view, as a fraction of its
+    # width, so a pan shows data before the next frame catches up
+    VIEW_MARGIN = 0.25
+    
+    def visible_samples(self, plot_widget):
+        """
+        History range to draw in a plot and the resolution to draw it at.
+
+        :param plot_widget: PlotWidget being redrawn.
+        :return: Tuple (first, last, pixels) - sample index range (last None for
+                 the newest sample) and the width in pixels it spans.
+        """
+        view_box = plot_widget.getViewBox()
+        pixels = max(plot_widget.width(), 1)
+        if view_box.autoRangeEnabled()[0]:
+            # Following the data: the whole flight is in view
+            return 0, None, pixels
+        
+        x_min, x_max = view_box.viewRange()[0]
+        margin = (x_max - x_min) * self.VIEW_MARGIN
+        # PLOT_TIME never decreases, even across clock restarts
+        time_data = self.history.view(self.PLOT_TIME)
+        first = int(np.searchsorted(time_data, x_min - margin))
+        last = int(np.searchsorted(time_data, x_max + margin, side="right"))
+        return first, last, pixels * (1 + 2 * self.VIEW_MARGIN)
+    
+    def on_view_range_changed(self, view_box, x_range):
+        """Redraw at the resolution of a zoomed or panned view"""
+        if not view_box.autoRangeEnabled()[0]:
+            self.render_scheduler.mark_dirty("plots", count=0)
+    
+    def update_lod(self):
+        """Extend the level-of-detail pyramids with newly ingested samples"""
+        if self.lod is not None:
+            for pyramid in self.lod.values():
+                pyramid.update()
+    
+    def update_labels(self, data):
+        """Show the values of one sample in the telemetry panel"""
+        (tilt_angle, z_axis_g_force, linear_accel_x, linear_accel_y, linear_accel_z,
+         linear_velocity_x, linear_velocity_y, linear_velocity_z,
+         altitude, pressure, heading, temperature, humidity,
+         longitude, latitude, time_value, state) = data
         
         # Update telemetry display with new values
         self.linear_vel_z.value_label.setText(f"{linear_velocity_z:.2f}")
@@ -684,8 +1052,8 @@ if __name__ == "__main__":
         # Create QApplication instance
         app = QApplication(sys.argv)
         
-        # Create and show the main window
-        dashboard = SensorDashboard()
+        # Create and show the main window; ORBIVIEW_RECEIVERS=2 merges two ground receivers
+        dashboard = SensorDashboard(receivers=int(os.environ.get("ORBIVIEW_RECEIVERS", "1")))
         dashboard.show()
         
         # Start the application event loop
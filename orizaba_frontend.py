@@ -1,14 +1,14 @@
 import dash
 from dash import dcc, html
-import plotly.graph_objs as go
-import pandas as pd
-import time
 import os
-import cv2
-from flask import Response, Flask
-import numpy as np
+from flask import Response, Flask, jsonify
 import math
-import glob
+from log_tail import CsvTailReader, SnapshotCache
+from telemetry_push import TelemetryBroadcaster
+from camera_stream import CameraBroadcaster
+from instrumentation import metrics
+from log_watcher import LogDirectoryWatcher
+from telemetry_schema import SCHEMAS, detect_schema
 
 # Initialize Flask server
 server = Flask(__name__)
@@ -22,10 +22,12 @@ LOGS_DIR = "Flight_Logs"
 # Define rocket states
 rocket_states = ["INIT", "Idle", "Boost", "Burnout", "Coast", "Apogee", "Drogue", "Main", "Landed"]
 
-# Last file check time and current file
-last_file_check = 0
-current_file = None
-last_read_line = 0
+# Tracks the active log from directory events instead of rescanning it
+log_watcher = LogDirectoryWatcher(LOGS_DIR, "Flight_Data_*.csv")
+
+# Follows the active log so each read only parses newly appended rows, and
+# shares the result between all callbacks and viewers until the log changes
+snapshot_cache = SnapshotCache(CsvTailReader())
 
  #-----------------------------------------------------------
 #FIX PARSING FOR FRONT END AS WELL
@@ -33,43 +35,9 @@ last_read_line = 0
 
 # Function to find the most recent CSV file in the logs directory
 def find_latest_csv():
-    global current_file, last_file_check
-    
-    # Only check for a new file every 5 seconds to avoid excessive file system operations
-    current_time = time.time()
-    if current_time - last_file_check < 5 and current_file is not None:
-        return current_file
-    
-    # Update the last check time
-    last_file_check = current_time
-    
-    try:
-        # Get all CSV files in the logs directory
-        files = glob.glob(os.path.join(LOGS_DIR, "Flight_Data_*.csv"))
-        
-        if not files:
-            print("No CSV files found in the logs directory.")
-            return None
-        
-        # Sort files by modification time (newest first)
-        files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        
-        # Get the most recent file
-        latest_file = files[0]
-        
-        # Check if the file has changed
-        if latest_file != current_file:
-            print(f"New log file detected: {latest_file}")
-            current_file = latest_file
-            # Reset line counter when switching to a new file
-            global last_read_line
-            last_read_line = 0
-        
-        return latest_file
-    
-    except Exception as e:
-        print(f"Error finding latest CSV file: {e}")
-        return None
+    # Starts the watcher on first use; afterwards this is just an attribute read
+    log_watcher.start()
+    return log_watcher.current()
 
 # Function to read the latest data from CSV
 def read_latest_data():
@@ -79,65 +47,46 @@ def read_latest_data():
         return None, None, None, None, None, None, None, None, None, None
     
     try:
-        # Read actual data from CSV
-        df = pd.read_csv(csv_file)
-        
-        # Check if there are new lines to read
-        global last_read_line
-        if len(df) <= last_read_line:
-            # No new data
-            if last_read_line > 0:
-                # Return the last known data
-                latest_row = df.iloc[last_read_line - 1]
-            else:
-                # No data yet
-                return None, None, None, None, None, None, None, None, None, None
-        else:
-            # New data available
-            latest_row = df.iloc[-1]
-            last_read_line = len(df)
+        # Only parse rows appended since the last read
+        latest_row = snapshot_cache.get(csv_file)
+        if latest_row is None:
+            # No data yet
+            return None, None, None, None, None, None, None, None, None, None
         
-        return (
-            latest_row['acceleration_x'],
-            latest_row['acceleration_y'],
-            latest_row['acceleration_z'],
-            latest_row['gyro_x'], 
-            latest_row['gyro_y'], 
-            latest_row['gyro_z'], 
-            latest_row['time_elapsed'],
-            latest_row['rocket_state'],
-            latest_row['rssi'], 
-            latest_row['signal_to_noise']
-        )
+        return row_values(latest_row)
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return None, None, None, None, None, None, None, None, None, None
 
+# HUD quantities in the order row_values() returns them; each vehicle's
+# schema maps them to its own log columns
+HUD_ROLES = ("accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z",
+             "time", "state", "rssi", "snr")
+hud_readers = {name: schema.row_reader(*HUD_ROLES) for name, schema in SCHEMAS.items()}
+
+# Function to pull the HUD fields out of a parsed log row
+def row_values(row):
+    # The log's header (the row's keys) tells which vehicle wrote it
+    schema = detect_schema(row)
+    if schema is None:
+        return (None,) * len(HUD_ROLES)
+    return hud_readers[schema.name](row)
+
 
  #-----------------------------------------------------------
+# Background video output settings, kept low enough for the field laptop uplink
+VIDEO_TARGET_FPS = 15
+VIDEO_MAX_WIDTH = 960
+VIDEO_JPEG_QUALITY = 70
+
+# Webcam capture and encode shared by every /video_feed viewer
+camera_broadcaster = CameraBroadcaster(0,  # Use the first webcam
+                                       target_fps=VIDEO_TARGET_FPS,
+                                       max_width=VIDEO_MAX_WIDTH,
+                                       jpeg_quality=VIDEO_JPEG_QUALITY)
+
 def generate_frames():
-    while True:
-        camera = cv2.VideoCapture(0)  # Use the first webcam
-
-        # Error troubleshooting
-        if not camera.isOpened():
-            print("Error: Could not open video device")
-            time.sleep(1)  # Wait before retrying
-            continue
-
-        try:
-            while True:
-                success, frame = camera.read()
-                if not success:
-                    break
-                else:
-                    _, buffer = cv2.imencode('.jpg', frame)
-                    frame_bytes = buffer.tobytes()
-
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        finally:
-            camera.release()
+    yield from camera_broadcaster.frames()
 
 def calculate_tilt(acc_x, acc_y, acc_z, gyro_x, gyro_y, gyro_z):
     # Handle None values
@@ -164,6 +113,22 @@ def calculate_tilt(acc_x, acc_y, acc_z, gyro_x, gyro_y, gyro_z):
 def video_feed():
     return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
+# Flask route exposing video encoder settings and per-viewer stream metrics
+@server.route('/video_stats')
+def video_stats():
+    return jsonify(camera_broadcaster.stats())
+
+# Flask route exposing snapshot cache hit/miss counters
+@server.route('/snapshot_stats')
+def snapshot_stats():
+    return jsonify(snapshot_cache.stats())
+
+# Flask route exposing per-stage timings (calls/s, CPU share, p50/p95/p99 ms)
+# and counters from the instrumentation module
+@server.route('/metrics')
+def metrics_snapshot():
+    return jsonify(metrics.snapshot())
+
 # Layout of the Dashboard
 app.layout = html.Div([
     # Background video
@@ -255,7 +220,7 @@ app.layout = html.Div([
             
         html.Div([
             html.Div("VELOCITY(MPH)", style={'color': 'white', 'font-size': '14px'}),
-            html.H3(id='velocity(mph)', style={'color': 'white'})
+            html.H3(id='velocity', style={'color': 'white'})
         ], style={'text-align': 'center', 'padding': '0 20px'})
     ], style={
         'position': 'absolute', 'bottom': '20px', 'left': '20px',
@@ -338,7 +303,8 @@ app.layout = html.Div([
     # Logo
     html.Img(src="/assets/seds.png", style={'position': 'absolute', 'top': '10px', 'right': '10px', 'width': '100px', 'opacity': '0.5'}),
 
-    # Interval component for real-time updates
+    # Interval component for real-time updates, used as a fallback when the
+    # /telemetry_stream push connection is down
     dcc.Interval(id='interval-component', interval=500, n_intervals=0)  # Check every 500ms
     
 ])
@@ -351,7 +317,9 @@ app.layout = html.Div([
 def update_progress(n):
     # Read latest data
     _, _, _, _, _, _, _, state, _, _ = read_latest_data()
-    
+    return progress_style(state)
+
+def progress_style(state):
     # If no data, use default
     if state is None:
         state = 1  # Default to first state
@@ -377,7 +345,9 @@ def update_progress(n):
 def update_data(n):
     # Read latest data
     accel_x, _, _, _, _, _, time_val, _, _, _ = read_latest_data()
-    
+    return telemetry_text(accel_x, time_val)
+
+def telemetry_text(accel_x, time_val):
     # We don't have altitude in this CSV structure
     # You might need to calculate it or find another way to get it
     altitude = 0  # Or set to None if you prefer
@@ -404,7 +374,9 @@ def update_data(n):
 def update_tilt_line(n):
     # Read latest data
     accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z, _, _, _, _ = read_latest_data()
-    
+    return tilt_style(accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
+
+def tilt_style(accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z):
     # Calculate tilt angle
     tilt_value = calculate_tilt(accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
 
@@ -421,6 +393,30 @@ def update_tilt_line(n):
         'z-index': '20'
     }
 
+# Build the HUD props pushed to viewers for one log row
+def hud_update(row):
+    accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z, time_val, state, _, _ = row_values(row)
+    altitude_str, accel_str, elapsed_time = telemetry_text(accel_x, time_val)
+
+    return {
+        'progress-bar': {'style': progress_style(state)},
+        'altitude': {'children': altitude_str},
+        'velocity': {'children': accel_str},
+        'mission-time': {'children': elapsed_time},
+        'tilt-line': {'style': tilt_style(accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)}
+    }
+
+# Single follower thread shared by every livestream viewer
+telemetry_broadcaster = TelemetryBroadcaster(find_latest_csv, hud_update, wait=log_watcher.wait_for_update)
+
+# Flask route pushing each new sample to the HUD as Server-Sent Events.
+# assets/telemetry_stream.js applies the updates and pauses the interval
+# polling below while the stream is connected.
+@server.route('/telemetry_stream')
+def telemetry_stream():
+    return Response(telemetry_broadcaster.stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # Run the Dash app
 if __name__ == '__main__':
     # Create logs directory if it doesn't exist
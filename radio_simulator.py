@@ -0,0 +1,432 @@
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from serial_engine import encode_frame
+from telemetry_schema import SCHEMAS, get_schema
+
+# Simulated receivers register their pty here so PortSelectionDialog can list
+# them next to the real serial ports
+SIM_PORTS_DIR = os.path.join(tempfile.gettempdir(), "orbiview_sim_ports")
+
+# Flight phases as (rocket_state, name, duration in seconds)
+FLIGHT_PHASES = [
+    (1, "INIT", 2.0),
+    (2, "IDLE", 5.0),
+    (3, "BOOST", 3.0),
+    (4, "BURNOUT", 1.0),
+    (5, "COAST", 12.0),
+    (6, "APOGEE", 1.0),
+    (7, "DROGUE", 30.0),
+    (8, "MAIN", 40.0),
+    (9, "LAND", 10.0),
+]
+
+GRAVITY = 9.80665
+
+# Vinson reports raw IMU counts: milli-g and millidegrees per second
+RAW_SCALES = {"accel": 1000 / GRAVITY, "gyro": 1000.0}
+
+
+class FlightProfile:
+    """
+    Synthetic flight through every rocket_state.
+
+    Vertical motion is integrated from a simple thrust/drag/parachute model;
+    the other channels are derived from it with a little noise, which is
+    enough to exercise every plot and label of the dashboards.
+
+    :param seed: Random seed for the sensor noise.
+    :param dt: Integration step in seconds.
+    """
+
+    BOOST_ACCEL = 80.0      # m/s^2 net of gravity
+    DROGUE_RATE = -25.0     # m/s
+    MAIN_RATE = -6.0        # m/s
+
+    def __init__(self, seed=None, dt=0.01):
+        self.rng = random.Random(seed)
+        self.dt = dt
+        self.duration = sum(duration for _, _, duration in FLIGHT_PHASES)
+        self.reset()
+
+    def reset(self):
+        self.time = 0.0
+        self.altitude = 0.0
+        self.velocity = 0.0
+        self.accel = 0.0
+
+    def phase(self, t):
+        """rocket_state at flight time t"""
+        for state, _, duration in FLIGHT_PHASES:
+            if t < duration:
+                return state
+            t -= duration
+        return FLIGHT_PHASES[-1][0]
+
+    def advance(self, t):
+        """Integrate the vertical motion up to flight time t"""
+        while self.time < t:
+            state = self.phase(self.time)
+            if state == 3:
+                accel = self.BOOST_ACCEL
+            elif state in (4, 5, 6):
+                # Ballistic with a little drag until apogee
+                accel = -GRAVITY - 0.002 * self.velocity * abs(self.velocity)
+            elif state == 7:
+                accel = (self.DROGUE_RATE - self.velocity) * 2.0
+            elif state == 8:
+                accel = (self.MAIN_RATE - self.velocity) * 2.0
+            else:
+                accel = 0.0
+
+            self.velocity += accel * self.dt
+            self.altitude = max(self.altitude + self.velocity * self.dt, 0.0)
+            if self.altitude == 0.0 and self.phase(self.time) >= 7:
+                self.velocity = 0.0
+            self.accel = accel
+            self.time += self.dt
+
+    def sample(self, t):
+        """
+        Sensor values at flight time t.
+
+        :param t: Seconds since INIT; wraps around after landing.
+        :return: Dict of role name to value in SI units (degrees for angles).
+        """
+        t %= self.duration
+        if t < self.time:
+            self.reset()
+        self.advance(t)
+
+        noise = self.rng.gauss
+        state = self.phase(t)
+        tilt = 2.0 + noise(0, 0.5) if state < 7 else 20.0 + noise(0, 5)
+        pressure = 1013.25 * (1 - 2.25577e-5 * self.altitude) ** 5.25588
+        rssi = -40 - 20 * math.log10(1 + self.altitude / 50) + noise(0, 2)
+
+        return {
+            "tilt": tilt,
+            "z_gforce": (self.accel + GRAVITY) / GRAVITY + noise(0, 0.02),
+            "accel_x": noise(0, 0.3),
+            "accel_y": noise(0, 0.3),
+            "accel_z": self.accel + GRAVITY + noise(0, 0.3),
+            "gyro_x": noise(0, 2) * (5 if state >= 7 else 1),
+            "gyro_y": noise(0, 2) * (5 if state >= 7 else 1),
+            "gyro_z": noise(0, 10) if state >= 7 else noise(0, 1),
+            "velocity_x": noise(0, 0.2),
+            "velocity_y": noise(0, 0.2),
+            "velocity_z": self.velocity,
+            "altitude": self.altitude,
+            "pressure": pressure,
+            "heading": (90 + noise(0, 2)) % 360,
+            "temperature": 25.0 - 0.0065 * self.altitude + noise(0, 0.1),
+            "humidity": 40.0 + noise(0, 0.5),
+            "longitude": -80.3735 + self.altitude * 1e-6,
+            "latitude": 25.7562 + self.altitude * 5e-7,
+            "time": t,
+            "state": state,
+            "rssi": rssi,
+            "snr": 10.0 + noise(0, 1.5),
+        }
+
+
+def sample_values(schema, sample):
+    """
+    Convert a profile sample into one value per schema field.
+
+    :param schema: PacketSchema to emit.
+    :param sample: Dict from FlightProfile.sample().
+    :return: Tuple in field order, rounded the way the flight computer prints it.
+    """
+    values = []
+    for field in schema.fields:
+        value = sample.get(field.role, 0.0)
+        if field.role == "time":
+            value /= schema.time_scale
+        elif field.unit == "raw":
+            value *= RAW_SCALES.get(field.role.split("_")[0], 1.0)
+        value /= field.scale
+
+        if np.dtype(field.dtype).kind in "iu":
+            values.append(int(round(value)))
+        elif field.role in ("longitude", "latitude"):
+            values.append(round(value, 6))
+        else:
+            values.append(round(value, 2))
+    return tuple(values)
+
+
+class RadioSimulator:
+    """
+    Fake LoRa receiver on a Linux pseudo-terminal.
+
+    Opens a pty pair and writes +RCV lines (or binary frames) for a synthetic
+    flight to the master side; the slave side behaves like the receiver's
+    serial port, so SerialThread reads it with pyserial exactly like hardware.
+    The port is registered in SIM_PORTS_DIR while running so the dashboard's
+    port dialog lists it.
+
+    :param schema: Name of the vehicle schema to emit.
+    :param rate: Mean packets per second.
+    :param jitter: Random variation of each interval, as a fraction of it.
+    :param burst: Packets sent back to back in each transmission (the gap
+                  after a burst grows to keep the mean rate).
+    :param corrupt: Probability that a packet is corrupted in transit.
+    :param drop: Probability that a packet is lost.
+    :param downlink: "ascii" for +RCV lines or "binary" for framed records.
+    :param seed: Random seed (None for a different flight every run).
+    :param flight_speed: Flight seconds simulated per wall-clock second, to
+                         run through all nine states quickly.
+    """
+
+    def __init__(self, schema="orizaba", rate=10.0, jitter=0.0, burst=1, corrupt=0.0, drop=0.0,
+                 downlink="ascii", seed=None, flight_speed=1.0):
+        if downlink not in ("ascii", "binary"):
+            raise ValueError(f"Unknown downlink format {downlink!r}")
+
+        self.schema = get_schema(schema)
+        self.rate = rate
+        self.jitter = jitter
+        self.burst = max(int(burst), 1)
+        self.corrupt = corrupt
+        self.drop = drop
+        self.downlink = downlink
+        self.flight_speed = flight_speed
+
+        self.rng = random.Random(seed)
+        self.profile = FlightProfile(seed)
+
+        self.port = None
+        self.packets_sent = 0
+        self.packets_dropped = 0
+        self.packets_corrupted = 0
+        self.overruns = 0  # Packets lost because nobody was reading the port
+
+        self._master = None
+        self._slave = None
+        self._registration = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def open(self):
+        """
+        Create the pty and register it.
+
+        :return: Path of the simulated serial port.
+        """
+        # POSIX only, so imported here to keep the module (and simulated_ports)
+        # importable on Windows
+        import tty
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self._registration = register_port(self.port, f"Simulated {self.schema.name} receiver")
+        return self.port
+
+    def start(self):
+        """Open the port if needed and start transmitting in the background"""
+        if self._master is None:
+            self.open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.close()
+
+    def close(self):
+        if self._registration is not None:
+            unregister_port(self._registration)
+            self._registration = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def run(self):
+        """Transmit until stop() is called"""
+        start = time.monotonic()
+        next_send = start
+        interval = 1.0 / self.rate
+
+        while not self._stop.is_set():
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+
+            flight_time = (time.monotonic() - start) * self.flight_speed
+            data = b"".join(self.packet(flight_time) for _ in range(self.burst))
+            self.transmit(data)
+
+            gap = interval * self.burst
+            if self.jitter:
+                gap *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+            next_send += max(gap, 0.0)
+
+    def packet(self, t):
+        """
+        Encode the packet for flight time t, applying drop and corruption.
+
+        :param t: Flight time in seconds.
+        :return: Bytes to send (empty if the packet was dropped).
+        """
+        values = sample_values(self.schema, self.profile.sample(t))
+        if self.downlink == "binary":
+            data = encode_frame(self.schema, values)
+        else:
+            data = self.schema.format_rcv(values)
+
+        if self.drop and self.rng.random() < self.drop:
+            self.packets_dropped += 1
+            return b""
+        if self.corrupt and self.rng.random() < self.corrupt:
+            self.packets_corrupted += 1
+            data = self.corrupt_packet(data)
+
+        self.packets_sent += 1
+        return data
+
+    def corrupt_packet(self, data):
+        """Damage a packet the way a noisy link does: bit flips, truncation or garbage"""
+        data = bytearray(data)
+        kind = self.rng.randrange(3)
+        if kind == 0:
+            for _ in range(self.rng.randint(1, 3)):
+                data[self.rng.randrange(len(data))] ^= 1 << self.rng.randrange(8)
+        elif kind == 1:
+            cut = self.rng.randrange(1, len(data))
+            data = data[:cut] + (b"\r\n" if self.downlink == "ascii" else b"")
+        else:
+            garbage = bytes(self.rng.randrange(256) for _ in range(self.rng.randint(1, 8)))
+            pos = self.rng.randrange(len(data))
+            data = data[:pos] + garbage + data[pos:]
+        return bytes(data)
+
+    def transmit(self, data):
+        if not data:
+            return
+        try:
+            written = os.write(self._master, data)
+        except BlockingIOError:
+            written = 0
+        if written < len(data):
+            # pty buffer full - nobody is reading, like a receiver with no host
+            self.overruns += 1
+
+    def stats(self):
+        return {
+            "port": self.port,
+            "schema": self.schema.name,
+            "packets_sent": self.packets_sent,
+            "packets_dropped": self.packets_dropped,
+            "packets_corrupted": self.packets_corrupted,
+            "overruns": self.overruns,
+        }
+
+
+def register_port(port, description):
+    """
+    Advertise a simulated port to PortSelectionDialog.
+
+    :param port: Device path of the pty slave.
+    :param description: Text shown next to the port.
+    :return: Registration file, for unregister_port().
+    """
+    os.makedirs(SIM_PORTS_DIR, exist_ok=True)
+    path = os.path.join(SIM_PORTS_DIR, f"{os.getpid()}_{os.path.basename(port)}.json")
+    with open(path, "w") as file:
+        json.dump({"port": port, "description": description, "pid": os.getpid()}, file)
+    return path
+
+
+def unregister_port(registration):
+    try:
+        os.remove(registration)
+    except FileNotFoundError:
+        pass
+
+
+def simulated_ports():
+    """
+    List the simulated ports of running simulators.
+
+    Registrations left behind by simulators that died are removed.
+
+    :return: List of (port, description, hwid) tuples like list_ports.comports().
+    """
+    if os.name != "posix":
+        # No simulators without ptys, and os.kill(pid, 0) would terminate pid on Windows
+        return []
+
+    ports = []
+    for path in sorted(glob.glob(os.path.join(SIM_PORTS_DIR, "*.json"))):
+        try:
+            with open(path) as file:
+                entry = json.load(file)
+            os.kill(entry["pid"], 0)
+            if not os.path.exists(entry["port"]):
+                raise FileNotFoundError(entry["port"])
+        except (OSError, ValueError, KeyError):
+            unregister_port(path)
+            continue
+        ports.append((entry["port"], entry["description"], f"SIM pid={entry['pid']}"))
+    return ports
+
+
+# Command line simulator:
+#   python radio_simulator.py --schema orizaba --rate 50 --jitter 0.2 --corrupt 0.01
+# then pick the printed port in the dashboard's port dialog.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a LoRa receiver on a pseudo-terminal")
+    parser.add_argument("--schema", default="orizaba", choices=sorted(SCHEMAS), help="Vehicle packet schema")
+    parser.add_argument("--rate", type=float, default=10.0, help="Mean packets per second")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Interval variation as a fraction (0-1)")
+    parser.add_argument("--burst", type=int, default=1, help="Packets sent back to back per transmission")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="Probability a packet is corrupted")
+    parser.add_argument("--drop", type=float, default=0.0, help="Probability a packet is lost")
+    parser.add_argument("--downlink", default="ascii", choices=["ascii", "binary"], help="Packet encoding")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--flight-speed", type=float, default=1.0,
+                        help="Flight seconds per real second (the flight lasts %g s)" % FlightProfile().duration)
+    args = parser.parse_args()
+
+    if not hasattr(os, "openpty"):
+        print("The radio simulator needs a system with pseudo-terminals (Linux/macOS)")
+        sys.exit(1)
+
+    simulator = RadioSimulator(args.schema, rate=args.rate, jitter=args.jitter, burst=args.burst,
+                               corrupt=args.corrupt, drop=args.drop, downlink=args.downlink, seed=args.seed,
+                               flight_speed=args.flight_speed)
+    # Unregister the port on kill as well as on Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    port = simulator.start()
+    print(f"Simulating {args.schema} receiver on {port} ({args.rate:g} packets/s). Ctrl+C to stop.")
+
+    try:
+        while True:
+            time.sleep(5)
+            print(simulator.stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+        print(f"Stopped: {simulator.stats()}")
@@ -0,0 +1,232 @@
+import collections
+import time
+
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+
+from instrumentation import metrics
+
+# Merging redundant ground receivers
+#
+# Every receiver hears (most of) the same downlink, so the streams carry the
+# same packets with gaps in different places. Copies of one packet are
+# recognised by time_elapsed plus the rest of the vehicle payload: the flight
+# computer's clock only ticks every 0.25 s, so several packets can share a
+# time_elapsed and are told apart by their contents. Fields the receiver adds
+# itself (RSSI and SNR) differ between copies and are left out of the match;
+# where the schema carries them they pick which copy is kept instead.
+
+
+class ReceiverStats:
+    """
+    What one receiver has contributed to the merged stream.
+
+    :param name: Label shown in stats (usually the port).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.packets = 0      # Packets decoded from this receiver
+        self.unique = 0       # Packets no other receiver delivered
+        self.chosen = 0       # Packets whose copy from this receiver was kept
+        self.duplicates = 0   # Copies of a packet another receiver delivered first
+        self.late = 0         # Packets that arrived after newer ones were released
+
+        self._rate_count = 0
+        self._rate_since = time.monotonic()
+        self.rate = 0.0
+
+    def update_rate(self, now):
+        """Packets per second since the last call"""
+        elapsed = now - self._rate_since
+        if elapsed > 0:
+            self.rate = (self.packets - self._rate_count) / elapsed
+        self._rate_count = self.packets
+        self._rate_since = now
+        return self.rate
+
+
+class PacketMerger:
+    """
+    Merges the packet streams of several receivers into one ordered stream.
+
+    Receivers add decoded blocks as they arrive; release() hands back each
+    packet once, ordered by time_elapsed. A packet is held for window_ms after
+    its first copy arrives so slower receivers can still contribute a better
+    copy and packets arriving out of order can be put back in sequence.
+
+    :param schema: PacketSchema shared by all receivers.
+    :param receivers: Receiver names, one per input.
+    :param window_ms: How long a packet waits for its other copies.
+    :param history: Released packets remembered to catch copies arriving after
+                    the window.
+    """
+
+    def __init__(self, schema, receivers, window_ms=150, history=4096):
+        self.schema = schema
+        self.window = window_ms / 1000
+        self.receivers = [ReceiverStats(name) for name in receivers]
+
+        # Link quality fields, best first: a higher RSSI wins, SNR breaks ties
+        self.quality_fields = [name for name in (schema.role_field("rssi"), schema.role_field("snr")) if name]
+        self.payload_fields = [name for name in schema.names if name not in self.quality_fields]
+
+        self.released = 0     # Packets released
+        self.duplicates = 0   # Copies dropped
+        self.late = 0         # Packets released out of order
+        self.newest = None    # time_elapsed of the newest released packet
+
+        # key -> [first arrival, time_elapsed, arrival order, record, chosen receiver, receivers]
+        self._pending = {}
+        self._order = 0
+        self._recent = {}  # Released key -> receivers that heard it
+        self._recent_keys = collections.deque()
+        self._history = history
+
+    def add(self, receiver, records, now=None):
+        """
+        Take a block of packets from one receiver.
+
+        :param receiver: Index of the receiver.
+        :param records: Structured array with the schema's dtype or log_dtype
+                        (the same for every receiver).
+        :param now: Monotonic time of arrival (time.monotonic() if None).
+        """
+        if not len(records):
+            return
+        if now is None:
+            now = time.monotonic()
+        stats = self.receivers[receiver]
+        stats.packets += len(records)
+
+        duplicates = 0
+        keys = repack_fields(records[self.payload_fields])
+        times = records[self.schema.time_field].tolist()
+        for i, elapsed in enumerate(times):
+            key = keys[i].tobytes()
+            entry = self._pending.get(key)
+            if entry is None:
+                heard_by = self._recent.get(key)
+                if heard_by is not None:
+                    # A copy of this packet was already released
+                    duplicates += 1
+                    if receiver not in heard_by:
+                        if len(heard_by) == 1:
+                            # Its receiver was credited with a unique packet; not any more
+                            self.receivers[next(iter(heard_by))].unique -= 1
+                        heard_by.add(receiver)
+                    continue
+                if self.newest is not None and elapsed < self.newest:
+                    stats.late += 1
+                self._pending[key] = [now, elapsed, self._order, records[i].copy(), receiver, {receiver}]
+                self._order += 1
+                continue
+
+            duplicates += 1
+            entry[5].add(receiver)
+            if self.better(records[i], entry[3]):
+                entry[3] = records[i].copy()
+                entry[4] = receiver
+
+        if duplicates:
+            stats.duplicates += duplicates
+            self.duplicates += duplicates
+            metrics.count("duplicates", duplicates)
+
+    def better(self, record, current):
+        """Whether record has better link quality than the copy held (False without quality fields)"""
+        for name in self.quality_fields:
+            if record[name] != current[name]:
+                return record[name] > current[name]
+        return False
+
+    def release(self, now=None, flush=False):
+        """
+        Hand back the packets whose window has passed.
+
+        Everything ordered before the newest expired packet goes with it, so
+        the output never runs backwards because one packet arrived late.
+
+        :param now: Monotonic time (time.monotonic() if None).
+        :param flush: Release everything still held (at shutdown).
+        :return: Structured array of merged packets in time_elapsed order.
+        """
+        if not self._pending:
+            return np.empty(0, dtype=self.schema.dtype)
+        if now is None:
+            now = time.monotonic()
+        start = metrics.begin()
+
+        entries = sorted(self._pending.items(), key=lambda item: (item[1][1], item[1][2]))
+        if flush:
+            count = len(entries)
+        else:
+            count = 0
+            for i, (_, entry) in enumerate(entries):
+                if now - entry[0] >= self.window:
+                    count = i + 1
+        if not count:
+            metrics.end("merge", start)
+            return np.empty(0, dtype=self.schema.dtype)
+
+        # Keep the receivers' record layout (log_dtype for +RCV text)
+        block = np.empty(count, dtype=entries[0][1][3].dtype)
+        for i, (key, (_, elapsed, _, record, chosen, heard_by)) in enumerate(entries[:count]):
+            del self._pending[key]
+            block[i] = record
+            self.receivers[chosen].chosen += 1
+            if len(heard_by) == 1:
+                self.receivers[chosen].unique += 1
+            if self.newest is None or elapsed > self.newest:
+                self.newest = elapsed
+            elif elapsed < self.newest:
+                self.late += 1
+            self.remember(key, heard_by)
+
+        self.released += count
+        metrics.end("merge", start)
+        return block
+
+    def remember(self, key, heard_by):
+        """Keep a released packet's key and receivers so late copies are still recognised"""
+        self._recent[key] = heard_by
+        self._recent_keys.append(key)
+        if len(self._recent_keys) > self._history:
+            self._recent.pop(self._recent_keys.popleft(), None)
+
+    def stats(self, now=None):
+        """
+        Per-receiver contribution since the start of the session.
+
+        :param now: Monotonic time for the packet rates (time.monotonic() if None).
+        :return: List of dicts with name, packets, rate (packets/s since the
+                 previous call), unique, chosen, duplicates and late per receiver.
+        """
+        if now is None:
+            now = time.monotonic()
+        return [{
+            "name": receiver.name,
+            "packets": receiver.packets,
+            "rate": receiver.update_rate(now),
+            "unique": receiver.unique,
+            "chosen": receiver.chosen,
+            "duplicates": receiver.duplicates,
+            "late": receiver.late,
+        } for receiver in self.receivers]
+
+
+def format_receiver_stats(receivers, released=None):
+    """
+    Render per-receiver stats as a fixed-width text table for on-screen overlays.
+
+    :param receivers: List of dicts from PacketMerger.stats().
+    :param released: Packets in the merged stream, to show the share of it each
+                     receiver heard (left out if None).
+    :return: Multi-line string.
+    """
+    lines = [f"{'receiver':<16}{'pkt/s':>7}{'packets':>9}{'unique':>8}{'kept':>8}{'heard':>7}"]
+    for stats in receivers:
+        heard = f"{stats['packets'] / released * 100:.0f}%" if released else "-"
+        lines.append(f"{stats['name'][-16:]:<16}{stats['rate']:>7.0f}{stats['packets']:>9}"
+                     f"{stats['unique']:>8}{stats['chosen']:>8}{heard:>7}")
+    return "\n".join(lines)
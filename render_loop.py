@@ -0,0 +1,77 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+class RenderScheduler(QObject):
+    """
+    Fixed-rate redraw loop that decouples plotting from packet arrival.
+
+    Ingest code calls mark_dirty() with the channels a packet touched; a QTimer
+    running at the configured frame rate calls the render callback at most once
+    per frame with every channel dirtied since the previous frame. Any number
+    of packets between two frames costs a single redraw.
+
+    :param render: Callable taking the set of dirty channel names.
+    :param fps: Target redraw rate.
+    :param parent: Optional parent QObject.
+    """
+
+    def __init__(self, render, fps=30, parent=None):
+        super().__init__(parent)
+        self.render = render
+        self.fps = fps
+
+        self.ingest_count = 0
+        self.render_count = 0
+        self.ingest_rate = 0.0  # Packets per second over the last second
+        self.render_rate = 0.0  # Frames drawn per second over the last second
+
+        self._dirty = set()
+        self._rate_start = time.monotonic()
+        self._rate_ingest = 0
+        self._rate_render = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._on_frame)
+
+    def start(self):
+        self.timer.start(max(int(1000 / self.fps), 1))
+
+    def stop(self):
+        self.timer.stop()
+
+    def set_fps(self, fps):
+        """Change the redraw rate, restarting the timer if running"""
+        self.fps = fps
+        if self.timer.isActive():
+            self.start()
+
+    def mark_dirty(self, *channels, count=1):
+        """
+        Record that new data arrived for the given channels.
+
+        :param channels: Names of the channels to redraw on the next frame.
+        :param count: Number of packets ingested (more than one for a batch).
+        """
+        self._dirty.update(channels)
+        self.ingest_count += count
+        self._rate_ingest += count
+
+    def _on_frame(self):
+        if self._dirty:
+            dirty = self._dirty
+            self._dirty = set()
+            self.render(dirty)
+            self.render_count += 1
+            self._rate_render += 1
+
+        # Refresh the measured rates once a second
+        now = time.monotonic()
+        elapsed = now - self._rate_start
+        if elapsed >= 1.0:
+            self.ingest_rate = self._rate_ingest / elapsed
+            self.render_rate = self._rate_render / elapsed
+            self._rate_ingest = 0
+            self._rate_render = 0
+            self._rate_start = now
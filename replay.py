@@ -0,0 +1,286 @@
+import argparse
+import os
+import sys
+import time
+from urllib.parse import parse_qs
+
+import numpy as np
+import serial
+
+from flight_log import FlightLog
+from serial_engine import encode_frame
+from telemetry_schema import get_schema
+
+# Replay sources are addressed like ports so SerialThread can open them in
+# place of the receiver:
+#   replay://Flight_Logs/Flight_Data_2025-03-01_10-00-00.csv?speed=4&downlink=binary
+REPLAY_SCHEME = "replay://"
+
+
+class ReplayClock:
+    """
+    Maps wall-clock time onto a recorded flight's timeline.
+
+    The clock starts on the first due() call; from then on every record whose
+    recorded time, divided by the speed factor, has passed is due. A backwards
+    jump in the recorded time (the flight computer restarting its counter) is
+    replayed as one typical packet interval.
+
+    :param seconds: Recorded time of each record in seconds.
+    :param speed: Playback speed factor (None for as fast as possible).
+    """
+
+    def __init__(self, seconds, speed=1.0):
+        seconds = np.asarray(seconds, dtype=np.float64)
+        steps = np.diff(seconds)
+        if len(steps) and (steps < 0).any():
+            forward = steps[steps > 0]
+            steps[steps < 0] = np.median(forward) if len(forward) else 0.0
+        self.seconds = np.concatenate(([0.0], np.cumsum(steps))) if len(seconds) else seconds
+        self.speed = speed
+        self.position = 0
+        self._start = None
+
+    def __len__(self):
+        return len(self.seconds)
+
+    @property
+    def done(self):
+        return self.position >= len(self.seconds)
+
+    def restart(self):
+        self.position = 0
+        self._start = None
+
+    def due(self, limit=None):
+        """
+        Advance past every record that is due.
+
+        :param limit: Most records to release at once (None for no limit).
+        :return: Tuple (start, stop) - the slice of newly due records.
+        """
+        if self._start is None:
+            self._start = time.monotonic()
+
+        if self.speed is None:
+            stop = len(self.seconds)
+        else:
+            elapsed = (time.monotonic() - self._start) * self.speed
+            stop = int(np.searchsorted(self.seconds, elapsed, side="right"))
+        if limit is not None:
+            stop = min(stop, self.position + limit)
+
+        start = self.position
+        self.position = max(stop, start)
+        return start, self.position
+
+    def wait_time(self):
+        """Seconds until the next record is due (0 when one already is, None when done)"""
+        if self.done:
+            return None
+        if self.speed is None or self._start is None:
+            return 0.0
+        target = self._start + self.seconds[self.position] / self.speed
+        return max(target - time.monotonic(), 0.0)
+
+
+class ReplayPort:
+    """
+    serial.Serial stand-in that plays a recorded flight log back as receiver traffic.
+
+    Records are released with their original time_elapsed spacing (scaled by
+    speed) and encoded as +RCV lines or binary downlink frames, so everything
+    downstream of the port - SerialLineReader/SerialFrameReader, the parser,
+    logging and the dashboard - runs exactly as it does on a live link.
+
+    :param path: Recorded .csv or .obl flight log.
+    :param speed: Playback speed factor (None for as fast as possible).
+    :param downlink: "ascii" for +RCV lines or "binary" for framed records.
+    :param loop: Start over at the end of the log instead of going quiet.
+    :param timeout: Longest read() blocks waiting for data, like serial.Serial.
+    :param chunk: Most records released per read at full speed.
+    """
+
+    def __init__(self, path, speed=1.0, downlink="ascii", loop=False, timeout=0.1, chunk=256):
+        if downlink not in ("ascii", "binary"):
+            raise ValueError(f"Unknown downlink format {downlink!r}")
+
+        self.port = path
+        self.path = path
+        self.speed = speed
+        self.downlink = downlink
+        self.loop = loop
+        self.timeout = timeout
+        self.chunk = chunk
+        self.is_open = True
+
+        self.log = FlightLog(path)
+        self.schema = get_schema(self.log.schema)
+        self.records = self.log.records
+        self.clock = ReplayClock(self.schema.seconds(self.records), speed)
+
+        self.packets_sent = 0
+        self.bytes_sent = 0
+
+        self._pending = bytearray()
+
+    @classmethod
+    def from_url(cls, url, timeout=0.1):
+        """
+        Open a replay:// port.
+
+        :param url: replay://PATH[?speed=N|max][&downlink=ascii|binary][&loop=1]
+        :param timeout: Read timeout in seconds.
+        """
+        path, _, query = url[len(REPLAY_SCHEME):].partition("?")
+        options = {key: values[-1] for key, values in parse_qs(query).items()}
+        return cls(path,
+                   speed=parse_speed(options.get("speed", "1")),
+                   downlink=options.get("downlink", "ascii"),
+                   loop=options.get("loop", "0") not in ("0", "false", ""),
+                   timeout=timeout)
+
+    @property
+    def in_waiting(self):
+        self._fill()
+        return len(self._pending)
+
+    def read(self, size=1):
+        """
+        Read up to size bytes, blocking up to the timeout for the first one.
+
+        :param size: Most bytes to return.
+        :return: Bytes read (empty on timeout or once the log has ended).
+        """
+        deadline = time.monotonic() + (self.timeout or 0)
+        self._fill()
+        while not self._pending and self.is_open:
+            remaining = deadline - time.monotonic()
+            wait = self.clock.wait_time()
+            if remaining <= 0 or wait is None:
+                break
+            time.sleep(min(remaining, wait))
+            self._fill()
+
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def _fill(self):
+        """Encode the records that have come due into the pending bytes"""
+        if self.clock.done and self.loop:
+            self.clock.restart()
+
+        start, stop = self.clock.due(limit=self.chunk)
+        if stop == start:
+            return
+
+        if self.downlink == "binary":
+            packets = [encode_frame(self.schema, record) for record in self.records[start:stop]]
+        else:
+            packets = [self.schema.format_rcv(record) for record in self.records[start:stop]]
+        data = b"".join(packets)
+
+        self._pending += data
+        self.packets_sent += stop - start
+        self.bytes_sent += len(data)
+
+    def reset_input_buffer(self):
+        self._pending.clear()
+
+    def close(self):
+        self.is_open = False
+
+
+def parse_speed(value):
+    """Parse a speed factor; "max" (or 0) means as fast as possible"""
+    if value in ("max", "inf"):
+        return None
+    speed = float(value)
+    return speed if speed > 0 else None
+
+
+def open_port(port, baudrate, timeout):
+    """
+    Open a receiver port or a replay source.
+
+    :param port: Serial device, or a replay:// URL.
+    :param baudrate: Baud rate for real ports.
+    :param timeout: Read timeout in seconds.
+    :return: serial.Serial or ReplayPort.
+    """
+    if port.startswith(REPLAY_SCHEME):
+        return ReplayPort.from_url(port, timeout=timeout)
+    return serial.Serial(port=port, baudrate=baudrate, timeout=timeout)
+
+
+def replay_to_csv(path, out_dir="Flight_Logs", speed=1.0, loop=False, flush_interval_ms=50):
+    """
+    Replay a recorded log into a new live log for the Dash frontend.
+
+    Rows are appended to a fresh Flight_Data_*.csv in out_dir with the
+    recording's pacing, so the frontend's log watcher follows it exactly as
+    it follows a flight in progress.
+
+    :param path: Recorded .csv or .obl flight log.
+    :param out_dir: Directory the frontend watches.
+    :param speed: Playback speed factor (None for as fast as possible).
+    :param loop: Start over at the end of the log.
+    :param flush_interval_ms: Flush interval of the live log.
+    :return: Tuple (output path, rows written, seconds taken).
+    """
+    log = FlightLog(path)
+    schema = get_schema(log.schema)
+    clock = ReplayClock(schema.seconds(log.records), speed)
+
+    os.makedirs(out_dir, exist_ok=True)
+    current_time = time.strftime("%Y-%m-%d_%H-%M-%S")
+    out_path = os.path.join(out_dir, f"Flight_Data_{current_time}.csv")
+    writer = schema.csv_writer(out_path, flush_interval_ms=flush_interval_ms)
+
+    started = time.monotonic()
+    try:
+        while True:
+            if clock.done:
+                if not loop:
+                    break
+                clock.restart()
+
+            start, stop = clock.due()
+            for record in log.records[start:stop]:
+                writer.writerow(list(record))
+            writer.poll()
+
+            wait = clock.wait_time()
+            if wait:
+                # Wake up at least every flush interval so the tail stays fresh
+                time.sleep(min(wait, flush_interval_ms / 1000))
+    except KeyboardInterrupt:
+        print("Replay stopped")
+    finally:
+        writer.close()
+
+    return out_path, writer.rows_written, time.monotonic() - started
+
+
+# Command line replay into Flight_Logs for the Dash frontend:
+#   python replay.py Flight_Logs/Flight_Data_2025-03-01_10-00-00.csv --speed 4
+# For the dashboard, select "Replay Log..." in the port dialog or use the
+# port replay://PATH?speed=4 with SerialThread.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded flight log into Flight_Logs")
+    parser.add_argument("log", help="Recorded .csv or .obl flight log")
+    parser.add_argument("--speed", default="1", help="Playback speed factor, or 'max' (default 1)")
+    parser.add_argument("--out-dir", default="Flight_Logs", help="Directory the frontend watches")
+    parser.add_argument("--loop", action="store_true", help="Start over at the end of the log")
+    args = parser.parse_args()
+
+    try:
+        speed = parse_speed(args.speed)
+    except ValueError:
+        print(f"Invalid speed {args.speed!r}")
+        sys.exit(1)
+
+    print(f"Replaying {args.log} at {'max' if speed is None else f'{speed:g}x'} speed...")
+    out_path, rows, elapsed = replay_to_csv(args.log, args.out_dir, speed, args.loop)
+    print(f"Wrote {rows} rows to {out_path} in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
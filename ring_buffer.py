@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Preallocated, column-oriented ring buffer for plot history.
+
+    Every column (channel) is one row of length 2 x capacity and each sample
+    is written twice, at i and i + capacity. The most recent samples of any
+    channel are then always one contiguous slice, so view() hands pyqtgraph a
+    NumPy view with no copying or reordering, and append() costs the same
+    whether the window holds 500 points or 50,000.
+
+    :param columns: Channel names, e.g. ["time", "altitude"]. All channels share
+                    the same write position, so a "time" column acts as the
+                    common x axis.
+    :param capacity: Number of samples kept per channel.
+    :param dtype: NumPy dtype of the stored values.
+    """
+
+    def __init__(self, columns, capacity, dtype=np.float64):
+        self.columns = list(columns)
+        self.capacity = capacity
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.zeros((len(self.columns), 2 * capacity), dtype=dtype)
+        self._head = 0  # Next write position in [0, capacity)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def append(self, values):
+        """
+        Add one sample to every channel.
+
+        :param values: Sequence with one value per column, in column order.
+        """
+        head = self._head
+        self._data[:, head] = values
+        self._data[:, head + self.capacity] = values
+
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, block):
+        """
+        Add several samples to every channel at once.
+
+        :param block: Array-like of shape (len(columns), n), oldest sample first.
+        """
+        block = np.asarray(block, dtype=self._data.dtype)
+        n = block.shape[1]
+        if n == 0:
+            return
+        if n >= self.capacity:
+            # Only the newest capacity samples survive
+            block = block[:, -self.capacity:]
+            n = self.capacity
+
+        # Write the block into both halves, wrapping at the end of each half
+        head = self._head
+        first = min(n, self.capacity - head)
+        for offset in (0, self.capacity):
+            self._data[:, offset + head:offset + head + first] = block[:, :first]
+            self._data[:, offset:offset + n - first] = block[:, first:]
+
+        self._head = (head + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+
+    def view(self, column):
+        """
+        Contiguous view of a channel's samples, oldest first.
+
+        The view is only valid until the next append; take a copy to keep it.
+
+        :param column: Channel name.
+        :return: 1-D NumPy view of length len(self).
+        """
+        end = self._head + self.capacity
+        return self._data[self._index[column], end - self._count:end]
+
+    def latest(self, column):
+        """Most recent value of a channel (None if empty)"""
+        if not self._count:
+            return None
+        return self._data[self._index[column], self._head + self.capacity - 1]
@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+
+
+class SampleBatcher:
+    """
+    Accumulates parsed samples into a typed block for bulk cross-thread delivery.
+
+    The acquisition thread writes each sample straight into a preallocated
+    NumPy structured array. take() hands the filled part over as one block and
+    starts a fresh array, so the receiving thread owns the block outright and
+    one queued signal carries any number of samples.
+
+    :param dtype: Structured dtype of one sample.
+    :param interval_ms: Minimum time between deliveries.
+    :param capacity: Initial block size; grows if a burst overflows it.
+    """
+
+    def __init__(self, dtype, interval_ms=20, capacity=256):
+        self.dtype = np.dtype(dtype)
+        self.interval_ms = interval_ms
+        self.capacity = capacity
+
+        self._block = np.empty(capacity, dtype=self.dtype)
+        self._count = 0
+        self._last_take = time.monotonic()
+
+    def __len__(self):
+        return self._count
+
+    def add(self, row):
+        """
+        Append one sample.
+
+        :param row: Sequence of values in dtype field order.
+        """
+        if self._count == len(self._block):
+            # Burst larger than the block - double it
+            self._block = np.resize(self._block, 2 * len(self._block))
+        self._block[self._count] = tuple(row)
+        self._count += 1
+
+    def extend(self, records):
+        """
+        Append a block of already-typed samples.
+
+        :param records: Structured array with this batcher's dtype.
+        """
+        needed = self._count + len(records)
+        if needed > len(self._block):
+            self._block = np.resize(self._block, max(needed, 2 * len(self._block)))
+        self._block[self._count:needed] = records
+        self._count = needed
+
+    def due(self):
+        """True if samples are waiting and the delivery interval has passed"""
+        return self._count > 0 and (time.monotonic() - self._last_take) * 1000 >= self.interval_ms
+
+    def take(self):
+        """
+        Hand over the accumulated samples.
+
+        :return: Structured array of the samples added since the last take().
+        """
+        block = self._block[:self._count]
+        self._block = np.empty(self.capacity, dtype=self.dtype)
+        self._count = 0
+        self._last_take = time.monotonic()
+        return block
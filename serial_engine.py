@@ -0,0 +1,255 @@
+import binascii
+import struct
+
+import numpy as np
+
+from instrumentation import metrics
+from telemetry_schema import get_frame_schema
+
+# Binary downlink frame
+#
+#   sync       2 bytes, FRAME_SYNC
+#   frame id   u8, PacketSchema.frame_id of the sending vehicle
+#   length     u8, payload length in bytes (the schema's record size)
+#   payload    one packed little-endian record in the schema's dtype
+#   crc        u16 little-endian CRC-CCITT (binascii.crc_hqx, initial 0xFFFF)
+#              over frame id, length and payload
+#
+# An Orizaba sample is 79 bytes framed against roughly 110 as +RCV text, and
+# the payload decodes with numpy.frombuffer instead of 17 float() calls.
+
+FRAME_SYNC = b"\xa5\x5a"
+CRC_INIT = 0xFFFF
+
+_FRAME_HEADER = struct.Struct("<2sBB")
+_FRAME_CRC = struct.Struct("<H")
+FRAME_OVERHEAD = _FRAME_HEADER.size + _FRAME_CRC.size
+
+
+def encode_frame(schema, values):
+    """
+    Pack one sample into a binary downlink frame.
+
+    :param schema: PacketSchema of the sending vehicle.
+    :param values: Sequence of values in schema field order.
+    :return: Frame bytes.
+    """
+    payload = np.array(tuple(values), dtype=schema.dtype).tobytes()
+    body = bytes((schema.frame_id, len(payload))) + payload
+    return FRAME_SYNC + body + _FRAME_CRC.pack(binascii.crc_hqx(body, CRC_INIT))
+
+
+class SerialLineReader:
+    """
+    Drains a serial port in bulk and splits it into complete lines.
+
+    Each read_lines() call blocks on the port until data arrives or the port
+    timeout expires, then takes everything already waiting in one read. Bytes
+    are appended to an internal buffer and every complete line is returned;
+    a trailing partial line stays in the buffer for the next call. There is no
+    fixed sleep, so throughput is bounded by the link's baud rate and latency
+    by the time the line takes to arrive.
+
+    :param port: Open serial.Serial (or any object with read() and in_waiting).
+    :param marker: Only lines containing this prefix are returned (None for all).
+    :param max_line: Longest partial line kept before it is treated as noise.
+    """
+
+    def __init__(self, port, marker=b"+RCV=", max_line=4096):
+        self.port = port
+        self.marker = marker
+        self.max_line = max_line
+
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.discarded_bytes = 0
+
+        self._buffer = bytearray()
+
+    def read_lines(self):
+        """
+        Read whatever the port has and return the complete lines in it.
+
+        :return: List of lines as bytes without line terminators, oldest first.
+        """
+        # Block for the first byte (up to the port timeout), then drain the rest
+        data = self.port.read(max(1, self.port.in_waiting))
+        if not data:
+            return []
+
+        # Time spent waiting for the link is idle time; only the drain and split count
+        start = metrics.begin()
+        waiting = self.port.in_waiting
+        if waiting:
+            data += self.port.read(waiting)
+
+        self.bytes_read += len(data)
+        self._buffer += data
+
+        end = self._buffer.rfind(b"\n")
+        if end < 0:
+            if len(self._buffer) > self.max_line:
+                # No line ending in sight - drop the noise instead of growing forever
+                self.discarded_bytes += len(self._buffer)
+                metrics.count("discarded_bytes", len(self._buffer))
+                self._buffer.clear()
+            metrics.end("serial_read", start)
+            return []
+
+        complete = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+
+        lines = []
+        for line in complete.split(b"\n"):
+            line = line.strip()
+            if line and (self.marker is None or self.marker in line):
+                lines.append(line)
+
+        self.lines_read += len(lines)
+        metrics.end("serial_read", start)
+        return lines
+
+    def reset(self):
+        """Drop any buffered partial line (e.g. after reconnecting)"""
+        self._buffer.clear()
+
+
+class FrameDecoder:
+    """
+    Splits a byte stream into CRC-checked binary downlink frames.
+
+    Bytes are searched for the sync word; a candidate frame is only accepted
+    if its identifier names a registered schema, its length matches that
+    schema's record size and the CRC checks out. Anything else costs one
+    byte of resynchronisation and a counter increment, never an exception.
+    Payloads of the accepted frames are decoded in one numpy.frombuffer call
+    per schema.
+    """
+
+    def __init__(self):
+        self.frames_read = 0
+        self.crc_errors = 0
+        self.discarded_bytes = 0
+
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Add received bytes and decode every complete frame in the buffer.
+
+        :param data: Bytes read from the port.
+        :return: List of (PacketSchema, records) with records a structured
+                 array of consecutive samples from that vehicle, oldest first.
+        """
+        buffer = self._buffer
+        buffer += data
+
+        blocks = []
+        payloads = []
+        schema = None
+        pos = 0
+        while True:
+            start = buffer.find(FRAME_SYNC, pos)
+            if start < 0:
+                # Keep a trailing byte that may be the first half of a sync word
+                keep = max(len(buffer) - 1, pos)
+                self.discarded_bytes += keep - pos
+                pos = keep
+                break
+            self.discarded_bytes += start - pos
+
+            if len(buffer) - start < _FRAME_HEADER.size:
+                pos = start
+                break
+            _, frame_id, length = _FRAME_HEADER.unpack_from(buffer, start)
+
+            frame_schema = get_frame_schema(frame_id)
+            if frame_schema is None or length != frame_schema.dtype.itemsize:
+                # Sync word inside noise or a payload - skip past it
+                self.discarded_bytes += 1
+                pos = start + 1
+                continue
+
+            end = start + _FRAME_HEADER.size + length + _FRAME_CRC.size
+            if end > len(buffer):
+                pos = start
+                break
+
+            body = buffer[start + len(FRAME_SYNC):end - _FRAME_CRC.size]
+            if binascii.crc_hqx(body, CRC_INIT) != _FRAME_CRC.unpack_from(buffer, end - _FRAME_CRC.size)[0]:
+                self.crc_errors += 1
+                metrics.count("crc_errors")
+                self.discarded_bytes += 1
+                pos = start + 1
+                continue
+
+            if frame_schema is not schema and payloads:
+                blocks.append(self._decode(schema, payloads))
+                payloads = []
+            schema = frame_schema
+            payloads.append(body[2:])
+            pos = end
+
+        del buffer[:pos]
+        if payloads:
+            blocks.append(self._decode(schema, payloads))
+        return blocks
+
+    def _decode(self, schema, payloads):
+        self.frames_read += len(payloads)
+        return schema, np.frombuffer(b"".join(payloads), dtype=schema.dtype)
+
+    def reset(self):
+        """Drop any buffered partial frame"""
+        self._buffer.clear()
+
+
+class SerialFrameReader:
+    """
+    Drains a serial port in bulk and decodes the binary downlink frames in it.
+
+    The binary counterpart of SerialLineReader, with the same blocking
+    behaviour: each read_frames() call waits for data up to the port timeout,
+    takes everything waiting and returns the frames completed by it.
+
+    :param port: Open serial.Serial (or any object with read() and in_waiting).
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.decoder = FrameDecoder()
+        self.bytes_read = 0
+
+    @property
+    def frames_read(self):
+        return self.decoder.frames_read
+
+    @property
+    def crc_errors(self):
+        return self.decoder.crc_errors
+
+    def read_frames(self):
+        """
+        Read whatever the port has and decode the frames in it.
+
+        :return: List of (PacketSchema, records) blocks, oldest first.
+        """
+        data = self.port.read(max(1, self.port.in_waiting))
+        if not data:
+            return []
+
+        start = metrics.begin()
+        waiting = self.port.in_waiting
+        if waiting:
+            data += self.port.read(waiting)
+        self.bytes_read += len(data)
+        metrics.end("serial_read", start)
+
+        start = metrics.begin()
+        blocks = self.decoder.feed(data)
+        metrics.end("decode", start)
+        return blocks
+
+    def reset(self):
+        """Drop any buffered partial frame (e.g. after reconnecting)"""
+        self.decoder.reset()
@@ -0,0 +1,240 @@
+import mmap
+import os
+import secrets
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from telemetry_schema import get_schema
+
+# Shared-memory sample ring
+#
+#   header   64 bytes, RING_HEADER: magic, capacity, record size, the sequence
+#            number of the next sample to be written, the sequence number a
+#            write in progress runs up to, and the schema name
+#   records  capacity records in the schema's dtype; sample number s lives in
+#            slot s % capacity
+#
+# One process writes; any number of processes map the same block and read
+# without copying through a pipe or locking the writer. The header works as a
+# seqlock: before copying a block the writer announces how far it is about to
+# write ("writing"), and only once the records are in place advances
+# "written". A reader copies up to "written", then checks "writing" again and
+# throws away every sample the writer may have been overwriting meanwhile, so
+# it never hands out a torn record. A reader that falls more than capacity
+# samples behind loses the oldest ones and is told how many.
+
+RING_MAGIC = 0x4F5242494E473032  # "ORBING02"
+RING_HEADER = np.dtype([("magic", "<u8"), ("capacity", "<u8"), ("itemsize", "<u8"),
+                        ("written", "<u8"), ("writing", "<u8"), ("schema", "S24")])
+
+# POSIX shared memory is a file here on Linux, which lets readers map it
+# read-only and keeps attaching processes out of multiprocessing's resource
+# tracker (which would unlink the block when they exit)
+SHM_DIR = "/dev/shm"
+
+
+def _map(name, writable):
+    """
+    Map an existing shared-memory block.
+
+    :param name: Block name.
+    :param writable: Map for writing (readers map read-only where possible).
+    :return: Tuple (buffer, handle) - handle is closed when the mapping is released.
+    """
+    path = os.path.join(SHM_DIR, name)
+    if os.path.exists(path):
+        fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            handle = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        return handle, handle
+
+    # Other platforms: a regular attach; read-only is enforced on the NumPy views
+    handle = shared_memory.SharedMemory(name=name)
+    return handle.buf, handle
+
+
+class SharedSampleRing:
+    """
+    Fixed-capacity ring of typed telemetry samples in shared memory.
+
+    Create it in the process that owns its lifetime, then attach to it by name
+    from the acquisition process (writer) and any number of consumers
+    (readers) - the dashboard, a recorder, an analysis script.
+
+    :param buffer: Mapped memory holding the header and the records.
+    :param handle: Object released by close() (mmap or SharedMemory).
+    :param name: Shared-memory block name.
+    :param writable: Whether this mapping may write samples.
+    :param owner: SharedMemory to unlink on close() (creator only).
+    """
+
+    def __init__(self, buffer, handle, name, writable, owner=None):
+        self.name = name
+        self.writable = writable
+        self._handle = handle
+        self._owner = owner
+
+        self._header = np.ndarray((), dtype=RING_HEADER, buffer=buffer)
+        if int(self._header["magic"]) != RING_MAGIC:
+            raise ValueError(f"Shared memory {name!r} does not hold a sample ring")
+        self.schema = get_schema(self._header["schema"].item().decode("ascii"))
+        self.capacity = int(self._header["capacity"])
+        self.records = np.ndarray((self.capacity,), dtype=self.schema.dtype, buffer=buffer,
+                                  offset=RING_HEADER.itemsize)
+        if not writable:
+            self._header.flags.writeable = False
+            self.records.flags.writeable = False
+
+    @classmethod
+    def create(cls, schema, capacity=65536, name=None):
+        """
+        Allocate a new ring.
+
+        :param schema: PacketSchema of the samples.
+        :param capacity: Number of samples kept (at 200 packets/s the default
+                         holds over five minutes).
+        :param name: Block name (a unique one is chosen if None).
+        :return: Writable SharedSampleRing that unlinks the block on close().
+        """
+        name = name or f"orbiview_{os.getpid()}_{secrets.token_hex(4)}"
+        size = RING_HEADER.itemsize + capacity * schema.dtype.itemsize
+        owner = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((), dtype=RING_HEADER, buffer=owner.buf)
+        header["capacity"] = capacity
+        header["itemsize"] = schema.dtype.itemsize
+        header["written"] = 0
+        header["writing"] = 0
+        header["schema"] = schema.name.encode("ascii")
+        header["magic"] = RING_MAGIC
+        del header
+
+        return cls(owner.buf, owner, name, writable=True, owner=owner)
+
+    @classmethod
+    def attach(cls, name, writable=False):
+        """
+        Map an existing ring.
+
+        :param name: Block name given by the creator.
+        :param writable: True for the single writer; readers map read-only.
+        """
+        buffer, handle = _map(name, writable)
+        return cls(buffer, handle, name, writable)
+
+    @property
+    def written(self):
+        """Sequence number of the next sample to be written (= samples written so far)"""
+        return int(self._header["written"])
+
+    @property
+    def writing(self):
+        """Sequence number the write in progress runs up to (= written when idle)"""
+        return int(self._header["writing"])
+
+    def write(self, records):
+        """
+        Append a block of samples, overwriting the oldest once full.
+
+        :param records: Structured array with the ring schema's dtype (log_dtype
+                        records are narrowed to it on the way in).
+        """
+        n = len(records)
+        if not n:
+            return
+        written = self.written
+        if n > self.capacity:
+            # Only the newest capacity samples fit
+            written += n - self.capacity
+            records = records[-self.capacity:]
+            n = self.capacity
+
+        # Announce the slots about to be overwritten before touching them
+        self._header["writing"] = written + n
+
+        start = written % self.capacity
+        first = min(n, self.capacity - start)
+        self.records[start:start + first] = records[:first]
+        self.records[:n - first] = records[first:]
+
+        # Publish only after the samples are in place
+        self._header["written"] = written + n
+
+    def reader(self, from_start=False):
+        """
+        Start a reader on this mapping.
+
+        :param from_start: Begin at the oldest sample still held instead of the newest.
+        """
+        return SharedRingReader(self, from_start)
+
+    def close(self):
+        """Release the mapping (and remove the block if this process created it)"""
+        self._header = None
+        self.records = None
+        handle, self._handle = self._handle, None
+        if handle is not None:
+            handle.close()
+        if self._owner is not None:
+            self._owner.unlink()
+            self._owner = None
+
+
+class SharedRingReader:
+    """
+    Follows a SharedSampleRing from one consumer.
+
+    Each reader keeps its own position, so consumers never hold each other up
+    and the writer never waits for any of them.
+
+    :param ring: SharedSampleRing to read.
+    :param from_start: Begin at the oldest sample still held instead of the newest.
+    """
+
+    def __init__(self, ring, from_start=False):
+        self.ring = ring
+        written = ring.written
+        self.position = max(written - ring.capacity, 0) if from_start else written
+        self.samples_read = 0
+        self.samples_lost = 0
+
+    def read(self):
+        """
+        Copy out every sample written since the last call.
+
+        :return: Tuple (first, records) - the sequence number of the first
+                 returned sample and a structured array of the samples.
+        """
+        ring = self.ring
+        capacity = ring.capacity
+        written = ring.written
+        if written - self.position > capacity:
+            # Fell a whole lap behind; the oldest samples are gone
+            self.samples_lost += written - capacity - self.position
+            self.position = written - capacity
+        first = self.position
+        if written == first:
+            return first, ring.records[:0].copy()
+
+        start = first % capacity
+        stop = start + (written - first)
+        if stop <= capacity:
+            records = ring.records[start:stop].copy()
+        else:
+            records = np.concatenate((ring.records[start:], ring.records[:stop - capacity]))
+
+        # Samples in slots the writer has reused, or is reusing right now,
+        # since the copy started may be torn
+        overwritten = min(ring.writing - capacity - first, len(records))
+        if overwritten > 0:
+            self.samples_lost += overwritten
+            records = records[overwritten:]
+            first += overwritten
+
+        self.position = written
+        self.samples_read += len(records)
+        return first, records
@@ -0,0 +1,118 @@
+import re
+
+import numpy as np
+
+# Bytes that can appear in a well-formed payload (digits, signs, exponents,
+# nan/inf as printed by the flight computer, separators and line endings)
+PAYLOAD_BYTES = b"0123456789.,-+eEnaNAifIF \t\r\n"
+
+# np.loadtxt names the row holding a value that does not convert
+_FAILED_ROW = re.compile(r"at row (\d+)")
+
+
+def parse_rcv_block(lines, dtype, prefix=b"+RCV=", field_offset=0):
+    """
+    Parse a block of +RCV telemetry lines in one vectorized pass.
+
+    Lines are screened for the prefix, the field count and stray bytes, then
+    the payloads of the well-formed ones go through NumPy's C text parser in a
+    single call that writes straight into the typed record layout. If a
+    payload still hides a value that does not convert (e.g. "1.2.3" or an
+    integer out of range), only that row is set aside and the rest are parsed
+    again in bulk, so one corrupt packet only invalidates itself.
+
+    :param lines: Sequence of raw lines (bytes), e.g. from SerialLineReader.
+    :param dtype: Structured record dtype (PacketSchema.dtype); its field count
+                  sets the expected number of values per line.
+    :param prefix: Marker preceding the payload.
+    :param field_offset: Number of leading payload fields to skip (e.g. the
+                         LoRa address and length).
+    :return: Tuple (records, valid) - a structured array with one record per
+             input line and a boolean mask that is False for malformed lines.
+    """
+    dtype = np.dtype(dtype)
+    needed = field_offset + len(dtype.names)
+
+    payloads, rows = _screen(lines, prefix, needed, field_offset)
+
+    valid = np.zeros(len(lines), dtype=bool)
+    if not payloads:
+        return np.zeros(len(lines), dtype=dtype), valid
+
+    usecols = range(field_offset, needed)
+    try:
+        parsed = np.loadtxt(payloads, delimiter=",", dtype=dtype, usecols=usecols,
+                            encoding="latin-1", ndmin=1)
+    except ValueError:
+        # Somewhere in the block is a field that does not convert; isolate it
+        parsed, ok = _parse_isolating(payloads, dtype, usecols)
+        rows = np.asarray(rows)[ok]
+        parsed = parsed[ok]
+
+    valid[rows] = True
+    if valid.all():
+        return parsed, valid
+
+    records = np.zeros(len(lines), dtype=dtype)
+    records[rows] = parsed
+    return records, valid
+
+
+def _screen(lines, prefix, needed, field_offset):
+    """
+    Pick out the lines that look like well-formed packets: prefix present,
+    enough separators, and no byte in the parsed fields that no number could
+    contain. The checks are C-level bytes methods, so a corrupt line is
+    dropped here for well under a microsecond instead of failing np.loadtxt.
+
+    :return: Tuple (payloads, rows) - the payloads to parse and their line indices.
+    """
+    payloads = []
+    rows = []
+    skip = len(prefix)
+    for i, line in enumerate(lines):
+        start = line.find(prefix)
+        if start < 0 or line.count(b",", start) < needed - 1:
+            continue
+        payload = line[start + skip:]
+        # Leading fields that are not parsed (address, length) may hold anything
+        values = payload.split(b",", field_offset)[-1] if field_offset else payload
+        if values.translate(None, PAYLOAD_BYTES):
+            continue
+        payloads.append(payload)
+        rows.append(i)
+    return payloads, rows
+
+
+def _parse_isolating(payloads, dtype, usecols):
+    """
+    Slow path: parse a block in which some value does not convert.
+
+    np.loadtxt reports the row it failed on, so the rows before it are parsed
+    in one call and the suspect row on its own (in case the report is off);
+    without a row number the span is halved instead. A corrupt packet costs a
+    few extra calls, not one call per line.
+
+    :return: Tuple (records, ok) with one entry per payload.
+    """
+    records = np.zeros(len(payloads), dtype=dtype)
+    ok = np.zeros(len(payloads), dtype=bool)
+    spans = [(0, len(payloads))]
+    while spans:
+        start, stop = spans.pop()
+        try:
+            records[start:stop] = np.loadtxt(payloads[start:stop], delimiter=",", dtype=dtype,
+                                             usecols=usecols, encoding="latin-1", ndmin=1)
+            ok[start:stop] = True
+        except ValueError as e:
+            if stop - start == 1:
+                continue
+            failed = _FAILED_ROW.search(str(e))
+            row = start + int(failed.group(1)) if failed else -1
+            if start <= row < stop:
+                spans.extend(span for span in ((start, row), (row, row + 1), (row + 1, stop)) if span[0] < span[1])
+            else:
+                middle = (start + stop) // 2
+                spans.append((start, middle))
+                spans.append((middle, stop))
+    return records, ok
@@ -0,0 +1,155 @@
+import json
+import math
+import queue
+import threading
+import time
+
+from instrumentation import metrics
+from log_tail import CsvTailReader
+
+
+def _json_safe(value):
+    """
+    Replace NaN and infinite floats (e.g. a dropped sensor) with None, in
+    nested dicts and lists, so the update is valid JSON.
+
+    :param value: HUD update as returned by a formatter.
+    :return: The same structure with non-finite floats as None.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+class TelemetryBroadcaster:
+    """
+    Pushes every new flight log sample to all connected livestream viewers.
+
+    A single background thread follows the active log and turns each newly
+    appended row into a HUD update with the supplied formatter. The update is
+    serialized once and handed to every subscriber queue, so server work per
+    sample does not grow with the number of viewers. A viewer that falls behind
+    loses its oldest queued updates rather than stalling the others.
+
+    :param locate: Callable returning the path of the log to follow (or None).
+    :param formatter: Callable turning a log row dict into a JSON-serializable
+                      HUD update.
+    :param poll_interval: Seconds between checks of the log for new rows.
+    :param queue_size: Updates buffered per subscriber before dropping.
+    :param wait: Optional callable taking a timeout that returns early when the
+                 log changes (e.g. LogDirectoryWatcher.wait_for_update). Defaults
+                 to sleeping for poll_interval.
+    """
+
+    def __init__(self, locate, formatter, poll_interval=0.02, queue_size=32, wait=None):
+        self.locate = locate
+        self.formatter = formatter
+        self.poll_interval = poll_interval
+        self.wait = wait or time.sleep
+        self.queue_size = queue_size
+
+        self.reader = CsvTailReader()
+        self.samples_sent = 0
+        self.last_message = None
+
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """
+        Register a new viewer, starting the follower thread on first use.
+
+        :return: Queue that receives serialized SSE messages.
+        """
+        subscriber = queue.Queue(maxsize=self.queue_size)
+
+        with self._lock:
+            # Bring new viewers up to date right away
+            if self.last_message is not None:
+                subscriber.put_nowait(self.last_message)
+            self._subscribers.add(subscriber)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a viewer that disconnected"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(self, keepalive=15.0):
+        """
+        Generator yielding Server-Sent Events for one viewer.
+
+        :param keepalive: Seconds of silence before sending a comment line so
+                          proxies keep the connection open.
+        """
+        subscriber = self.subscribe()
+        try:
+            while True:
+                try:
+                    yield subscriber.get(timeout=keepalive)
+                except queue.Empty:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def publish(self, row):
+        """Format one sample and deliver it to every subscriber"""
+        start = metrics.begin()
+        # Browsers' JSON.parse rejects the NaN that json.dumps writes by default
+        update = _json_safe(self.formatter(row))
+        message = b"data: " + json.dumps(update, allow_nan=False).encode("utf-8") + b"\n\n"
+        metrics.end("hud_format", start)
+
+        with self._lock:
+            self.last_message = message
+            self.samples_sent += 1
+            for subscriber in self._subscribers:
+                try:
+                    subscriber.put_nowait(message)
+                except queue.Full:
+                    # Slow viewer - drop its oldest update to make room
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+                    subscriber.put_nowait(message)
+                    metrics.count("hud_dropped")
+
+    def _run(self):
+        catching_up = True
+        while True:
+            try:
+                path = self.locate()
+                if self.reader.follow(path):
+                    with self._lock:
+                        self.last_message = None
+                    catching_up = True
+
+                start = metrics.begin()
+                rows = self.reader.poll()
+                metrics.end("log_tail", start)
+                if rows and catching_up:
+                    # Rows already on disk are history; only send the newest
+                    rows = rows[-1:]
+                    catching_up = False
+
+                for row in rows:
+                    self.publish(row)
+            except Exception as e:
+                print(f"Error broadcasting telemetry: {e}")
+
+            self.wait(self.poll_interval)
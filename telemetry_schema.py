@@ -0,0 +1,295 @@
+import numpy as np
+
+from flight_history import FlightHistory
+from log_writer import CsvLogWriter
+from ring_buffer import RingBuffer
+from telemetry_parser import parse_rcv_block
+
+# Vehicle packet schemas
+#
+# Every vehicle profile declares its downlink once: field order on the wire,
+# the packed dtype used for typed blocks and binary logs, engineering units and
+# the scale that turns a raw value into those units. Parsers, log writers,
+# ring-buffer layouts and frontend readers are all built from the profile, so
+# supporting another vehicle means registering one more schema here.
+#
+# Fields can also carry a role - a vehicle-independent name such as "accel_x"
+# or "state" - so the frontends can pull the HUD values out of any log without
+# knowing which vehicle wrote it.
+
+
+class Field:
+    """
+    One value in a vehicle's telemetry packet.
+
+    :param name: Column name used in logs and typed records.
+    :param dtype: NumPy dtype string of the packed value.
+    :param unit: Engineering unit of the scaled value.
+    :param scale: Factor converting the logged value to unit.
+    :param role: Vehicle-independent name of the quantity (None if it has none).
+    """
+
+    def __init__(self, name, dtype, unit="", scale=1.0, role=None):
+        self.name = name
+        self.dtype = dtype
+        self.unit = unit
+        self.scale = scale
+        self.role = role
+
+
+class PacketSchema:
+    """
+    Declarative layout of one vehicle's +RCV packet.
+
+    :param name: Schema name written into binary log headers.
+    :param fields: List of Field in wire and log column order.
+    :param wire_offset: Leading wire fields that are not logged (e.g. the LoRa
+                        address and payload length).
+    :param prefix: Marker preceding the payload on the receiver's serial line.
+    :param frame_id: Identifier byte of this vehicle's binary downlink frames.
+    :param time_field: Field counting flight time.
+    :param time_scale: Seconds per count of time_field.
+    """
+
+    def __init__(self, name, fields, wire_offset=0, prefix=b"+RCV=", frame_id=None,
+                 time_field="time_elapsed", time_scale=0.25):
+        self.name = name
+        self.fields = list(fields)
+        self.wire_offset = wire_offset
+        self.prefix = prefix
+        self.frame_id = frame_id
+        self.time_field = time_field
+        self.time_scale = time_scale
+
+        self.names = [field.name for field in self.fields]
+        self.dtype = np.dtype([(field.name, field.dtype) for field in self.fields])
+        # Layout +RCV text is parsed into for logging: float32 fields are
+        # widened to float64 so the CSV keeps every digit the radio printed
+        self.log_dtype = np.dtype([(field.name, "<f8" if np.dtype(field.dtype) == np.float32 else field.dtype)
+                                   for field in self.fields])
+        self.wire_field_count = wire_offset + len(self.fields)
+
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._roles = {field.role: field.name for field in self.fields if field.role}
+
+    def __repr__(self):
+        return f"PacketSchema({self.name!r}, {len(self.fields)} fields)"
+
+    def index(self, name):
+        """Column index of a field"""
+        return self._index[name]
+
+    def field(self, name):
+        return self.fields[self._index[name]]
+
+    def role_field(self, role):
+        """Name of the field filling a role, or None if this vehicle lacks it"""
+        return self._roles.get(role)
+
+    def binary_fields(self):
+        """(name, dtype) pairs for the binary log header"""
+        return [(field.name, field.dtype) for field in self.fields]
+
+    def parse(self, lines, dtype=None):
+        """
+        Parse a block of raw +RCV lines into typed records.
+
+        :param lines: Raw lines (bytes).
+        :param dtype: Record layout (self.dtype if None, or self.log_dtype to
+                      keep the full precision of the text).
+        :return: Tuple (records, valid) as from parse_rcv_block.
+        """
+        return parse_rcv_block(lines, dtype or self.dtype, prefix=self.prefix, field_offset=self.wire_offset)
+
+    def format_rcv(self, values):
+        """
+        Format one sample as the receiver prints it.
+
+        Leading wire fields are filled with address 0 and the payload length.
+
+        :param values: Sequence of values in field order (NumPy scalars keep
+                       their short text form).
+        :return: +RCV line as bytes, terminated with CRLF.
+        """
+        payload = ",".join([str(value) for value in values])
+        if self.wire_offset:
+            lead = ["0"] * (self.wire_offset - 1) + [str(len(payload))]
+            payload = ",".join(lead) + "," + payload
+        return self.prefix + payload.encode() + b"\r\n"
+
+    def seconds(self, records):
+        """Flight time of a record block in seconds"""
+        return records[self.time_field] * self.time_scale
+
+    def scaled(self, records, name):
+        """Column of a record block converted to engineering units"""
+        scale = self.field(name).scale
+        column = records[name]
+        return column if scale == 1.0 else column * scale
+
+    def csv_writer(self, path, state_field="rocket_state", **kwargs):
+        """
+        Open a CSV log with this schema's header.
+
+        :param path: Log file to create.
+        :param state_field: Field whose change forces a flush (None to disable).
+        :param kwargs: Passed on to CsvLogWriter.
+        """
+        state_column = self._index.get(state_field) if state_field else None
+        return CsvLogWriter(path, self.names, state_column=state_column, **kwargs)
+
+    def binary_writer(self, path, **kwargs):
+        """
+        Open a binary log for this schema.
+
+        :param path: Log file to create.
+        :param kwargs: Passed on to BinaryLogWriter.
+        """
+        # binary_log resolves schema names through this module, so import late
+        from binary_log import BinaryLogWriter
+        return BinaryLogWriter(path, self.name, **kwargs)
+
+    def ring_buffer(self, capacity, names=None):
+        """
+        Plot history laid out for this schema.
+
+        :param capacity: Number of samples kept per field (None to keep the
+                         whole flight in a FlightHistory).
+        :param names: Field names to keep, in column order (all fields if None).
+        """
+        if capacity is None:
+            return FlightHistory(names or self.names)
+        return RingBuffer(names or self.names, capacity)
+
+    def ring_block(self, records, names):
+        """
+        Columns of a record block shaped for RingBuffer/FlightHistory.extend.
+
+        :param records: Structured array with this schema's dtype.
+        :param names: Field names in the ring's column order.
+        :return: Array of shape (len(names), len(records)) in engineering units.
+        """
+        return np.array([self.scaled(records, name) for name in names], dtype=np.float64)
+
+    def row_reader(self, *roles):
+        """
+        Build a function pulling role values out of a parsed log row.
+
+        :param roles: Role names, e.g. "accel_x", "time", "state".
+        :return: Callable taking a row dict and returning a tuple with one value
+                 per role (None for roles this vehicle does not have).
+        """
+        lookups = []
+        for role in roles:
+            name = self._roles.get(role)
+            scale = self.field(name).scale if name else 1.0
+            lookups.append((name, scale))
+
+        def read(row):
+            values = []
+            for name, scale in lookups:
+                value = row.get(name) if name else None
+                if value is not None and scale != 1.0:
+                    value *= scale
+                values.append(value)
+            return tuple(values)
+
+        return read
+
+
+SCHEMAS = {}
+
+
+def register_schema(schema):
+    """Add a vehicle schema to the registry"""
+    SCHEMAS[schema.name] = schema
+    return schema
+
+
+def get_schema(name):
+    """
+    Look up a registered schema.
+
+    :param name: Schema name, e.g. "orizaba".
+    :return: PacketSchema.
+    """
+    try:
+        return SCHEMAS[name]
+    except KeyError:
+        raise ValueError(f"Unknown telemetry schema {name!r}") from None
+
+
+def detect_schema(columns):
+    """
+    Find the schema whose field names match a log header.
+
+    :param columns: Column names from a CSV header.
+    :return: PacketSchema, or None if no schema matches.
+    """
+    columns = list(columns)
+    for schema in SCHEMAS.values():
+        if schema.names == columns:
+            return schema
+    return None
+
+
+def get_frame_schema(frame_id):
+    """
+    Look up the schema sending binary frames with the given identifier.
+
+    :param frame_id: Identifier byte from a frame header.
+    :return: PacketSchema, or None if no schema uses the identifier.
+    """
+    for schema in SCHEMAS.values():
+        if schema.frame_id == frame_id:
+            return schema
+    return None
+
+
+def detect_rcv_schema(line):
+    """
+    Find the schema whose wire field count matches a raw +RCV line.
+
+    :param line: Raw line (bytes).
+    :return: PacketSchema, or None if no schema matches.
+    """
+    for schema in SCHEMAS.values():
+        start = line.find(schema.prefix)
+        if start >= 0 and line.count(b",", start) + 1 == schema.wire_field_count:
+            return schema
+    return None
+
+
+ORIZABA = register_schema(PacketSchema("orizaba", [
+    Field("tilt_angle", "<f4", "deg", role="tilt"),
+    Field("z_axis_g_force", "<f4", "g", role="z_gforce"),
+    Field("linear_accel_x", "<f4", "m/s^2", role="accel_x"),
+    Field("linear_accel_y", "<f4", "m/s^2", role="accel_y"),
+    Field("linear_accel_z", "<f4", "m/s^2", role="accel_z"),
+    Field("linear_velocity_x", "<f4", "m/s", role="velocity_x"),
+    Field("linear_velocity_y", "<f4", "m/s", role="velocity_y"),
+    Field("linear_velocity_z", "<f4", "m/s", role="velocity_z"),
+    Field("altitude", "<f4", "m", role="altitude"),
+    Field("pressure", "<f4", "hPa", role="pressure"),
+    Field("heading", "<f4", "deg", role="heading"),
+    Field("temperature", "<f4", "C", role="temperature"),
+    Field("humidity", "<f4", "%", role="humidity"),
+    Field("longitude", "<f8", "deg", role="longitude"),
+    Field("latitude", "<f8", "deg", role="latitude"),
+    Field("time_elapsed", "<i4", "ticks", role="time"),
+    Field("rocket_state", "u1", role="state"),
+], frame_id=1))
+
+# The receiver prefixes Vinson packets with the LoRa address and payload length
+VINSON = register_schema(PacketSchema("vinson", [
+    Field("acceleration_x", "<i2", "raw", role="accel_x"),
+    Field("acceleration_y", "<i2", "raw", role="accel_y"),
+    Field("acceleration_z", "<i2", "raw", role="accel_z"),
+    Field("gyro_x", "<i4", "raw", role="gyro_x"),
+    Field("gyro_y", "<i4", "raw", role="gyro_y"),
+    Field("gyro_z", "<i4", "raw", role="gyro_z"),
+    Field("time_elapsed", "<i4", "ticks", role="time"),
+    Field("rocket_state", "u1", role="state"),
+    Field("rssi", "<i2", "dBm", role="rssi"),
+    Field("signal_to_noise", "<f4", "dB", role="snr"),
+], wire_offset=2, frame_id=2))
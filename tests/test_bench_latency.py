@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("pty")
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench_latency.py")
+
+
+def test_in_process_modes_report_every_stage(tmp_path):
+    # The benchmark exits non-zero when a stage gets no samples, e.g. because
+    # a probe no longer matches the signature of the function it wraps
+    result = subprocess.run(
+        [sys.executable, SCRIPT, "--rates", "50", "--max-points", "500", "--modes", "batch,signal",
+         "--duration", "1", "--no-frontend", "--out", str(tmp_path / "latency.json")],
+        cwd=tmp_path, capture_output=True, text=True, timeout=120,
+        env=dict(os.environ, QT_QPA_PLATFORM="offscreen"),
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "parse      n=50" in result.stdout
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from binary_log import binary_to_csv, csv_to_binary, load_binary_log, read_header
+from telemetry_schema import ORIZABA
+
+
+def rows(count):
+    """Orizaba rows with fractional values in the float fields"""
+    return [[i + 0.125] * 13 + [-80.6043, 28.5729, i * 4, i % 3] for i in range(count)]
+
+
+def test_writer_round_trip(tmp_path):
+    path = str(tmp_path / "log.obl")
+    writer = ORIZABA.binary_writer(path)
+    for row in rows(20):
+        writer.writerow(row)
+    writer.close()
+
+    header, records = load_binary_log(path)
+    assert header["schema"] == "orizaba"
+    assert records.dtype.names == tuple(ORIZABA.names)
+    assert len(records) == 20
+    assert records["time_elapsed"].tolist() == [i * 4 for i in range(20)]
+    assert records["rocket_state"].tolist() == [i % 3 for i in range(20)]
+    assert writer.stats()["rows_written"] == 20
+
+
+def test_partial_trailing_record_is_ignored(tmp_path):
+    path = str(tmp_path / "log.obl")
+    writer = ORIZABA.binary_writer(path)
+    for row in rows(3):
+        writer.writerow(row)
+    writer.close()
+    with open(path, "ab") as file:
+        file.write(b"\0" * 5)
+
+    _, records = load_binary_log(path)
+    assert len(records) == 3
+
+
+def test_csv_conversion_round_trip(tmp_path):
+    csv_path = str(tmp_path / "Flight_Data.csv")
+    writer = ORIZABA.csv_writer(csv_path)
+    for row in rows(50):
+        writer.writerow(row)
+    writer.close()
+
+    binary_path = csv_to_binary(csv_path)
+    assert binary_path == str(tmp_path / "Flight_Data.obl")
+    _, records = load_binary_log(binary_path)
+    original = pd.read_csv(csv_path)
+    for name in ORIZABA.names:
+        assert np.allclose(records[name], original[name].to_numpy())
+
+    restored = pd.read_csv(binary_to_csv(binary_path, str(tmp_path / "restored.csv")))
+    assert list(restored.columns) == list(original.columns)
+    assert np.allclose(restored.to_numpy(), original.to_numpy())
+
+
+def test_csv_without_a_known_schema_is_rejected(tmp_path):
+    csv_path = tmp_path / "other.csv"
+    csv_path.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError):
+        csv_to_binary(str(csv_path))
+    assert list(tmp_path.iterdir()) == [csv_path]
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    path = tmp_path / "log.obl"
+    path.write_bytes(b"not a flight log at all")
+    with open(path, "rb") as file, pytest.raises(ValueError):
+        read_header(file)
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from decimation import LodPyramid, MinMaxDecimator, minmax_decimate
+from flight_history import FlightHistory
+
+
+def flight(samples, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples, dtype=np.float64)
+    y = np.cumsum(rng.normal(0, 1, samples))
+    y[rng.integers(0, samples, 3)] += 500  # Single-sample spikes
+    return t, y
+
+
+def history_of(t, y):
+    history = FlightHistory(["time", "value"], capacity=16)
+    history.extend([t, y])
+    return history
+
+
+def test_whole_flight_points_keep_extremes():
+    t, y = flight(50_000)
+    pyramid = LodPyramid(history_of(t, y), "time", "value")
+    x, points = pyramid.points(pixels=500)
+    assert len(points) <= 2 * 500 * 2 + 5
+    assert points.max() == y.max()
+    assert points.min() == y.min()
+    # Every point is a real sample, drawn where it happened, in time order
+    np.testing.assert_array_equal(points, y[x.astype(int)])
+    assert np.all(np.diff(x) >= 0)
+    assert x[-1] == t[-1]
+
+
+def test_zoomed_points_cover_the_range():
+    t, y = flight(50_000, seed=1)
+    pyramid = LodPyramid(history_of(t, y), "time", "value")
+    start, stop = 1024 * 10, 1024 * 20
+    x, points = pyramid.points(start, stop, pixels=100)
+    assert points.max() == y[start:stop].max()
+    assert points.min() == y[start:stop].min()
+    assert x.min() >= start and x.max() < stop
+
+
+def test_small_range_is_drawn_raw():
+    t, y = flight(10_000)
+    pyramid = LodPyramid(history_of(t, y), "time", "value")
+    x, points = pyramid.points(100, 300, pixels=500)
+    np.testing.assert_array_equal(points, y[100:300])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_summary_matches_brute_force(seed):
+    t, y = flight(20_000, seed)
+    pyramid = LodPyramid(history_of(t, y), "time", "value")
+    rng = np.random.default_rng(seed)
+    for _ in range(50):
+        start, stop = sorted(rng.integers(0, len(y) + 1, 2))
+        summary = pyramid.summary(start, stop)
+        assert summary["count"] == stop - start
+        if stop == start:
+            assert summary["min"] is None
+            continue
+        assert summary["min"] == y[start:stop].min()
+        assert summary["max"] == y[start:stop].max()
+        assert summary["mean"] == pytest.approx(y[start:stop].mean())
+
+
+def test_incremental_build_matches_bulk_build():
+    t, y = flight(30_000, seed=3)
+    bulk = LodPyramid(history_of(t, y), "time", "value")
+    bulk.update()
+
+    history = FlightHistory(["time", "value"], capacity=16)
+    live = LodPyramid(history, "time", "value")
+    rng = np.random.default_rng(3)
+    done = 0
+    while done < len(y):
+        step = int(rng.integers(1, 700))
+        history.extend([t[done:done + step], y[done:done + step]])
+        done += step
+        live.update()
+
+    assert len(live.levels) == len(bulk.levels)
+    for ours, theirs in zip(live.levels, bulk.levels):
+        assert ours.count == theirs.count
+        np.testing.assert_array_equal(ours.mins[:ours.count], theirs.mins[:theirs.count])
+        np.testing.assert_array_equal(ours.imaxs[:ours.count], theirs.imaxs[:theirs.count])
+    for a, b in zip(live.points(pixels=300), bulk.points(pixels=300)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_cleared_history_rebuilds():
+    t, y = flight(5_000)
+    history = history_of(t, y)
+    pyramid = LodPyramid(history, "time", "value")
+    pyramid.update()
+    history.clear()
+    history.extend([t[:100], -y[:100]])
+    assert pyramid.summary()["max"] == (-y[:100]).max()
+
+
+def test_minmax_decimate_keeps_extremes():
+    t, y = flight(10_001)
+    x, points = minmax_decimate(t, y, 100)
+    assert len(points) <= 2 * 101
+    assert points.max() == y.max()
+    assert points.min() == y.min()
+    np.testing.assert_array_equal(points, y[x.astype(int)])
+    assert (np.diff(x) >= 0).all()
+
+
+def test_minmax_decimate_leaves_short_series_alone():
+    t, y = flight(150)
+    x, points = minmax_decimate(t, y, 100)
+    assert x is t and points is y
+
+
+def test_minmax_decimator_follows_a_growing_history():
+    t, y = flight(40_000, seed=5)
+    history = FlightHistory(["time", "value"], capacity=16)
+    decimator = MinMaxDecimator(history, "time", "value", pixels=400)
+    done = 0
+    for step in (1, 7, 300, 5_000, 34_692):
+        history.extend([t[done:done + step], y[done:done + step]])
+        done += step
+        x, points = decimator.points()
+        assert len(points) <= 2 * 2 * decimator.buckets + 3
+        assert points.max() == y[:done].max()
+        assert points.min() == y[:done].min()
+        assert x[-1] == t[done - 1]  # Live edge is never held back
+        np.testing.assert_array_equal(points, y[x.astype(int)])
+
+
+def test_minmax_decimator_rebuilds_after_clear():
+    t, y = flight(5_000)
+    history = history_of(t, y)
+    decimator = MinMaxDecimator(history, "time", "value", pixels=200)
+    decimator.points()
+    history.clear()
+    history.extend([t[:50], -y[:50]])
+    x, points = decimator.points()
+    assert x[-1] == t[49]
+    assert points.max() == (-y[:50]).max()
+    np.testing.assert_array_equal(points, -y[x.astype(int)])
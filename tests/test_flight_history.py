@@ -0,0 +1,60 @@
+import numpy as np
+
+from decimation import LodPyramid
+from flight_history import FlightHistory, PlotClock
+
+
+def test_plot_clock_follows_a_steady_clock():
+    clock = PlotClock()
+    assert clock.convert([100, 104]).tolist() == [100, 104]
+    assert clock.convert([108, 112, 112]).tolist() == [108, 112, 112]
+    assert clock.restarts == 0
+
+
+def test_plot_clock_rises_across_restarts():
+    clock = PlotClock()
+    first = clock.convert([40, 44, 48, 52, 0, 4])
+    assert first.tolist() == [40, 44, 48, 52, 56, 60]
+    # A restart at a block boundary uses the step seen so far
+    second = clock.convert([1, 5, 9])
+    assert second.tolist() == [64, 68, 72]
+    assert clock.restarts == 2
+
+
+def test_plot_clock_matches_one_big_block():
+    rng = np.random.default_rng(0)
+    times = np.concatenate([np.arange(0, 400, 4), np.arange(0, 200, 4), np.arange(8, 100, 4)])
+    whole = PlotClock().convert(times)
+
+    clock = PlotClock()
+    parts, done = [], 0
+    while done < len(times):
+        step = int(rng.integers(5, 40))
+        parts.append(clock.convert(times[done:done + step]))
+        done += step
+    np.testing.assert_array_equal(np.concatenate(parts), whole)
+    assert (np.diff(whole) > 0).all()
+
+
+def test_plot_clock_reset_starts_over():
+    clock = PlotClock()
+    clock.convert([10, 20, 30])
+    clock.reset()
+    assert clock.convert([5, 6]).tolist() == [5, 6]
+
+
+def test_visible_range_search_on_plot_time_after_restart():
+    # Two boots of the flight computer, each counting from 0
+    raw = np.concatenate([np.arange(0, 100, 1.0), np.arange(0, 100, 1.0)])
+    values = np.arange(len(raw), dtype=np.float64)
+    history = FlightHistory(["plot_time", "value"], capacity=16)
+    history.extend([PlotClock().convert(raw), values])
+
+    time_data = history.view("plot_time")
+    first = int(np.searchsorted(time_data, 150))
+    last = int(np.searchsorted(time_data, 160, side="right"))
+    assert values[first:last].tolist() == list(range(150, 161))
+
+    x, points = LodPyramid(history, "plot_time", "value").points(first, last, pixels=100)
+    assert (np.diff(x) >= 0).all()
+    assert points.min() == 150 and points.max() == 160
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pytest
+
+from flight_log import FlightLog
+from telemetry_schema import ORIZABA
+
+
+def rows(times):
+    return [[float(i)] * 13 + [-80.5, 25.7, t, 1] for i, t in enumerate(times)]
+
+
+def write_logs(tmp_path, times, binary_rows=None):
+    """CSV log of the given times, plus the dashboard's .obl of its first binary_rows rows"""
+    csv_path = str(tmp_path / "Flight_Data.csv")
+    csv = ORIZABA.csv_writer(csv_path)
+    binary = ORIZABA.binary_writer(str(tmp_path / "Flight_Data.obl")) if binary_rows is not None else None
+    for i, row in enumerate(rows(times)):
+        csv.writerow(row)
+        if binary is not None and i < binary_rows:
+            binary.writerow(row)
+    csv.close()
+    if binary is not None:
+        binary.close()
+    return csv_path
+
+
+def test_complete_dashboard_log_is_used_as_is(tmp_path):
+    csv_path = write_logs(tmp_path, range(10), binary_rows=10)
+    log = FlightLog(csv_path)
+    assert log.binary_path == str(tmp_path / "Flight_Data.obl")
+    assert len(log) == 10
+    assert log.schema == "orizaba"
+
+
+def test_stale_dashboard_log_is_left_alone(tmp_path):
+    csv_path = write_logs(tmp_path, range(10), binary_rows=6)
+    written = (tmp_path / "Flight_Data.obl").read_bytes()
+
+    log = FlightLog(csv_path)
+    assert log.binary_path == str(tmp_path / "Flight_Data.sidecar.obl")
+    assert len(log) == 10
+    assert (tmp_path / "Flight_Data.obl").read_bytes() == written
+
+    # Reused while the CSV keeps its length
+    mtime = os.path.getmtime(log.binary_path)
+    assert FlightLog(csv_path).binary_path == log.binary_path
+    assert os.path.getmtime(log.binary_path) == mtime
+
+
+def test_missing_binary_log_is_built(tmp_path):
+    csv_path = write_logs(tmp_path, range(5))
+    log = FlightLog(csv_path)
+    assert log.binary_path == str(tmp_path / "Flight_Data.obl")
+    assert log.column("time_elapsed").tolist() == [0, 1, 2, 3, 4]
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".")]  # No temp files left
+
+
+def test_refresh_maps_appended_records(tmp_path):
+    path = str(tmp_path / "live.obl")
+    writer = ORIZABA.binary_writer(path)
+    for row in rows(range(3)):
+        writer.writerow(row)
+    writer.flush()
+    log = FlightLog(path)
+    assert len(log) == 3
+
+    for row in rows(range(3, 8)):
+        writer.writerow(row)
+    writer.close()
+    log.refresh()
+    assert len(log) == 8
+    assert log.monotonic
+
+
+def test_time_lookups_on_a_steady_clock(tmp_path):
+    times = [0, 4, 4, 8, 12, 16, 20]
+    log = FlightLog(write_logs(tmp_path, times))
+    assert log.monotonic
+    assert log.index_range(4, 12) == (1, 5)
+    assert log.indices(5, 16).tolist() == [3, 4, 5]
+    assert log.between(8, None, "time_elapsed").tolist() == [8, 12, 16, 20]
+    assert isinstance(log.between(0, 4), np.memmap)
+
+
+def test_time_lookups_across_a_clock_restart(tmp_path):
+    times = [10, 14, 18, 22, 2, 6, 10, 14, 18]
+    log = FlightLog(write_logs(tmp_path, times))
+    assert not log.monotonic
+
+    expected = [i for i, t in enumerate(times) if 10 <= t <= 14]
+    assert log.indices(10, 14).tolist() == expected
+    assert log.between(10, 14, "time_elapsed").tolist() == [10, 14, 10, 14]
+    assert len(log.between()) == len(times)
+    with pytest.raises(ValueError):
+        log.index_range(10, 14)
+
+
+def test_restart_in_appended_records_is_noticed(tmp_path):
+    path = str(tmp_path / "live.obl")
+    writer = ORIZABA.binary_writer(path)
+    for row in rows([0, 4, 8]):
+        writer.writerow(row)
+    writer.flush()
+    log = FlightLog(path)
+    assert log.monotonic
+
+    for row in rows([1, 5]):
+        writer.writerow(row)
+    writer.close()
+    log.refresh()
+    assert not log.monotonic
+    assert log.indices(0, 4).tolist() == [0, 1, 3]
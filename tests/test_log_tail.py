@@ -0,0 +1,96 @@
+import os
+
+from log_tail import CsvTailReader
+
+HEADER = b"time_elapsed,altitude,rocket_state\n"
+
+
+def row(i):
+    return f"{i * 4},{i * 10.5},1\n".encode()
+
+
+def write(path, data, mode="ab"):
+    with open(path, mode) as file:
+        file.write(data)
+
+
+def altitudes(rows):
+    return [r["altitude"] for r in rows]
+
+
+def test_reads_only_new_rows(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    write(log, HEADER + row(0) + row(1), "wb")
+    reader = CsvTailReader(str(log), from_end=False)
+    assert altitudes(reader.poll()) == [0.0, 10.5]
+    assert reader.poll() == []
+
+    write(log, row(2))
+    assert altitudes(reader.poll()) == [21.0]
+    assert reader.header == ["time_elapsed", "altitude", "rocket_state"]
+    assert reader.rows_read == 3
+
+
+def test_partial_line_waits_for_its_newline(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    write(log, HEADER + row(0), "wb")
+    reader = CsvTailReader(str(log), from_end=False)
+    reader.poll()
+
+    line = row(1)
+    write(log, line[:4])
+    assert reader.poll() == []
+    write(log, line[4:])
+    assert altitudes(reader.poll()) == [10.5]
+
+
+def test_truncated_log_is_read_from_the_top(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    write(log, HEADER + row(0) + row(1) + row(2), "wb")
+    reader = CsvTailReader(str(log), from_end=False)
+    reader.poll()
+
+    # Same file, cut back and rewritten shorter
+    with open(log, "r+b") as file:
+        file.truncate(0)
+        file.write(HEADER + row(7))
+    assert altitudes(reader.poll()) == [73.5]
+    assert reader.rows_read == 1
+
+
+def test_replaced_log_is_reopened(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    write(log, HEADER + row(0) + row(1), "wb")
+    reader = CsvTailReader(str(log), from_end=False)
+    reader.poll()
+
+    # Rotation: a new file renamed over the old one, longer than the old offset
+    new = tmp_path / "next.csv"
+    write(new, HEADER + row(5) + row(6) + row(7), "wb")
+    os.replace(new, log)
+    assert altitudes(reader.poll()) == [52.5, 63.0, 73.5]
+
+
+def test_missing_log_waits_for_it(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    reader = CsvTailReader(str(log), from_end=False)
+    assert reader.poll() == []
+    write(log, HEADER + row(3), "wb")
+    assert altitudes(reader.poll()) == [31.5]
+
+
+def test_from_end_skips_to_the_tail(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    write(log, HEADER + b"".join(row(i) for i in range(1000)), "wb")
+    reader = CsvTailReader(str(log), from_end=True, tail_bytes=100)
+    rows = reader.poll()
+    assert 0 < len(rows) < 10
+    assert rows[-1]["time_elapsed"] == 999 * 4
+    assert reader.latest == rows[-1]
+
+
+def test_malformed_lines_are_skipped(tmp_path):
+    log = tmp_path / "Flight_Data.csv"
+    write(log, HEADER + row(0) + b"1,2\n" + row(1), "wb")
+    reader = CsvTailReader(str(log), from_end=False)
+    assert altitudes(reader.poll()) == [0.0, 10.5]
@@ -0,0 +1,148 @@
+import threading
+
+from log_writer import BackgroundLogWriter, CsvLogWriter, TeeLogWriter
+
+
+class ListWriter:
+    """Collects rows; writerow blocks while the gate is closed"""
+
+    def __init__(self, fail_on=()):
+        self.rows = []
+        self.fail_on = set(fail_on)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.closed = False
+
+    def writerow(self, row):
+        self.entered.set()
+        self.gate.wait()
+        if row in self.fail_on:
+            raise OSError(f"cannot write {row}")
+        self.rows.append(row)
+
+    def poll(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def stats(self):
+        return {"rows_written": len(self.rows)}
+
+
+def stalled(overflow, **kwargs):
+    """Background writer whose writer thread is stuck on row 0"""
+    writer = ListWriter()
+    writer.gate.clear()
+    background = BackgroundLogWriter(writer, overflow=overflow, poll_interval=0.01, **kwargs)
+    background.writerow(0)
+    assert writer.entered.wait(5)
+    return writer, background
+
+
+def test_spill_keeps_arrival_order(tmp_path):
+    writer, background = stalled("spill", max_rows=4, spill_dir=str(tmp_path))
+    for row in range(1, 20):
+        background.writerow(row)
+    assert background.stats()["spilled_rows"] == 15
+    assert background.queue_depth() == 19
+
+    writer.gate.set()
+    background.close()
+    assert writer.rows == list(range(20))
+    stats = background.stats()
+    assert stats["spill_pending"] == 0
+    assert stats["dropped_rows"] == 0
+
+
+def test_drop_oldest_keeps_the_newest_rows():
+    writer, background = stalled("drop_oldest", max_rows=4)
+    for row in range(1, 11):
+        background.writerow(row)
+    assert background.stats()["dropped_rows"] == 6
+
+    writer.gate.set()
+    background.close()
+    assert writer.rows == [0, 7, 8, 9, 10]
+
+
+def test_block_waits_for_the_writer():
+    writer, background = stalled("block", max_rows=2)
+    producer = threading.Thread(target=lambda: [background.writerow(row) for row in range(1, 6)])
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()  # Queue full, writer stuck
+
+    writer.gate.set()
+    producer.join(5)
+    background.close()
+    assert writer.rows == list(range(6))
+    assert background.stats()["blocked_ms"] > 0
+
+
+def test_failed_rows_do_not_cost_the_rest_of_the_batch():
+    writer = ListWriter(fail_on={2, 5})
+    writer.gate.clear()
+    background = BackgroundLogWriter(writer, poll_interval=0.01)
+    for row in range(8):
+        background.writerow(row)
+    writer.gate.set()
+    background.close()
+    assert writer.rows == [0, 1, 3, 4, 6, 7]
+    assert background.stats()["write_errors"] == 2
+    assert writer.closed
+
+
+def test_rows_after_close_are_counted():
+    writer = ListWriter()
+    background = BackgroundLogWriter(writer)
+    background.writerow(1)
+    background.close()
+    background.writerow(2)
+    assert writer.rows == [1]
+    assert background.stats()["rows_after_close"] == 1
+
+
+def test_csv_writer_flushes_on_state_change(tmp_path):
+    path = tmp_path / "log.csv"
+    writer = CsvLogWriter(str(path), ["a", "state"], flush_interval_ms=None, state_column=1)
+    writer.writerow([1, 0])
+    writer.writerow([2, 0])
+    assert path.read_text().splitlines() == ["a,state"]
+    writer.writerow([3, 1])
+    assert path.read_text().splitlines() == ["a,state", "1,0", "2,0", "3,1"]
+    writer.close()
+
+
+def test_tee_keeps_writing_past_a_failing_writer():
+    good = ListWriter()
+    bad = ListWriter(fail_on={1, 2})
+    tee = TeeLogWriter(binary=bad, csv=good)
+    for row in range(4):
+        tee.writerow(row)
+    tee.close()
+    assert good.rows == [0, 1, 2, 3]
+    assert bad.rows == [0, 3]
+    assert good.closed and bad.closed
+
+    stats = tee.stats()
+    assert stats["binary"]["errors"] == 2
+    assert stats["csv"]["errors"] == 0
+    assert stats["csv"]["rows_written"] == 4
+
+
+def test_tee_behind_background_writer_reports_per_writer_errors():
+    good = ListWriter()
+    bad = ListWriter(fail_on={0, 1, 2})
+    background = BackgroundLogWriter(TeeLogWriter(csv=good, binary=bad))
+    for row in range(3):
+        background.writerow(row)
+    background.close()
+    stats = background.stats()
+    assert good.rows == [0, 1, 2]
+    assert stats["write_errors"] == 0
+    assert stats["binary"]["errors"] == 3
@@ -0,0 +1,109 @@
+import numpy as np
+
+from receiver_merge import PacketMerger, format_receiver_stats
+from telemetry_schema import ORIZABA, VINSON
+
+
+def packets(times, schema=ORIZABA):
+    """One packet per time_elapsed value, with a payload that tells them apart"""
+    records = np.zeros(len(times), dtype=schema.dtype)
+    records["time_elapsed"] = times
+    records[schema.names[0]] = np.asarray(times) * 10
+    return records
+
+
+def times(records):
+    return records["time_elapsed"].tolist()
+
+
+def unique(merger):
+    return [stats["unique"] for stats in merger.stats(now=0)]
+
+
+def test_copies_are_released_once():
+    merger = PacketMerger(ORIZABA, ["rx1", "rx2"], window_ms=100)
+    merger.add(0, packets([1, 2, 3]), now=0.0)
+    merger.add(1, packets([2, 3, 4]), now=0.01)
+    assert times(merger.release(now=0.5)) == [1, 2, 3, 4]
+    assert merger.duplicates == 2
+    assert unique(merger) == [1, 1]
+    assert [stats["packets"] for stats in merger.stats(now=0)] == [3, 3]
+
+
+def test_packets_sharing_a_time_are_told_apart_by_payload():
+    merger = PacketMerger(ORIZABA, ["rx1", "rx2"], window_ms=100)
+    first = packets([5, 5])
+    first[ORIZABA.names[0]] = [1.0, 2.0]
+    merger.add(0, first, now=0.0)
+    merger.add(1, first[1:], now=0.0)
+    assert len(merger.release(now=1.0)) == 2
+    assert merger.duplicates == 1
+
+
+def test_out_of_order_packets_are_put_back_in_sequence():
+    merger = PacketMerger(ORIZABA, ["rx1", "rx2"], window_ms=100)
+    merger.add(0, packets([1, 3]), now=0.0)
+    merger.add(1, packets([2]), now=0.05)
+    # Packet 1 and 3 have waited long enough; 2 is held but ordered before 3
+    assert times(merger.release(now=0.12)) == [1, 2, 3]
+    assert merger.late == 0
+
+
+def test_window_holds_packets_back():
+    merger = PacketMerger(ORIZABA, ["rx1"], window_ms=100)
+    merger.add(0, packets([1]), now=0.0)
+    assert len(merger.release(now=0.05)) == 0
+    assert times(merger.release(now=0.05, flush=True)) == [1]
+
+
+def test_packet_arriving_after_newer_ones_is_counted_late():
+    merger = PacketMerger(ORIZABA, ["rx1", "rx2"], window_ms=100)
+    merger.add(0, packets([5]), now=0.0)
+    merger.release(now=1.0)
+    merger.add(1, packets([4]), now=1.0)
+    assert times(merger.release(now=2.0)) == [4]
+    assert merger.late == 1
+    assert merger.stats(now=0)[1]["late"] == 1
+
+
+def test_late_copy_withdraws_unique_credit():
+    merger = PacketMerger(ORIZABA, ["rx1", "rx2"], window_ms=100)
+    merger.add(0, packets([1, 2]), now=0.0)
+    merger.release(now=1.0)
+    assert unique(merger) == [2, 0]
+
+    # rx2 heard packet 1 too, only too late to be merged
+    merger.add(1, packets([1]), now=2.0)
+    assert len(merger.release(now=3.0)) == 0
+    assert unique(merger) == [1, 0]
+
+    # Further copies change nothing
+    merger.add(1, packets([1]), now=3.0)
+    merger.add(0, packets([1]), now=3.0)
+    assert unique(merger) == [1, 0]
+    assert merger.duplicates == 3
+
+
+def test_better_link_copy_is_kept():
+    merger = PacketMerger(VINSON, ["rx1", "rx2"], window_ms=100)
+    weak = packets([1, 2], VINSON)
+    weak["rssi"] = -110
+    strong = weak.copy()
+    strong["rssi"] = [-80, -120]
+    strong["signal_to_noise"] = 9.5
+    merger.add(0, weak, now=0.0)
+    merger.add(1, strong, now=0.01)
+
+    merged = merger.release(now=1.0)
+    assert merged["rssi"].tolist() == [-80, -110]
+    assert [stats["chosen"] for stats in merger.stats(now=0)] == [1, 1]
+
+
+def test_stats_table_lists_every_receiver():
+    merger = PacketMerger(ORIZABA, ["rx1", "rx2"], window_ms=100)
+    merger.add(0, packets([1]), now=0.0)
+    merger.release(now=1.0)
+    table = format_receiver_stats(merger.stats(now=2.0), merger.released)
+    lines = table.splitlines()
+    assert len(lines) == 3
+    assert lines[1].startswith("rx1") and lines[1].endswith("100%")
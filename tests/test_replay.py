@@ -0,0 +1,113 @@
+import os
+import time
+
+import pytest
+
+from replay import REPLAY_SCHEME, ReplayClock, ReplayPort, open_port, parse_speed
+from serial_engine import FrameDecoder
+from telemetry_schema import ORIZABA
+
+
+def write_log(path, times):
+    """Orizaba .obl log with the given time_elapsed counts"""
+    writer = ORIZABA.binary_writer(str(path))
+    for i, t in enumerate(times):
+        writer.writerow([float(i)] * 13 + [-80.5, 25.7, t, 1])
+    writer.close()
+    return str(path)
+
+
+def drain(port, timeout=5):
+    data = b""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        chunk = port.read(4096)
+        if not chunk and port.clock.done:
+            break
+        data += chunk
+    return data
+
+
+def test_clock_restart_is_replayed_as_one_packet_interval():
+    clock = ReplayClock([10.0, 10.5, 11.0, 0.2, 0.7], speed=None)
+    assert clock.seconds.tolist() == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert clock.due(limit=2) == (0, 2)
+    assert clock.due() == (2, 5)
+    assert clock.done and clock.wait_time() is None
+
+
+def test_clock_paces_records_by_speed():
+    clock = ReplayClock([0.0, 0.0, 100.0], speed=2.0)
+    assert clock.due() == (0, 2)
+    assert 49 < clock.wait_time() <= 50
+    clock.restart()
+    assert clock.position == 0 and not clock.done
+
+
+def test_parse_speed():
+    assert parse_speed("4") == 4.0
+    assert parse_speed("max") is None
+    assert parse_speed("0") is None
+    with pytest.raises(ValueError):
+        parse_speed("fast")
+
+
+def test_port_replays_every_record_as_rcv_lines(tmp_path):
+    path = write_log(tmp_path / "flight.obl", [0, 4, 8, 2, 6])
+    port = open_port(f"{REPLAY_SCHEME}{path}?speed=max", 115200, timeout=0.05)
+    assert isinstance(port, ReplayPort)
+
+    lines = drain(port).splitlines()
+    records, valid = ORIZABA.parse(lines)
+    assert valid.all()
+    assert records["time_elapsed"].tolist() == [0, 4, 8, 2, 6]
+    assert port.packets_sent == 5
+
+
+def test_port_replays_binary_frames_and_loops(tmp_path):
+    path = write_log(tmp_path / "flight.obl", [0, 4, 8])
+    port = ReplayPort.from_url(f"{REPLAY_SCHEME}{path}?speed=max&downlink=binary&loop=1", timeout=0.05)
+    decoder = FrameDecoder()
+    times = []
+    while len(times) < 7:
+        for schema, records in decoder.feed(port.read(4096)):
+            assert schema is ORIZABA
+            times += records["time_elapsed"].tolist()
+    assert times[:7] == [0, 4, 8, 0, 4, 8, 0]
+    assert decoder.crc_errors == 0
+
+
+def test_port_waits_for_the_recorded_spacing(tmp_path):
+    # 40 counts of 0.25 s is 10 s, played at 100x: the second packet is 0.1 s out
+    path = write_log(tmp_path / "flight.obl", [0, 40])
+    port = ReplayPort(path, speed=100, timeout=0.02)
+    assert port.read(4096).startswith(b"+RCV=")
+    assert port.read(4096) == b""
+    assert port.read(4096) == b""
+    time.sleep(0.1)
+    assert port.read(4096).startswith(b"+RCV=")
+
+
+def test_port_dialog_keeps_ports_as_item_data(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt6")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QFileDialog
+    import orizaba_dashboard
+
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(orizaba_dashboard.PortSelectionDialog, "get_serial_ports",
+                        lambda self: [("/dev/serial/by-id/usb-Radio - 1", "LoRa - receiver", "hwid")])
+    dialog = orizaba_dashboard.PortSelectionDialog()
+    assert dialog.get_selected_port() == "/dev/serial/by-id/usb-Radio - 1"
+
+    # A log path with " - " in it survives the trip through the combo box
+    path = write_log(tmp_path / "Flight - test.obl", [0, 4])
+    monkeypatch.setattr(QFileDialog, "getOpenFileName", lambda *args: (path, ""))
+    dialog.choose_replay_log()
+    dialog.speed_combo.setCurrentText("5x")
+    assert dialog.get_selected_port() == f"{REPLAY_SCHEME}{path}?speed=5"
+
+    monkeypatch.setattr(orizaba_dashboard.PortSelectionDialog, "get_serial_ports", lambda self: [])
+    dialog.populate_ports()
+    assert dialog.get_selected_port() is None
+    dialog.deleteLater()
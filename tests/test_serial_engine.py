@@ -0,0 +1,105 @@
+import numpy as np
+
+from serial_engine import FRAME_SYNC, FrameDecoder, SerialLineReader, encode_frame
+from telemetry_schema import ORIZABA, VINSON
+
+
+def records(count, first=0):
+    values = np.zeros(count, dtype=ORIZABA.dtype)
+    values["time_elapsed"] = np.arange(first, first + count)
+    values["altitude"] = np.arange(first, first + count) * 1.5
+    return values
+
+
+def frames(values, schema=ORIZABA):
+    return [encode_frame(schema, record) for record in values]
+
+
+def decode(decoder, data):
+    """Feed data and return the decoded time_elapsed values"""
+    times = []
+    for schema, block in decoder.feed(data):
+        times += block[schema.time_field].tolist()
+    return times
+
+
+def test_clean_frames_round_trip():
+    decoder = FrameDecoder()
+    blocks = decoder.feed(b"".join(frames(records(5))))
+    assert len(blocks) == 1
+    schema, block = blocks[0]
+    assert schema is ORIZABA
+    np.testing.assert_array_equal(block, records(5))
+    assert decoder.frames_read == 5
+    assert decoder.crc_errors == 0
+    assert decoder.discarded_bytes == 0
+
+
+def test_corrupt_frame_fails_crc_and_stream_resyncs():
+    packets = frames(records(4))
+    corrupt = bytearray(packets[1])
+    corrupt[10] ^= 0x40
+    packets[1] = bytes(corrupt)
+
+    decoder = FrameDecoder()
+    assert decode(decoder, b"".join(packets)) == [0, 2, 3]
+    assert decoder.crc_errors == 1
+    assert decoder.frames_read == 3
+
+
+def test_noise_with_sync_words_between_frames():
+    packets = frames(records(3))
+    # Noise that contains sync words and a plausible header
+    noise = b"\x00\xff" + FRAME_SYNC + b"\x01" + FRAME_SYNC + bytes([ORIZABA.frame_id, 200]) + b"junk"
+    decoder = FrameDecoder()
+    assert decode(decoder, noise + packets[0] + noise + packets[1] + packets[2]) == [0, 1, 2]
+    assert decoder.discarded_bytes >= 2 * len(noise) - 2
+
+
+def test_truncated_frame_is_skipped_by_the_next_one():
+    packets = frames(records(3))
+    decoder = FrameDecoder()
+    # The second frame lost its tail; its declared length then swallows the
+    # start of the third, which fails the CRC and is found again by resync
+    data = packets[0] + packets[1][:20] + packets[2] + frames(records(1, first=3))[0]
+    times = decode(decoder, data)
+    assert times[0] == 0
+    assert times[-1] == 3
+    assert 1 not in times
+
+
+def test_frames_split_across_reads():
+    data = b"".join(frames(records(6)))
+    decoder = FrameDecoder()
+    times = []
+    for i in range(0, len(data), 7):
+        times += decode(decoder, data[i:i + 7])
+    assert times == list(range(6))
+    assert decoder.discarded_bytes == 0
+
+
+def test_mixed_vehicles_come_out_in_separate_blocks():
+    vinson = np.zeros(2, dtype=VINSON.dtype)
+    vinson["time_elapsed"] = [10, 11]
+    decoder = FrameDecoder()
+    blocks = decoder.feed(b"".join(frames(records(2)) + frames(vinson, VINSON) + frames(records(1, first=2))))
+    assert [(schema.name, len(block)) for schema, block in blocks] == [("orizaba", 2), ("vinson", 2), ("orizaba", 1)]
+
+
+class FakePort:
+    """Hands out one chunk per read, as if each arrived after the drain"""
+
+    in_waiting = 0
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read(self, size=1):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def test_line_reader_holds_back_partial_lines():
+    reader = SerialLineReader(FakePort([b"+RCV=1,2\r\n+RC", b"V=3,4\r\nnoise\r\n"]))
+    assert reader.read_lines() == [b"+RCV=1,2"]
+    assert reader.read_lines() == [b"+RCV=3,4"]
+    assert reader.read_lines() == []
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from shared_ring import SharedSampleRing
+from telemetry_schema import ORIZABA
+
+
+@pytest.fixture
+def ring():
+    ring = SharedSampleRing.create(ORIZABA, capacity=8)
+    yield ring
+    ring.close()
+
+
+def samples(first, count):
+    """Records whose time_elapsed is their sequence number"""
+    records = np.zeros(count, dtype=ORIZABA.dtype)
+    records[ORIZABA.time_field] = np.arange(first, first + count)
+    return records
+
+
+def sequence(records):
+    return records[ORIZABA.time_field].tolist()
+
+
+def test_wrap_around_keeps_order(ring):
+    reader = ring.reader()
+    ring.write(samples(0, 6))
+    assert sequence(reader.read()[1]) == list(range(6))
+
+    # The next block wraps past the end of the slots
+    ring.write(samples(6, 5))
+    first, records = reader.read()
+    assert first == 6
+    assert sequence(records) == list(range(6, 11))
+    assert reader.samples_lost == 0
+    assert reader.samples_read == 11
+
+
+def test_lapped_reader_counts_lost_samples(ring):
+    reader = ring.reader()
+    ring.write(samples(0, 3))
+    ring.write(samples(3, 10))
+    first, records = reader.read()
+    # Only the newest capacity samples are still held
+    assert first == 5
+    assert sequence(records) == list(range(5, 13))
+    assert reader.samples_lost == 5
+
+
+def test_block_larger_than_ring(ring):
+    reader = ring.reader()
+    ring.write(samples(0, 20))
+    assert ring.written == ring.writing == 20
+    first, records = reader.read()
+    assert first == 12
+    assert sequence(records) == list(range(12, 20))
+    assert reader.samples_lost == 12
+
+
+def test_from_start_reads_oldest_held(ring):
+    ring.write(samples(0, 11))
+    first, records = ring.reader(from_start=True).read()
+    assert first == 3
+    assert sequence(records) == list(range(3, 11))
+
+
+def test_write_in_progress_discards_overwritten_slots(ring):
+    reader = ring.reader()
+    ring.write(samples(0, 8))
+
+    # A writer mid-way through the next block: announced, partly copied, not published
+    ring._header["writing"] = 11
+    ring.records[0:2] = samples(8, 2)
+
+    first, records = reader.read()
+    # Sequences 0-2 sit in slots the pending write covers and may be torn
+    assert first == 3
+    assert sequence(records) == list(range(3, 8))
+    assert reader.samples_lost == 3
+
+
+def test_attached_reader_sees_writes(ring):
+    other = SharedSampleRing.attach(ring.name)
+    try:
+        assert other.schema is ORIZABA
+        reader = other.reader()
+        ring.write(samples(0, 4))
+        assert sequence(reader.read()[1]) == [0, 1, 2, 3]
+        with pytest.raises(ValueError):
+            other.records[0] = samples(0, 1)[0]
+    finally:
+        other.close()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from telemetry_schema import ORIZABA, VINSON
+
+
+def line(i):
+    values = [f"{i + k / 100:.2f}" for k in range(13)] + ["-80.123456", "25.654321", str(i * 4), "3"]
+    return ("+RCV=" + ",".join(values)).encode()
+
+
+def test_clean_block():
+    records, valid = ORIZABA.parse([line(i) for i in range(5)])
+    assert valid.all()
+    assert records["time_elapsed"].tolist() == [0, 4, 8, 12, 16]
+    assert records["longitude"][0] == -80.123456
+
+
+def test_corrupt_lines_only_invalidate_themselves():
+    lines = [line(i) for i in range(8)]
+    lines[1] = lines[1][:30]                           # Truncated
+    lines[3] = lines[3].replace(b"3.0", b"3\x13")      # Control byte
+    lines[5] = lines[5].replace(b"5.01", b"5.0.1")     # Does not convert
+    lines[6] = b"OK"                                   # Not a packet
+    records, valid = ORIZABA.parse(lines)
+    assert valid.tolist() == [True, False, True, False, True, False, False, True]
+    assert records["time_elapsed"][valid].tolist() == [0, 8, 16, 28]
+
+
+def test_log_dtype_keeps_the_radio_digits():
+    text = line(0).replace(b"0.08", b"12345.678")
+    narrow, _ = ORIZABA.parse([text])
+    wide, _ = ORIZABA.parse([text], ORIZABA.log_dtype)
+    assert str(wide["altitude"][0]) == "12345.678"
+    assert narrow["altitude"][0] != wide["altitude"][0]
+
+
+def test_leading_wire_fields_are_skipped():
+    record = np.zeros(1, dtype=VINSON.dtype)[0]
+    record["time_elapsed"] = 42
+    record["rssi"] = -90
+    records, valid = VINSON.parse([VINSON.format_rcv(record.tolist())])
+    assert valid.all()
+    assert records["time_elapsed"][0] == 42
+    assert records["rssi"][0] == -90
@@ -0,0 +1,47 @@
+import json
+
+from telemetry_push import TelemetryBroadcaster
+
+
+def test_non_finite_values_are_sent_as_null():
+    broadcaster = TelemetryBroadcaster(lambda: None, lambda row: {"altitude": row["altitude"],
+                                                                  "accel": [float("inf"), 1.5]})
+    subscriber = broadcaster.subscribe()
+    broadcaster.publish({"altitude": float("nan")})
+    message = subscriber.get_nowait()
+    assert message.startswith(b"data: ") and message.endswith(b"\n\n")
+    assert json.loads(message[6:]) == {"altitude": None, "accel": [None, 1.5]}
+
+
+def test_new_subscriber_gets_the_latest_update():
+    broadcaster = TelemetryBroadcaster(lambda: None, lambda row: row)
+    first = broadcaster.subscribe()
+    broadcaster.publish({"altitude": 1.0})
+    broadcaster.publish({"altitude": 2.0})
+    assert first.qsize() == 2
+    assert json.loads(broadcaster.subscribe().get_nowait()[6:]) == {"altitude": 2.0}
+
+
+def layout_ids(component):
+    """Every component id in a Dash layout"""
+    ids = set()
+    if getattr(component, "id", None):
+        ids.add(component.id)
+    children = getattr(component, "children", None)
+    if not isinstance(children, (list, tuple)):
+        children = [children]
+    for child in children:
+        if hasattr(child, "children"):
+            ids |= layout_ids(child)
+    return ids
+
+
+def test_hud_updates_target_layout_ids():
+    import orizaba_frontend
+
+    ids = layout_ids(orizaba_frontend.app.layout)
+    assert set(orizaba_frontend.hud_update({})) <= ids
+    # Multi-output callbacks are keyed "..a.prop...b.prop.."
+    for key in orizaba_frontend.app.callback_map:
+        for output in key.strip(".").split("..."):
+            assert output.split(".")[0] in ids